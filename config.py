@@ -85,6 +85,7 @@ class PathConfig:
         self.GROUPS_DIR = self.DATA_DIR / "groups"
         self.LOGS_DIR = self.DATA_DIR / "logs"
         self.TEMP_DIR = self.DATA_DIR / "temp"
+        self.CACHE_DIR = self.DATA_DIR / "cache"
         
         # for directory in [self.INPUT_DIR, self.OUTPUT_DIR, self.GROUPS_DIR, self.LOGS_DIR]:
             # directory.mkdir(parents=True, exist_ok=True)
@@ -92,6 +93,7 @@ class PathConfig:
         for directory in [self.INPUT_DIR,
             self.OUTPUT_DIR,self.GROUPS_DIR,
             self.LOGS_DIR,self.TEMP_DIR,
+            self.CACHE_DIR,
         ]:
             directory.mkdir(parents=True, exist_ok=True)
 
@@ -109,6 +111,61 @@ class BotConfig:
     MAX_MEMORY_USAGE_MB: int = 500  # Yeni: Memory limit
     MAX_FILE_SIZE_MB: int = 200  # Yeni: Max dosya boyutu
     BATCH_PROCESSING_SIZE: int = 1000  # Yeni: Batch boyutu
+    # Excel temizleme motoru: "streaming" (read_only + xlsxwriter constant_memory) | "openpyxl" (eski, tam yükleme)
+    CLEANER_ENGINE: str = os.getenv("CLEANER_ENGINE", "streaming")
+    # Birleşik (fused) akış: temizleme satır bazında splitter içinde yapılır, ara xlsx yazılmaz
+    FUSED_PIPELINE: bool = field(default_factory=lambda: os.getenv("FUSED_PIPELINE", "True").lower() == "true")
+    # Streaming splitter: satırlar CHUNK_SIZE parçalarla okunur, bellek dosya boyutuyla büyümez
+    STREAMING_SPLITTER: bool = field(default_factory=lambda: os.getenv("STREAMING_SPLITTER", "True").lower() == "true")
+    # Grup dosyası yazıcı: "thread" (varsayılan) | "process" (çok büyük dosyalar, çekirdek sayısıyla ölçeklenir)
+    WRITER_BACKEND: str = os.getenv("WRITER_BACKEND", "thread")
+    WRITER_PROCESSES: int = int(os.getenv("WRITER_PROCESSES", 4))
+    WRITER_QUEUE_SIZE: int = 8  # Worker başına kuyruktaki en fazla batch
+    # Şehir → grup yönlendirme: "vectorized" (chunk bazında numpy maske) | "row" (satır satır)
+    ROUTING_ENGINE: str = os.getenv("ROUTING_ENGINE", "vectorized")
+    # Aynı satırları alan gruplar için dosya bir kez yazılır, diğerleri hardlink (vectorized motor)
+    DEDUPE_GROUP_OUTPUTS: bool = field(default_factory=lambda: os.getenv("DEDUPE_GROUP_OUTPUTS", "True").lower() == "true")
+    # Aynı anda açık dosya sınırı (workbook + run dosyası); aşan gruplar diske taşar, sonda birleştirilir
+    # (SHEET_ROLLOVER=sheet: aynı workbook'ta biten Veriler_N sayfalarının geçici dosyaları sayılmaz)
+    MAX_OPEN_WRITERS: int = int(os.getenv("MAX_OPEN_WRITERS", 64))
+    # Grup dosyaları TARİH, sonra İL sırasıyla (dış sıralama: CHUNK_SIZE satır bellek, sıralı run'lar diske)
+    SORT_GROUP_OUTPUTS: bool = field(default_factory=lambda: os.getenv("SORT_GROUP_OUTPUTS", "False").lower() == "true")
+    # Excel satır sınırı (1.048.576) aşılınca: "sheet" (Veriler_2, Veriler_3 ...) | "file" (_part2.xlsx ...)
+    SHEET_ROLLOVER: str = os.getenv("SHEET_ROLLOVER", "sheet")
+    SHEET_MAX_ROWS: int = int(os.getenv("SHEET_MAX_ROWS", 1_048_576))  # sayfa başına satır (başlık dahil)
+    # csv / csv.gz grup dosyaları için ayraç (Excel Türkçe bölge ayarı ";" bekler)
+    CSV_DELIMITER: str = os.getenv("CSV_DELIMITER", ";")
+    # xlsx okuma: "native" (zip + iterparse, utils/xlsx_reader) | "openpyxl" (read_only); native açamazsa openpyxl
+    READER_BACKEND: str = os.getenv("READER_BACKEND", "native")
+    # xlsx yazma (grup dosyaları + temizlenmiş dosya): "xlsxwriter" | "native" (zip'e doğrudan akış, utils/xlsx_writer)
+    XLSX_WRITER: str = os.getenv("XLSX_WRITER", "xlsxwriter")
+    # Aşamalar arası satırlar: "columnar" (sözlük kodlu sütun deposu, utils/columnar_store) | "tuple"
+    ROW_STORE: str = os.getenv("ROW_STORE", "columnar")
+    # Yükleme oturumu: dosya bir kez ayrıştırılır; doğrulama, temizleme ve split aynı satırları kullanır
+    WORKBOOK_SESSION: bool = field(default_factory=lambda: os.getenv("WORKBOOK_SESSION", "True").lower() == "true")
+    # Girdi sayfaları: "active" (aktif sayfa) | "auto" (başlığında TARİH ve İL olan tüm sayfalar) | "Ocak,Şubat"
+    INPUT_SHEETS: str = os.getenv("INPUT_SHEETS", "active")
+    # SGK TC merge (utils/tc_merger): "streaming" (tel indeksi + ham satır akışı) | "pandas" (iki DataFrame)
+    MERGE_ENGINE: str = os.getenv("MERGE_ENGINE", "streaming")
+    # streaming merge tel indeksi önbelleği (data/cache/tel_index, içerik özetiyle, LRU); 0: kapalı
+    TEL_INDEX_CACHE_MB: int = int(os.getenv("TEL_INDEX_CACHE_MB", 512))
+    # SGK akışı: "memory" (merge → İL → TC temizliği → gruplama bellekte, ara xlsx ayrıştırılmaz) | "files" (sgk1/sgk2.xlsx)
+    SGK_PIPELINE: str = os.getenv("SGK_PIPELINE", "memory")
+    # memory akışında sgk1/sgk2.xlsx yine yazılır ve silinmez (sgk2, INPUT_EMAIL varsa ek için her durumda yazılır)
+    SGK_DEBUG_ARTIFACTS: bool = field(default_factory=lambda: os.getenv("SGK_DEBUG_ARTIFACTS", "False").lower() == "true")
+    # SGK: TC Kimlik sağlama (checksum) kontrolünden geçmeyen satırlar raporda sayılır; True ise gruplamadan çıkarılır
+    TC_CHECKSUM_FILTER: bool = field(default_factory=lambda: os.getenv("TC_CHECKSUM_FILTER", "False").lower() == "true")
+    # Ayrıştırma / birleştirme (oturum, tc_merger): "thread" (varsayılan executor) | "process" (iş başına sandbox süreç, limitli)
+    PARSE_BACKEND: str = os.getenv("PARSE_BACKEND", "thread")
+    SANDBOX_PROCESSES: int = int(os.getenv("SANDBOX_PROCESSES", 2))  # aynı anda çalışan sandbox işi
+    SANDBOX_MEMORY_MB: int = int(os.getenv("SANDBOX_MEMORY_MB", 2048))  # RLIMIT_AS (0: sınırsız)
+    SANDBOX_CPU_SECONDS: int = int(os.getenv("SANDBOX_CPU_SECONDS", 300))  # RLIMIT_CPU (0: sınırsız)
+    SANDBOX_TIMEOUT_SECONDS: int = int(os.getenv("SANDBOX_TIMEOUT_SECONDS", 600))  # süre dolunca süreç öldürülür
+    # Yükleme ön kontrolü (zip merkez dizini, utils/upload_inspector); 0: o kontrol kapalı
+    UPLOAD_MAX_UNCOMPRESSED_MB: int = int(os.getenv("UPLOAD_MAX_UNCOMPRESSED_MB", 2048))  # sayfalar + sharedStrings
+    UPLOAD_MAX_COMPRESSION_RATIO: int = int(os.getenv("UPLOAD_MAX_COMPRESSION_RATIO", 200))  # zip bombası eşiği
+    UPLOAD_STREAMING_MB: int = int(os.getenv("UPLOAD_STREAMING_MB", 512))  # üstü: oturum yok, streaming motor
+    UPLOAD_STREAMING_ROWS: int = int(os.getenv("UPLOAD_STREAMING_ROWS", 500_000))  # <dimension> tahmini
 
 
 @dataclass
@@ -14,6 +14,7 @@ from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from utils.json_processing import process_excel_to_json
+from utils.upload_inspector import check_upload
 
 # Router tanımı - handler_loader uyumlu
 router = Router(name="json_processor")
@@ -67,6 +68,12 @@ async def handle_excel_file(message: Message, state: FSMContext):
             tmp_file.write(downloaded_file.read())
             temp_file_path = tmp_file.name
 
+        # Ön kontrol (zip merkez dizini): reddedilen dosya ayrıştırılmaz
+        inspection = check_upload(temp_file_path)
+        if inspection.rejected:
+            await message.answer(f"❌ {inspection.reason}")
+            return
+
         # İşlemi başlat
         await message.answer("⏳ Excel dosyası işleniyor...")
 
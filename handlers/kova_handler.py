@@ -5,8 +5,9 @@
 Upload Handler Module
 Excel dosya yükleme ve işleme işlemleri
 """
+import asyncio
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
 from aiogram import Router, F
 import traceback
 
@@ -15,11 +16,17 @@ from aiogram.types import Message
 
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from openpyxl import load_workbook
 
 from config import config
+from utils.excel_cleaner import MAX_FILE_SIZE_MB, select_input_sheets
 from utils.excel_process import process_excel_task
+from utils.process_sandbox import run_job
 from utils.reporter import generate_processing_report
+from utils.upload_inspector import UploadInspection, check_upload
+from utils.workbook_session import (
+    SHEETS_ACTIVE, MultiSheetSource, Source, WorkbookSession, input_sheets, open_source,
+)
+from utils.xlsx_reader import real_bounds
 from utils.logger import logger
 
 # Handler loader uyumlu router tanımı
@@ -36,33 +43,39 @@ EXCEL_EXTENSIONS = {ext.lower() for ext in [".xlsx", ".xls"]}
 
 REQUIRED_COLUMNS = {"TARİH", "İL"}
 
-def _validate_excel_file(file_path: Path) -> Dict[str, Any]:
+def _validate_excel_file(file_path: Union[Path, Source]) -> Dict[str, Any]:
     """
-    Excel dosyasını doğrular
+    Excel dosyasını doğrular (oturum verilirse bellekteki satırlardan, dosya tekrar okunmaz)
+    Çok sayfalı kaynakta her sayfa kontrol edilir, satır sayıları toplanır.
     """
     wb = None
     try:
-        wb = load_workbook(filename=file_path, read_only=True)
-        ws = wb.active
-        
-        # Başlık satırını al
-        headers = []
-        for col in range(1, ws.max_column + 1):
-            cell_value = ws.cell(row=1, column=col).value
-            headers.append(str(cell_value).strip().upper() if cell_value else "")
-        
-        # Gerekli sütunları kontrol et
-        found_columns = set(headers)
-        
-        if not REQUIRED_COLUMNS.issubset(found_columns):
-            missing = REQUIRED_COLUMNS - found_columns
-            return {
-                "valid": False,
-                "message": f"Dosyada gerekli sütunlar bulunamadı: {', '.join(missing)}"
-            }
-        
+        wb = open_source(file_path)
+        sheets = input_sheets(wb)
+        row_count = 0
+        first_headers = None
+        for ws in sheets:
+            bounds = real_bounds(ws)  # dimension biçimlendirmeden şişmiş olabilir
+            label = f"{ws.title}: " if len(sheets) > 1 else ""
+
+            # Başlık satırını al (tek satır okunur, gerçek sütun sınırı genişliğinde)
+            first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            headers = [str(cell_value).strip().upper() if cell_value else "" for cell_value in first_row]
+
+            # Gerekli sütunları kontrol et
+            found_columns = set(headers)
+
+            if not REQUIRED_COLUMNS.issubset(found_columns):
+                missing = REQUIRED_COLUMNS - found_columns
+                return {
+                    "valid": False,
+                    "message": f"{label}Dosyada gerekli sütunlar bulunamadı: {', '.join(missing)}"
+                }
+            first_headers = first_headers or headers
+            row_count += max(0, bounds.max_row - 1)
+
         # Satır sayısını kontrol et (sadece başlık varsa)
-        if ws.max_row <= 1:
+        if row_count == 0:
             return {
                 "valid": False,
                 "message": "Dosyada işlenecek veri bulunamadı"
@@ -70,8 +83,8 @@ def _validate_excel_file(file_path: Path) -> Dict[str, Any]:
         
         return {
             "valid": True, 
-            "headers": headers, 
-            "row_count": ws.max_row - 1
+            "headers": first_headers, 
+            "row_count": row_count
         }
         
     except Exception as e:
@@ -83,6 +96,46 @@ def _validate_excel_file(file_path: Path) -> Dict[str, Any]:
         if wb:
             wb.close()
 
+async def _validate_async(source: Union[Path, Source]) -> Dict[str, Any]:
+    """Doğrulama executor'da: büyük dosyada event loop bloklanmaz"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _validate_excel_file, source)
+
+def _session_allowed(file_path: Path, inspection: UploadInspection) -> bool:
+    """Oturum (tamamı bellekte) açılabilir mi: ayar açık, ön kontrol streaming demedi, boyut sınır içinde"""
+    if not config.bot.WORKBOOK_SESSION or inspection.streaming_only:
+        return False
+    # Sınırı aşan dosyayı temizleyici boyut kontrolünde reddedecek; tamamı belleğe alınmaz
+    return file_path.stat().st_size <= MAX_FILE_SIZE_MB * 1024 * 1024
+
+async def _open_upload_session(file_path: Path, inspection: UploadInspection) -> Optional[Source]:
+    """
+    Yüklemeyi bir kez ayrıştırır (doğrulama + temizleme + split aynı oturumu kullanır).
+    INPUT_SHEETS "active" değilse seçilen sayfalar paralel ayrıştırılıp MultiSheetSource döner.
+    Oturum açılamazsa None (tek sayfa) veya sayfa adlı MultiSheetSource: akış dosyadan okur.
+    Sayfa seçimi yapılamazsa ValueError (sayfa bulunamadı); çağıran kullanıcıya bildirir.
+    """
+    option = (config.bot.INPUT_SHEETS or SHEETS_ACTIVE).strip()
+    in_memory = _session_allowed(file_path, inspection)
+
+    if option.lower() != SHEETS_ACTIVE:
+        # Sayfa taraması da tam ayrıştırma: diğer ayrıştırmalar gibi sandbox limitleri altında
+        titles = await run_job(select_input_sheets, file_path, option)
+        logger.info(f"📑 İşlenecek sayfalar: {titles}")
+        try:
+            return await MultiSheetSource.open(file_path, titles, in_memory)
+        except Exception as e:
+            logger.warning(f"⚠️ Sayfa oturumları açılamadı, sayfalar dosyadan okunacak: {e}")
+            return MultiSheetSource(file_path, titles)
+
+    if not in_memory:
+        return None
+    try:
+        return await WorkbookSession.open(file_path)
+    except Exception as e:
+        logger.warning(f"⚠️ Oturum açılamadı, dosya doğrudan okunacak: {e}")
+        return None
+
 async def _download_user_file(bot, file_id: str, file_name: str) -> Path:
     """
     Kullanıcı dosyasını indirir
@@ -98,7 +151,9 @@ async def _download_user_file(bot, file_id: str, file_name: str) -> Path:
         raise
 
 
-async def _process_uploaded_file(message: Message, file_path: Path) -> Dict[str, Any]:
+async def _process_uploaded_file(message: Message, file_path: Path,
+                                 session: Optional[Source] = None,
+                                 streaming_only: bool = False) -> Dict[str, Any]:
     """
     Yüklenen dosyayı işler
     """
@@ -106,7 +161,7 @@ async def _process_uploaded_file(message: Message, file_path: Path) -> Dict[str,
         logger.info(f"Dosya işleniyor: {file_path}")
         
         # Doğrulama
-        validation_result = _validate_excel_file(file_path)
+        validation_result = await _validate_async(session or file_path)
         if not validation_result["valid"]:
             logger.error(f"Doğrulama hatası: {validation_result['message']}")
             return {
@@ -117,7 +172,8 @@ async def _process_uploaded_file(message: Message, file_path: Path) -> Dict[str,
         logger.info(f"Doğrulama başarılı: {validation_result['row_count']} satır")
         
         # İşlemi başlat
-        task_result = await process_excel_task(file_path, message.from_user.id)
+        task_result = await process_excel_task(file_path, message.from_user.id, session=session,
+                                               streaming_only=streaming_only)
         logger.info(f"İşlem sonucu: {task_result}")
         return task_result
         
@@ -202,6 +258,7 @@ async def handle_excel_upload(message: Message, state: FSMContext):
     normalized_name = f"{clean_name}{file_ext}"   # Örn: RAPOR.XLSX → RAPOR.xlsx
 
     file_path = None
+    session = None
 
     try:
         logger.info(f"Dosya alındı: {original_name}, Boyut: {message.document.file_size}")
@@ -215,9 +272,19 @@ async def handle_excel_upload(message: Message, state: FSMContext):
         )
         logger.info(f"Dosya indirme tamamlandı: {file_path}")
 
-        # 2. Doğrulama
+        # 2. Ön kontrol (zip merkez dizini) + doğrulama (dosya bir kez ayrıştırılır, oturum aktarılır)
         await message.answer("🔍 Dosya kontrol ediliyor...")
-        validation_result = _validate_excel_file(file_path)
+        inspection = check_upload(file_path)
+        if inspection.rejected:
+            await message.answer(f"❌ {inspection.reason}")
+            return
+
+        try:
+            session = await _open_upload_session(file_path, inspection)
+        except ValueError as e:  # INPUT_SHEETS: sayfa bulunamadı / TARİH ve İL başlıklı sayfa yok
+            await message.answer(f"❌ {e}")
+            return
+        validation_result = await _validate_async(session or file_path)
         if not validation_result["valid"]:
             await message.answer(f"❌ {validation_result['message']}")
             await state.clear()
@@ -227,7 +294,7 @@ async def handle_excel_upload(message: Message, state: FSMContext):
 
         # 3. Dosya işleme
         await message.answer("⏳ Dosya işleniyor, lütfen bekleyin...")
-        task_result = await _process_uploaded_file(message, file_path)
+        task_result = await _process_uploaded_file(message, file_path, session, inspection.streaming_only)
 
         if task_result["success"]:
             # report = await generate_processing_report(task_result)
@@ -258,6 +325,8 @@ async def handle_excel_upload(message: Message, state: FSMContext):
         logger.error(traceback.format_exc())
 
     finally:
+        if session is not None:
+            session.close()
         if file_path and file_path.exists():
             try:
                 file_path.unlink()
@@ -12,7 +12,6 @@ Ham Excel → Tel Excel → TC Merge → Excel Process → Sonuç (satır halind
 
 """
 
-import asyncio
 from pathlib import Path
 import tempfile
 
@@ -23,7 +22,9 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from config import config
-from utils.tc_merger import build_merged_excel, process_city_il
+from utils.tc_merger import SGK_PIPELINE_MEMORY, build_merged_excel, build_sgk_session, process_city_il
+from utils.process_sandbox import run_job
+from utils.upload_inspector import check_upload
 from utils.excel_process import process_excel_task
 from utils.reporter import generate_processing_report
 from utils.mailer import send_email
@@ -71,6 +72,13 @@ async def handle_main_excel(message: Message, state: FSMContext):
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
         tmp.close()
         await message.bot.download_file(file_info.file_path, tmp.name)
+
+        # Ön kontrol: zip bombası / aşırı büyük dosya pandas'a hiç verilmez
+        inspection = check_upload(tmp.name)
+        if inspection.rejected:
+            Path(tmp.name).unlink(missing_ok=True)
+            await message.answer(f"❌ {inspection.reason}")
+            return
         
         # ✅ İLK DOSYA ADINI KAYDET
         main_excel_name = message.document.file_name
@@ -111,6 +119,8 @@ async def handle_data_excel(message: Message, state: FSMContext):
         await state.clear()
         return
 
+    session = None  # bellek içi akışın oturumu (SGK_PIPELINE=memory)
+    invalid_tc = 0  # TC Kimlik sağlama kontrolünden geçmeyen satır
     try:
         # İkinci dosyayı indir
         file_info = await message.bot.get_file(message.document.file_id)
@@ -119,39 +129,62 @@ async def handle_data_excel(message: Message, state: FSMContext):
         await message.bot.download_file(file_info.file_path, tmp.name)
         data_excel = Path(tmp.name)
 
+        inspection = check_upload(data_excel)
+        if inspection.rejected:  # finally: iki dosya silinir, durum temizlenir
+            await message.answer(f"❌ {inspection.reason}")
+            return
+
         await message.answer("🔄 **İşlem başlatıldı...**")
 
-        # 1. TC Merge işlemi
-        await message.answer("1️⃣ TC eşleştirmesi yapılıyor...")
-        
         merge_path = config.paths.TEMP_DIR / "sgk1.xlsx"
-        final_merged = await asyncio.get_running_loop().run_in_executor(
-            None,
-            build_merged_excel,
-            main_excel,
-            data_excel,
-            merge_path
-        )
-
-        # 2. City/İL düzenleme
-        await message.answer("2️⃣ Şehir/İL düzenlemesi yapılıyor...")
-        
         final_path = config.paths.TEMP_DIR / "sgk2.xlsx"
-        await asyncio.get_running_loop().run_in_executor(
-            None,
-            process_city_il,
-            final_merged,
-            final_path
-        )
+
+        if (config.bot.SGK_PIPELINE or "").lower() == SGK_PIPELINE_MEMORY:
+            # 1+2. Merge + City/İL bellekte (ara xlsx yok); sgk2.xlsx sadece input maili / hata ayıklama için
+            await message.answer("1️⃣ TC eşleştirmesi ve Şehir/İL düzenlemesi yapılıyor...")
+            debug = config.bot.SGK_DEBUG_ARTIFACTS
+            sgk_result = await run_job(
+                build_sgk_session,
+                main_excel,
+                data_excel,
+                merge_path if debug else None,
+                final_path if debug or config.email.INPUT_EMAIL else None
+            )
+            if sgk_result is not None:
+                session, invalid_tc = sgk_result
+
+        if session is None:
+            # 1. TC Merge işlemi
+            await message.answer("1️⃣ TC eşleştirmesi yapılıyor...")
+
+            # birleştirme (MERGE_ENGINE) sandbox süreçte (bellek/CPU limiti + zaman aşımı; loop bloklanmaz)
+            final_merged = await run_job(
+                build_merged_excel,
+                main_excel,
+                data_excel,
+                merge_path
+            )
+
+            # 2. City/İL düzenleme
+            await message.answer("2️⃣ Şehir/İL düzenlemesi yapılıyor...")
+
+            invalid_tc = await run_job(
+                process_city_il,
+                final_merged,
+                final_path
+            )
 
         # 3. Excel işleme (excel_process modülü)
         await message.answer("3️⃣ Excel işleme ve mail gönderimi başlatılıyor...")
 
         # ✅ main_excel_name'i parametre olarak gönder
+        # session: bellek içi akışın tablosu → sgk2.xlsx tekrar ayrıştırılmaz
         processing_result = await process_excel_task(
             final_path, 
             user_id=message.from_user.id,
-            main_excel_name=main_excel_name  # Bu parametreyi ekleyin
+            main_excel_name=main_excel_name,  # Bu parametreyi ekleyin
+            session=session,
+            extra_stats={"invalid_tc": invalid_tc}
         )
 
         # ilk dosya adını İşlem sonucuna ekle
@@ -176,12 +209,15 @@ async def handle_data_excel(message: Message, state: FSMContext):
 
     finally:
         # Temizlik
+        if session is not None:
+            session.close()
         try:
             for path in [main_excel, data_excel]:
                 if path and path.exists():
                     path.unlink(missing_ok=True)
             
-            temp_files = ["sgk1.xlsx", "sgk2.xlsx"]
+            # hata ayıklama çıktıları (SGK_DEBUG_ARTIFACTS) incelenmek üzere bırakılır
+            temp_files = [] if config.bot.SGK_DEBUG_ARTIFACTS else ["sgk1.xlsx", "sgk2.xlsx"]
             for file_name in temp_files:
                 file_path = config.paths.TEMP_DIR / file_name
                 if file_path.exists():
@@ -20,8 +20,6 @@ from utils.handler_loader import HandlerLoader
 # from utils.mailer import get_default_mailer # Mailer.stop için
 
 from utils.logger import setup_logger, logger
-# Logger kurulumu
-setup_logger()
 
 class BotServer:
     """Bot server management with async/sync harmony"""
@@ -190,6 +188,9 @@ async def main():
         await server.shutdown()
 
 if __name__ == "__main__":
+    # Logger kurulumu sadece bot süreci için: spawn ile başlayan sandbox / writer süreçleri bu modülü
+    # __mp_main__ olarak tekrar import eder, aynı log dosyalarına ikinci bir yazıcı açmamalı
+    setup_logger()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,228 @@
+# utils/benchmark.py
+"""
+Excel işleme performans ölçümleri (bağımsız çalışır, bot gerektirmez)
+
+KULLANIM:
+    python -m utils.benchmark splitter --rows 200000
+    python -m utils.benchmark splitter --rows 200000 --batch 1 500 1000 5000
+    python -m utils.benchmark splitter --rows 500000 --batch 1000 --backend thread process
+    python -m utils.benchmark reader --rows 200000
+    python -m utils.benchmark writer --rows 500000
+    python -m utils.benchmark rowstore --rows 200000
+
+- splitter: ExcelSplitter satır/sn ölçümü
+  batch=1 → eski davranış (satır motoru, her satır için ayrı executor çağrısı)
+  batch>1 → tamponlu grup yazımı (BATCH_PROCESSING_SIZE, ROUTING_ENGINE ayarındaki motor)
+  backend → thread (varsayılan) | process (WRITER_PROCESSES worker süreç)
+- reader: xlsx okuma satır/sn (native zip + iterparse ↔ openpyxl read_only)
+- writer: tek grup dosyası yazma satır/sn (xlsxwriter constant_memory ↔ native zip akışı)
+- rowstore: okunan satırların bellek kullanımı (tuple listesi ↔ ColumnarRowStore)
+
+Sentetik giriş dosyası temp klasörde oluşturulur, çıktılar her ölçümden sonra silinir.
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+import aiofiles.os  # group_manager.load_groups aiofiles.os.path kullanır
+import xlsxwriter
+
+from config import config
+from utils.group_manager import group_manager
+from utils.logger import logger
+
+BENCH_HEADERS = ["TARİH", "İL", "AD", "TC", "DURUM", "TEDAVİ", "GSM"]
+UNKNOWN_CITIES = ["Bilinmeyen", "Yurtdışı", "KKTC"]
+
+
+def _bench_cities() -> List[str]:
+    """groups.json'daki şehirler + eşleşmeyen birkaç şehir"""
+    cities = sorted({city for group in group_manager.groups.values() for city in group.cities})
+    return cities + UNKNOWN_CITIES
+
+
+def make_synthetic_rows(row_count: int, cities: List[str], seed: int = 42):
+    """Temizlenmiş dosya düzeninde (TARİH, İL, ...) sentetik satırlar üretir"""
+    rnd = random.Random(seed)
+    base = date(2025, 1, 1)
+    dates = [(base + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(60)]
+    for i in range(row_count):
+        yield (
+            rnd.choice(dates),
+            rnd.choice(cities),
+            f"AD SOYAD {i}",
+            10000000000 + i,
+            rnd.choice(["AKTİF", "PASİF"]),
+            rnd.choice(["AYAKTA", "YATARAK"]),
+            f"5{rnd.randint(100000000, 999999999)}",
+        )
+
+
+def make_synthetic_excel(path: Path, row_count: int, cities: List[str]) -> Path:
+    wb = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+    ws = wb.add_worksheet("Veriler")
+    ws.write_row(0, 0, BENCH_HEADERS)
+    for idx, row in enumerate(make_synthetic_rows(row_count, cities), start=1):
+        ws.write_row(idx, 0, row)
+    wb.close()
+    return path
+
+
+async def bench_splitter(row_count: int, batch_sizes: List[int], backends: List[str]) -> None:
+    from utils.excel_splitter import ROUTING_ENGINE_ROW, ExcelSplitter
+
+    await group_manager.initialize()
+    work_dir = Path(tempfile.mkdtemp(prefix="kova_bench_"))
+    original_output_dir = config.paths.OUTPUT_DIR
+
+    try:
+        input_path = make_synthetic_excel(work_dir / "input.xlsx", row_count, _bench_cities())
+        print(f"📄 Sentetik giriş: {row_count} satır, {len(BENCH_HEADERS)} sütun")
+
+        for backend, batch_size in itertools.product(backends, batch_sizes):
+            output_dir = work_dir / f"out_{backend}_{batch_size}"
+            output_dir.mkdir()
+            config.paths.OUTPUT_DIR = output_dir
+
+            # batch=1 karşılaştırma tabanı: vectorized motor batch'ten bağımsız grup başına blok yazar,
+            # eski davranış sadece satır motoruyla ölçülür
+            splitter = ExcelSplitter(str(input_path), BENCH_HEADERS, batch_size=batch_size,
+                                     writer_backend=backend,
+                                     routing_engine=ROUTING_ENGINE_ROW if batch_size == 1 else None)
+            started = time.perf_counter()
+            result = await splitter.run()
+            elapsed = time.perf_counter() - started
+
+            label = "eski (satır başına executor)" if batch_size == 1 \
+                else f"batch={batch_size} ({splitter.routing_engine})"
+            label = f"{backend} {label}"
+            print(
+                f"• {label:<30} {elapsed:8.2f} sn  "
+                f"{result['processed_rows'] / elapsed:10.0f} satır/sn  "
+                f"({len(result['output_files'])} dosya)"
+            )
+            shutil.rmtree(output_dir, ignore_errors=True)
+    finally:
+        config.paths.OUTPUT_DIR = original_output_dir
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_reader(row_count: int, backends: List[str]) -> None:
+    from utils.xlsx_reader import open_workbook
+
+    asyncio.run(group_manager.initialize())
+    work_dir = Path(tempfile.mkdtemp(prefix="kova_bench_"))
+    try:
+        input_path = make_synthetic_excel(work_dir / "input.xlsx", row_count, _bench_cities())
+        print(f"📄 Sentetik giriş: {row_count} satır, {len(BENCH_HEADERS)} sütun")
+
+        for backend in backends:
+            started = time.perf_counter()
+            wb = open_workbook(input_path, backend=backend)
+            try:
+                rows = sum(1 for _ in wb.active.iter_rows(min_row=2, values_only=True))
+            finally:
+                wb.close()
+            elapsed = time.perf_counter() - started
+            print(f"• {backend:<30} {elapsed:8.2f} sn  {rows / elapsed:10.0f} satır/sn")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_writer(row_count: int, engines: List[str], batch_size: int = 1000) -> None:
+    from utils.output_writers import create_group_writer
+
+    asyncio.run(group_manager.initialize())
+    work_dir = Path(tempfile.mkdtemp(prefix="kova_bench_"))
+    try:
+        rows = list(make_synthetic_rows(row_count, _bench_cities()))
+        print(f"📄 Sentetik grup: {row_count} satır, {len(BENCH_HEADERS)} sütun")
+
+        for engine in engines:
+            path = work_dir / f"grup_{engine}.xlsx"
+            started = time.perf_counter()
+            writer = create_group_writer(path, BENCH_HEADERS, xlsx_engine=engine)
+            try:
+                for start in range(0, row_count, batch_size):
+                    writer.write_rows(start + 1, rows[start:start + batch_size])
+            finally:
+                writer.close()
+            elapsed = time.perf_counter() - started
+            size_mb = path.stat().st_size / 1024 / 1024
+            print(f"• {engine:<30} {elapsed:8.2f} sn  {row_count / elapsed:10.0f} satır/sn  ({size_mb:.1f} MB)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_rowstore(row_count: int) -> None:
+    """Splitter'ın non-streaming okuması: tüm satırlar bellekte (tracemalloc ile ölçülür)"""
+    import tracemalloc
+    from utils.excel_splitter import _sync_read_all_rows
+
+    asyncio.run(group_manager.initialize())
+    work_dir = Path(tempfile.mkdtemp(prefix="kova_bench_"))
+    try:
+        input_path = make_synthetic_excel(work_dir / "input.xlsx", row_count, _bench_cities())
+        print(f"📄 Sentetik giriş: {row_count} satır, {len(BENCH_HEADERS)} sütun")
+
+        for label in ("tuple", "columnar"):
+            tracemalloc.start()
+            started = time.perf_counter()
+            held = _sync_read_all_rows(str(input_path), columnar=(label == "columnar"))
+            elapsed = time.perf_counter() - started
+            current_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+            tracemalloc.stop()
+            print(f"• {label:<30} {elapsed:8.2f} sn  {current_mb:8.1f} MB  "
+                  f"({current_mb * 1024 * 1024 / row_count:.0f} bayt/satır)")
+            del held
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kova Excel benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_split = sub.add_parser("splitter", help="ExcelSplitter satır/sn")
+    p_split.add_argument("--rows", type=int, default=200_000)
+    p_split.add_argument("--batch", type=int, nargs="+",
+                         default=[1, config.bot.BATCH_PROCESSING_SIZE])
+    p_split.add_argument("--backend", nargs="+", default=[config.bot.WRITER_BACKEND],
+                         choices=["thread", "process"])
+
+    p_read = sub.add_parser("reader", help="xlsx okuyucu satır/sn")
+    p_read.add_argument("--rows", type=int, default=200_000)
+    p_read.add_argument("--backend", nargs="+", default=["openpyxl", "native"],
+                        choices=["openpyxl", "native"])
+
+    p_write = sub.add_parser("writer", help="grup xlsx yazıcı satır/sn")
+    p_write.add_argument("--rows", type=int, default=500_000)
+    p_write.add_argument("--backend", nargs="+", default=["xlsxwriter", "native"],
+                         choices=["xlsxwriter", "native"])
+
+    p_store = sub.add_parser("rowstore", help="ara satır deposu bellek kullanımı")
+    p_store.add_argument("--rows", type=int, default=200_000)
+
+    args = parser.parse_args()
+    logger.remove()  # ölçüm çıktısını log satırları bozmasın
+
+    if args.command == "splitter":
+        asyncio.run(bench_splitter(args.rows, args.batch, args.backend))
+    elif args.command == "reader":
+        bench_reader(args.rows, args.backend)
+    elif args.command == "writer":
+        bench_writer(args.rows, args.backend)
+    elif args.command == "rowstore":
+        bench_rowstore(args.rows)
+
+
+if __name__ == "__main__":
+    main()
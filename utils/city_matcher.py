@@ -0,0 +1,135 @@
+# utils/city_matcher.py
+"""
+Şehir eşleştirici: tablo tabanlı Türkçe katlama + Aho-Corasick otomatı
+
+CityProcessor eskiden her hücrede zincirleme replace + NFKD + karakter join yapıp
+80+ seçenekli \b(...)\b regex'ini str.extract ile çalıştırıyordu. Burada:
+- fold_turkish(text): tek str.translate; tablo bir karakter ilk görüldüğünde eski
+  normalize adımlarıyla (İ/ı, lower, NFKD, birleşik işaret silme, ş/ç/ü/ö/ğ) doldurulur.
+  Bu adımlar karakter bazlı olduğundan sonuç aynıdır.
+- CityMatcher: katlanmış şehir adları (+ Afyon, İçel gibi takma adlar) tek otomatta,
+  metin bir kez taranır. Regex anlamı korunur: en soldaki eşleşme, aynı başlangıçta en
+  uzun ad, iki uçta kelime sınırı (\b)
+- match_column(values): ham metin → şehir önbelleği; SGK İL hücreleri çok tekrar eder
+"""
+
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+MATCH_CACHE_MAX = 100_000  # farklı ham metin sayısı; aşılırsa önbellek sıfırlanır
+
+
+def _fold_char(ch: str) -> str:
+    """Tek karakterin katlanmış hali (eski normalize_turkish adımları)"""
+    text = ch.replace("İ", "I").replace("ı", "i").lower()
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return (
+        text.replace("ş", "s")
+            .replace("ç", "c")
+            .replace("ü", "u")
+            .replace("ö", "o")
+            .replace("ğ", "g")
+    )
+
+
+class _FoldTable(dict):
+    """str.translate tablosu; eksik karakter ilk kullanımda hesaplanıp saklanır"""
+
+    def __missing__(self, code: int) -> str:
+        folded = self[code] = _fold_char(chr(code))
+        return folded
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def fold_turkish(text: str) -> str:
+    """Küçük harf, aksansız, Türkçe karakterler ASCII karşılığında (tek translate)"""
+    return text.translate(_FOLD_TABLE)
+
+
+def _is_word(ch: str) -> bool:
+    # re modülündeki \w (unicode) ile aynı
+    return ch.isalnum() or ch == "_"
+
+
+class CityMatcher:
+    """Katlanmış ad → şehir sözlüğünden kurulan Aho-Corasick otomatı"""
+
+    def __init__(self, names: Dict[str, str]):
+        self._names = dict(names)
+        self._max_length = max((len(name) for name in self._names), default=0)
+        self._cache: Dict[str, Optional[str]] = {}
+
+        # goto: düğüm başına karakter → düğüm; fail: en uzun uygun sonek düğümü; out: biten ad uzunlukları
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for name in self._names:
+            node = 0
+            for ch in name:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = self._goto[node][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(len(name))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = fail if fail != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Optional[str]:
+        """Metindeki ilk şehir (regex.search ile aynı seçim); yoksa None"""
+        folded = fold_turkish(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(folded)
+        best_start = best_end = -1
+        node = 0
+        for i, ch in enumerate(folded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            end = i + 1
+            for size in out[node]:
+                start = end - size
+                if start and _is_word(folded[start - 1]):
+                    continue
+                if end < length and _is_word(folded[end]):
+                    continue
+                if best_start < 0 or start < best_start or (start == best_start and end > best_end):
+                    best_start, best_end = start, end
+            # Sonraki eşleşmeler daha solda başlayamaz
+            if best_start >= 0 and best_start < end + 1 - self._max_length:
+                break
+        if best_start < 0:
+            return None
+        return self._names[folded[best_start:best_end]]
+
+    def match(self, text: str) -> Optional[str]:
+        """find + ham metin önbelleği"""
+        try:
+            return self._cache[text]
+        except KeyError:
+            pass
+        if len(self._cache) >= MATCH_CACHE_MAX:
+            self._cache.clear()
+        city = self._cache[text] = self.find(text)
+        return city
+
+    def match_column(self, values: Iterable[str]) -> List[Optional[str]]:
+        """Sütunun her hücresi için şehir (None: bulunamadı)"""
+        match = self.match
+        return [match(value) for value in values]
@@ -0,0 +1,115 @@
+# utils/city_router.py
+"""
+Vektörel şehir → grup yönlendirme (ExcelSplitter için)
+
+- İL değerleri sözlük kodlamasıyla (dictionary encoding) tamsayı kodlara çevrilir
+  (kod 0 = boş İL; satır hiçbir dosyaya yazılmaz)
+- group_manager.city_to_group'tan şehir-kodu × grup üyelik maskesi kurulur
+- Her chunk için tek geçişte grup başına satır indeks dizileri üretilir
+- Birden fazla gruba giren şehirler (örn. Adana: grup_1 + grup_2) maske ile çözülür,
+  satır başına tekrar tekrar lookup yapılmaz
+- Chunk ColumnarRowStore ise İL sütununun sözlük kodları doğrudan kullanılır (satır gezilmez)
+"""
+
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.columnar_store import ColumnarRowStore
+
+UNMATCHED_GROUP_ID = "grup_0"
+
+
+class RoutedChunk(NamedTuple):
+    """Bir chunk'ın yönlendirme sonucu"""
+    codes: np.ndarray                                   # satır başına şehir kodu
+    group_rows: List[Tuple[str, np.ndarray]]            # (group_id, satır indeksleri) ilk görülme sırasıyla
+    unmatched_rows: np.ndarray                          # hiçbir gruba girmeyen (İL dolu) satırlar
+    matched_count: int
+
+
+class VectorizedCityRouter:
+    """Şehir kodları ve üyelik maskesi; chunk'lar arasında korunur"""
+
+    def __init__(self, group_ids: List[str], lookup: Callable[[Any], List[str]]):
+        # grup_0 maskeye girmez: eşleşmeyen = maskede hiç bit olmayan satır
+        self._group_ids: List[str] = [g for g in group_ids if g != UNMATCHED_GROUP_ID]
+        self._group_index: Dict[str, int] = {g: i for i, g in enumerate(self._group_ids)}
+        self._lookup = lookup
+
+        self._city_codes: Dict[Any, int] = {}
+        self._cities: List[Any] = [None]  # kod 0: boş İL
+        self._member_rows: List[List[int]] = [[]]
+        self._membership = np.zeros((1, len(self._group_ids)), dtype=bool)
+        self._dirty = False
+
+    def city(self, code: int) -> Any:
+        return self._cities[code]
+
+    def _encode_city(self, city: Any) -> int:
+        code = self._city_codes.get(city)
+        if code is not None:
+            return code
+
+        members = []
+        for group_id in self._lookup(city) or []:
+            if group_id == UNMATCHED_GROUP_ID:
+                continue
+            if group_id not in self._group_index:
+                self._group_index[group_id] = len(self._group_ids)
+                self._group_ids.append(group_id)
+            members.append(self._group_index[group_id])
+
+        code = len(self._cities)
+        self._city_codes[city] = code
+        self._cities.append(city)
+        self._member_rows.append(members)
+        self._dirty = True
+        return code
+
+    def _rebuild_membership(self) -> None:
+        membership = np.zeros((len(self._cities), len(self._group_ids)), dtype=bool)
+        for code, members in enumerate(self._member_rows):
+            membership[code, members] = True
+        self._membership = membership
+        self._dirty = False
+
+    def route(self, chunk: Sequence[tuple]) -> RoutedChunk:
+        """Chunk'ı gruplara ayırır (satır sırası grup içinde korunur)"""
+        encoded = chunk.encoded_column(1) if isinstance(chunk, ColumnarRowStore) else None
+        if encoded is not None:
+            # Depo İL'i zaten sözlük kodlamış; boş/NaN değerler factorize'daki gibi koda 0 gider
+            local_codes, uniques = encoded
+            uniques = [None if city != city else city for city in uniques]
+        else:
+            cities = [row[1] if len(row) > 1 else None for row in chunk]
+            # Chunk içi kodlama (C seviyesinde), sonra sadece tekil değerler global koda çevrilir
+            local_codes, uniques = pd.factorize(pd.Series(cities, dtype=object))
+        global_codes = np.array(
+            [self._encode_city(city) if city else 0 for city in uniques] + [0],
+            dtype=np.int32,
+        )
+        codes = global_codes[local_codes]  # -1 (None/NaN) → son eleman → 0
+
+        if self._dirty:
+            self._rebuild_membership()
+
+        mask = self._membership[codes]
+        matched = mask.any(axis=1)
+
+        # Satırdaki grup sırası ile ilk görülme sırasını koru (satır bazlı motorla aynı dosya sırası)
+        first_seen = []
+        for gi in np.flatnonzero(mask.any(axis=0)):
+            first_row = int(np.argmax(mask[:, gi]))
+            position = self._member_rows[codes[first_row]].index(gi)
+            first_seen.append((first_row, position, int(gi)))
+        first_seen.sort()
+
+        group_rows = [
+            (self._group_ids[gi], np.flatnonzero(mask[:, gi]))
+            for _, _, gi in first_seen
+        ]
+
+        unmatched = np.flatnonzero(~matched & (codes != 0))
+        return RoutedChunk(codes, group_rows, unmatched, int(matched.sum()))
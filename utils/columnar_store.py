@@ -0,0 +1,272 @@
+# utils/columnar_store.py
+"""
+Sütun bazlı (columnar) ara satır deposu
+
+Satırlar aşamalar arasında tuple listesi olarak taşınınca her satır kendi
+İL / TARİH / DURUM / TEDAVİ referanslarını ve tuple başlığını taşır.
+ColumnarRowStore satırları sütun sütun tutar:
+- int / float sütunlar → array('q') / array('d') tamponları (numpy ile kopyasız okunur)
+- düşük kardinaliteli sütunlar → sözlük kodlaması (değer listesi + array('I') kodları)
+- tekil değerli sütunlar (AD, GSM ...) → düz liste
+- view(row_ids) → grup dilimi için kopyasız görünüm; tuple'lar sadece yazım anında kurulur
+
+Tür korunur: 1, 1.0 ve True farklı değer olarak kodlanır, kısa satırlar kısa döner.
+"""
+
+from array import array
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+KIND_INT = "int"
+KIND_FLOAT = "float"
+KIND_DICT = "dict"
+KIND_OBJECT = "object"
+
+DICT_MIN_ROWS = 1000       # kardinalite kararı için en az satır
+DICT_MAX_RATIO = 0.5       # tekil değer / satır oranı bunu aşarsa sözlük bırakılır
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def _dict_key(value: Any) -> Any:
+    """Sözlük anahtarı: 1 == 1.0 == True çakışmasın diye sayılar türüyle anahtarlanır"""
+    if value is None or type(value) is str:
+        return value
+    return type(value), value
+
+
+class _Column:
+    """Tek sütun; tür uymayan değer gelince düz listeye (object) düşer"""
+
+    __slots__ = ("kind", "data", "values", "index", "_values_np")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._values_np = None
+        self.values: List[Any] = []
+        self.index = {}
+        if kind == KIND_INT:
+            self.data = array("q")
+        elif kind == KIND_FLOAT:
+            self.data = array("d")
+        elif kind == KIND_DICT:
+            self.data = array("I")
+        else:
+            self.data = []
+
+    @staticmethod
+    def detect(values: List[Any]) -> str:
+        if values and all(type(v) is int for v in values):
+            if _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+                return KIND_INT
+        if values and all(type(v) is float for v in values):
+            return KIND_FLOAT
+        return KIND_DICT
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def decode_all(self) -> List[Any]:
+        if self.kind == KIND_DICT:
+            return [self.values[code] for code in self.data]
+        return list(self.data) if self.kind != KIND_OBJECT else self.data
+
+    def demote(self) -> None:
+        """Düz listeye çevirir (tür ihlali veya yüksek kardinalite)"""
+        if self.kind == KIND_OBJECT:
+            return
+        self.data = self.decode_all()
+        self.kind = KIND_OBJECT
+        self.values, self.index, self._values_np = [], {}, None
+
+    def extend(self, values: List[Any]) -> None:
+        if self.kind == KIND_INT:
+            if all(type(v) is int for v in values):
+                try:
+                    self.data.extend(values)
+                    return
+                except OverflowError:
+                    pass
+            self.demote()
+        elif self.kind == KIND_FLOAT:
+            if all(type(v) is float for v in values):
+                self.data.extend(values)
+                return
+            self.demote()
+
+        if self.kind == KIND_DICT:
+            index, dictionary = self.index, self.values
+            size = len(dictionary)
+            codes = []
+            for value in values:
+                key = _dict_key(value)
+                code = index.get(key)
+                if code is None:
+                    code = index[key] = len(dictionary)
+                    dictionary.append(value)
+                codes.append(code)
+            self.data.extend(codes)
+            if len(dictionary) != size:
+                self._values_np = None
+            if len(self.data) >= DICT_MIN_ROWS and len(dictionary) > len(self.data) * DICT_MAX_RATIO:
+                self.demote()
+            return
+
+        self.data.extend(values)
+
+    def take(self, row_ids: np.ndarray) -> List[Any]:
+        """Satır indekslerindeki değerler (Python nesneleri)"""
+        if self.kind == KIND_OBJECT:
+            data = self.data
+            return [data[i] for i in row_ids.tolist()]
+        buffer = np.frombuffer(self.data, dtype=self._dtype()) if len(self.data) else np.empty(0, self._dtype())
+        picked = buffer[row_ids]
+        if self.kind != KIND_DICT:
+            return picked.tolist()
+        if self._values_np is None:
+            values_np = np.empty(len(self.values), dtype=object)
+            values_np[:] = self.values
+            self._values_np = values_np
+        return self._values_np[picked].tolist()
+
+    def codes(self) -> np.ndarray:
+        return np.frombuffer(self.data, dtype=self._dtype())
+
+    def _dtype(self):
+        return {KIND_INT: np.int64, KIND_FLOAT: np.float64, KIND_DICT: np.uint32}[self.kind]
+
+    def nbytes(self) -> int:
+        if self.kind == KIND_OBJECT:
+            return 0
+        return self.data.itemsize * len(self.data)
+
+    # Pickle (süreçler arası): indeks ve numpy önbelleği taşınmaz, değer listesinden yeniden kurulur
+    def __getstate__(self):
+        return self.kind, self.data, self.values
+
+    def __setstate__(self, state) -> None:
+        self.kind, self.data, self.values = state
+        self.index = {_dict_key(value): code for code, value in enumerate(self.values)}
+        self._values_np = None
+
+
+class ColumnarRowStore:
+    """Satır deposu: extend(rows) ile büyür, len/indeks/iter ile tuple listesi gibi okunur"""
+
+    def __init__(self):
+        self._columns: List[_Column] = []
+        self._length = 0
+        self._width = 0
+        self._widths: Optional[array] = None  # satır uzunlukları sadece farklılık varsa tutulur
+
+    @classmethod
+    def from_rows(cls, rows: List[tuple]) -> "ColumnarRowStore":
+        store = cls()
+        store.extend(rows)
+        return store
+
+    def __len__(self) -> int:
+        return self._length
+
+    def extend(self, rows: List[tuple]) -> None:
+        if not rows:
+            return
+        widths = [len(row) for row in rows]
+        width = max(widths)
+        if self._length == 0 and self._widths is None:
+            self._width = widths[0]
+
+        if self._widths is None and any(w != self._width for w in widths):
+            self._widths = array("H", [self._width]) * self._length
+        if self._widths is not None:
+            self._widths.extend(widths)
+
+        padded = rows
+        if self._widths is not None:
+            padded = [row + (None,) * (width - len(row)) if len(row) < width else row for row in rows]
+        columns_data = list(zip(*padded))
+
+        for c in range(width):
+            values = list(columns_data[c])
+            if c == len(self._columns):
+                # Yeni sütun: önceki satırlar için None ile başlar
+                prefix = [None] * self._length
+                column = _Column(_Column.detect(prefix + values))
+                column.extend(prefix)
+                self._columns.append(column)
+            self._columns[c].extend(values)
+        for column in self._columns[width:]:
+            column.extend([None] * len(rows))
+
+        self._width = max(self._width, width)
+        self._length += len(rows)
+
+    # ---------- okuma ----------
+    def _row_ids(self, rows: Union[slice, np.ndarray, Sequence[int]]) -> np.ndarray:
+        if isinstance(rows, slice):
+            return np.arange(self._length, dtype=np.intp)[rows]
+        return np.asarray(rows, dtype=np.intp)
+
+    def take(self, row_ids: Union[slice, np.ndarray, Sequence[int]]) -> List[tuple]:
+        """Satırları tuple listesi olarak kurar (sütun başına tek toplu okuma)"""
+        row_ids = self._row_ids(row_ids)
+        if not len(row_ids):
+            return []
+        rows = list(zip(*[column.take(row_ids) for column in self._columns]))
+        if self._widths is not None:
+            widths = np.frombuffer(self._widths, dtype=np.uint16)[row_ids].tolist()
+            rows = [row if len(row) == w else row[:w] for row, w in zip(rows, widths)]
+        return rows
+
+    def view(self, row_ids: Union[slice, np.ndarray, Sequence[int]]) -> "RowView":
+        return RowView(self, self._row_ids(row_ids))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.view(item)
+        if item < 0:
+            item += self._length
+        if not 0 <= item < self._length:
+            raise IndexError(item)
+        return self.take(np.array([item], dtype=np.intp))[0]
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.take(slice(None)))
+
+    def encoded_column(self, index: int) -> Optional[Tuple[np.ndarray, List[Any]]]:
+        """Sözlük kodlu sütunun (kodlar, değerler) çifti; kodlu değilse None"""
+        if index >= len(self._columns) or self._columns[index].kind != KIND_DICT:
+            return None
+        column = self._columns[index]
+        return column.codes().copy(), column.values  # kopya: depo büyürse tampon yeniden ayrılabilir
+
+    def column_kinds(self) -> List[str]:
+        return [column.kind for column in self._columns]
+
+    def nbytes(self) -> int:
+        """Sayısal/kod tamponlarının boyutu (düz liste sütunları hariç)"""
+        return sum(column.nbytes() for column in self._columns)
+
+
+class RowView:
+    """Deponun satır alt kümesi; kopyasız, tuple'lar iterasyonda toplu kurulur"""
+
+    __slots__ = ("store", "row_ids")
+
+    def __init__(self, store: ColumnarRowStore, row_ids: np.ndarray):
+        self.store = store
+        self.row_ids = row_ids
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return RowView(self.store, self.row_ids[item])
+        return self.store.take(self.row_ids[[item]])[0]
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.store.take(self.row_ids))
+
+    def tolist(self) -> List[tuple]:
+        return self.store.take(self.row_ids)
@@ -0,0 +1,145 @@
+# utils/date_normalizer.py
+"""
+TARİH sütunu normalizasyonu (sütun bazında, önbellekli)
+
+Temizlenmiş dosyada TARİH "YYYY-MM-DD" metnidir. Hücre hücre strptime / strftime yerine
+sütun (chunk) bir kerede işlenir:
+- datetime / date      → tekil değerler bir kez biçimlenir
+- Excel seri sayısı    → numpy ile toplu çevrilir (1899-12-30 tabanı, 1900 artık yıl hatası dahil)
+- metin                → biçim ilk örneklerden tespit edilir ve önce o denenir;
+                         tekil metinler sınırlı LRU önbellekte tutulur (yüklemelerde birkaç düzine tarih olur)
+- çevrilemeyen hücre   → olduğu gibi bırakılır ve sayılır (unparsed)
+"""
+
+import functools
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+DATE_OUTPUT_FORMAT = "%Y-%m-%d"
+DATE_INPUT_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%d.%m.%Y %H:%M:%S")
+DATE_CACHE_SIZE = 4096
+DATE_SAMPLE_SIZE = 50
+
+EXCEL_EPOCH = np.datetime64("1899-12-30", "D")
+EXCEL_SERIAL_MAX = 2958465  # 9999-12-31
+
+_KEEP = object()      # boş metin: dokunulmaz, sayılmaz
+_UNPARSED = object()  # tarih değil: dokunulmaz, sayılır
+
+
+def _try_format(text: str, fmt: str) -> Optional[date]:
+    try:
+        return datetime.strptime(text, fmt).date()
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_text(text: str, preferred: Optional[str] = None) -> Optional[date]:
+    """Metni tarihe çevirir; preferred biçim önce denenir (sonuç önbellekte)"""
+    formats = DATE_INPUT_FORMATS
+    if preferred is not None:
+        formats = (preferred,) + tuple(fmt for fmt in DATE_INPUT_FORMATS if fmt != preferred)
+    for fmt in formats:
+        parsed = _try_format(text, fmt)
+        if parsed is not None:
+            return parsed
+    return None
+
+
+def detect_date_format(samples: Sequence[str]) -> Optional[str]:
+    """Örnek metinlerin en çoğunu çözen biçim (hiçbiri çözülmezse None)"""
+    best, best_hits = None, 0
+    for fmt in DATE_INPUT_FORMATS:
+        hits = sum(1 for text in samples if _try_format(text, fmt) is not None)
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+
+def excel_serials_to_text(serials: np.ndarray) -> List[Optional[str]]:
+    """Excel seri sayıları → "YYYY-MM-DD" (geçersiz aralık → None)"""
+    serials = np.asarray(serials, dtype=np.float64)
+    valid = (serials >= 1) & (serials <= EXCEL_SERIAL_MAX)  # NaN da geçersiz
+    days = np.floor(serials[valid]).astype(np.int64)
+    days = np.where(days < 60, days + 1, days)  # 1900-02-29 hatasından önceki seriler
+    texts = np.datetime_as_string(EXCEL_EPOCH + days.astype("timedelta64[D]"), unit="D").tolist()
+
+    result: List[Optional[str]] = [None] * len(serials)
+    for position, text in zip(np.flatnonzero(valid).tolist(), texts):
+        result[position] = text
+    return result
+
+
+class DateNormalizer:
+    """
+    Bir dosyanın TARİH sütunu için durum: tespit edilen biçim ve sayaçlar.
+    normalize() her chunk'ın TARİH değerlerini alır, aynı uzunlukta liste döndürür.
+    """
+
+    def __init__(self):
+        self.detected_format: Optional[str] = None
+        self._format_checked = False
+        self.parsed = 0
+        self.unparsed = 0
+
+    def _convert(self, value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.strftime(DATE_OUTPUT_FORMAT)
+        if isinstance(value, date):
+            return value.strftime(DATE_OUTPUT_FORMAT)
+        if isinstance(value, str):
+            text = value.strip()
+            if not text:
+                return _KEEP
+            parsed = parse_date_text(text, self.detected_format)
+            return parsed.strftime(DATE_OUTPUT_FORMAT) if parsed is not None else _UNPARSED
+        return _UNPARSED
+
+    def _detect(self, values: List[Any]) -> None:
+        samples = [v.strip() for v in values if isinstance(v, str) and v.strip()][:DATE_SAMPLE_SIZE]
+        if samples:
+            self.detected_format = detect_date_format(samples)
+            self._format_checked = True
+
+    def normalize(self, values: Sequence[Any]) -> List[Any]:
+        """TARİH değerleri → "YYYY-MM-DD"; None/boş olduğu gibi, çevrilemeyen olduğu gibi (sayılır)"""
+        result = list(values)
+        serial_positions: List[int] = []
+        pending: Dict[Any, List[int]] = {}
+
+        for position, value in enumerate(result):
+            if value is None:
+                continue
+            kind = type(value)
+            if kind is int or kind is float:
+                serial_positions.append(position)
+            else:
+                pending.setdefault(value, []).append(position)
+
+        if pending:
+            if not self._format_checked:
+                self._detect(list(pending))
+            for value, positions in pending.items():
+                converted = self._convert(value)
+                if converted is _KEEP:
+                    continue
+                if converted is _UNPARSED:
+                    self.unparsed += len(positions)
+                    continue
+                self.parsed += len(positions)
+                for position in positions:
+                    result[position] = converted
+
+        if serial_positions:
+            texts = excel_serials_to_text(np.array([result[p] for p in serial_positions], dtype=np.float64))
+            for position, text in zip(serial_positions, texts):
+                if text is None:
+                    self.unparsed += 1
+                else:
+                    result[position] = text
+                    self.parsed += 1
+
+        return result
@@ -13,17 +13,27 @@ Hiçbir kritik hata veya memory leak yok
 """
 
 import asyncio
+import itertools
+from operator import itemgetter
+import xlsxwriter
 from openpyxl import load_workbook, Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
 from typing import Dict, List, Tuple, Any, Optional
 from utils.logger import logger
+from utils.xlsx_reader import SheetBounds, open_workbook, real_bounds
+from utils.workbook_session import (
+    SHEETS_AUTO, MultiSheetSource, Source, input_sheets, open_source,
+)
+from utils.xlsx_writer import StreamingXlsxWriter
+from utils.date_normalizer import DateNormalizer, parse_date_text
+from config import config
 import tempfile
 import os
 import aiofiles
 from pathlib import Path
 
-from datetime import date, datetime, timedelta # Excel tarih
+from datetime import datetime, timedelta # Excel tarih
 from concurrent.futures import ThreadPoolExecutor # Excel tarih düzeltici yardımcı
 
 # Sabitler
@@ -33,6 +43,11 @@ MAX_COLUMN_WIDTH = 25
 HEADER_ROW_BUFFER = 2
 MAX_FILE_SIZE_MB = 50  # Maksimum dosya boyutu
 CHUNK_SIZE = 1000  # Büyük dosyalar için chunk boyutu
+CLEANED_SHEET_NAME = "Düzenlenmiş Veri"
+
+# Temizleyici motorları
+ENGINE_STREAMING = "streaming"  # read_only okuma + xlsxwriter constant_memory yazma
+ENGINE_OPENPYXL = "openpyxl"    # eski motor: tam yükleme + hücre hücre kopyalama
 
 
 # Excel tarih düzeltici yardımcı
@@ -63,34 +78,34 @@ def fix_excel_date(value):
         except Exception:
             return value
     
-    # 5. String ise
+    # 5. String ise (biçimler utils/date_normalizer, sonuç önbellekte)
     if isinstance(value, str):
         value = value.strip()
-        try:
-            # Önce datetime olarak parse et
-            dt = None
-            for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y"):
-                try:
-                    dt = datetime.strptime(value, fmt)
-                    break
-                except ValueError:
-                    continue
-            
-            if dt:
-                return dt.date()
-        except Exception:
-            pass
+        parsed = parse_date_text(value) if value else None
+        if parsed:
+            return parsed
     
     # 6. Diğer durumlarda olduğu gibi döndür
     return value
-    
+
+
+def _row_picker(positions: List[int]):
+    """Satırdan verilen pozisyonları tuple olarak alan fonksiyon (itemgetter)"""
+    if len(positions) > 1:
+        return itemgetter(*positions)
+    if positions:
+        position = positions[0]
+        return lambda row: (row[position],)
+    return lambda row: ()
+
 
 class AsyncExcelCleaner:
     """Excel dosya temizleme işlemlerini asenkron olarak yöneten sınıf"""
     
-    def __init__(self):
+    def __init__(self, engine: Optional[str] = None):
         self.required_columns = {"TARİH", "İL"}
         self.thread_pool = ThreadPoolExecutor(max_workers=4)
+        self.engine = (engine or config.bot.CLEANER_ENGINE or ENGINE_STREAMING).lower()
     
     async def _check_file_size(self, file_path: str) -> bool:
         """Dosya boyutunu kontrol eder"""
@@ -104,40 +119,47 @@ class AsyncExcelCleaner:
             logger.error(f"Dosya boyutu kontrol hatası: {e}")
             return False
     
-    async def _find_header_row(self, ws: Worksheet) -> int:
+    async def _find_header_row(self, ws: Worksheet, bounds: SheetBounds) -> int:
         """Başlık satırını bulur (asenkron wrapper)"""
         #loop = asyncio.get_event_loop()
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(
             self.thread_pool, 
             self._sync_find_header_row, 
-            ws
+            ws, bounds
         )
     
     
     
-    def _sync_find_header_row(self, ws: Worksheet) -> int:
-        """Başlık satırını senkron olarak bulur"""
+    def _sync_find_header_row(self, ws: Worksheet, bounds: SheetBounds) -> int:
+        """Başlık satırını senkron olarak bulur (gerçek sütun sınırına kadar)"""
         for row in range(1, MAX_HEADER_SEARCH_ROWS + 1):
             if any(ws.cell(row=row, column=col).value 
-                   for col in range(1, ws.max_column + 1)):
+                   for col in range(1, bounds.max_column + 1)):
                 return row
         return 1
     
-    async def _clean_headers(self, ws: Worksheet, header_row: int) -> List[str]:
+    async def _clean_headers(self, ws: Worksheet, header_row: int, bounds: SheetBounds) -> List[str]:
         """Başlıkları temizler ve düzenler (asenkron wrapper)"""
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             self.thread_pool,
             self._sync_clean_headers,
-            ws, header_row
+            ws, header_row, bounds
         )
     
-    def _sync_clean_headers(self, ws: Worksheet, header_row: int) -> List[str]:
-        """Başlıkları senkron olarak temizler"""
+    def _sync_clean_headers(self, ws: Worksheet, header_row: int, bounds: SheetBounds) -> List[str]:
+        """Başlıkları senkron olarak temizler (hayalet sütunlar Bos_N olarak eklenmez)"""
+        return self._clean_header_values(
+            ws.cell(row=header_row, column=col).value
+            for col in range(1, bounds.max_column + 1)
+        )
+
+    @staticmethod
+    def _clean_header_values(values) -> List[str]:
+        """Ham başlık değerlerini temizler (boş başlık → Bos_N)"""
         headers = []
-        for col in range(1, ws.max_column + 1):
-            cell_value = ws.cell(row=header_row, column=col).value
+        for col, cell_value in enumerate(values, 1):
             clean_value = (str(cell_value).strip().upper() 
                           if cell_value else f"Bos_{col}")
             headers.append(clean_value)
@@ -173,13 +195,15 @@ class AsyncExcelCleaner:
         return new_headers
     
     async def _copy_data_chunked(self, source_ws: Worksheet, target_ws: Worksheet, 
-                               header_row: int, column_indices: Dict[str, int]) -> int:
+                               header_row: int, column_indices: Dict[str, int],
+                               bounds: SheetBounds,
+                               date_normalizer: Optional[DateNormalizer] = None) -> int:
         """Verileri chunk'lar halinde asenkron olarak kopyalar"""
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             self.thread_pool,
             self._sync_copy_data_chunked,
-            source_ws, target_ws, header_row, column_indices
+            source_ws, target_ws, header_row, column_indices, bounds, date_normalizer
         )
     
     # Verileri chunk'lar halinde senkron olarak kopyalar 
@@ -192,65 +216,296 @@ class AsyncExcelCleaner:
         source_ws: Worksheet,
         target_ws: Worksheet,
         header_row: int,
-        column_indices: Dict[str, int]
+        column_indices: Dict[str, int],
+        bounds: SheetBounds,
+        date_normalizer: Optional[DateNormalizer] = None
     ) -> int:
-        """Verileri chunk'lar halinde senkron olarak kopyalar"""
+        """
+        Verileri chunk'lar halinde senkron olarak kopyalar (TARİH her chunk'ta toplu normalize edilir).
+        Döngüler max_row / max_column yerine gerçek veri sınırlarında (bounds) biter.
+        """
         date_idx = column_indices["TARİH"]
         city_idx = column_indices["İL"]
+        normalizer = date_normalizer or DateNormalizer()
 
         other_columns = [
-            col for col in range(1, source_ws.max_column + 1)
+            col for col in range(1, bounds.max_column + 1)
             if col not in (date_idx, city_idx)
         ]
 
         new_row_idx = 2
         real_row_count = 0
+        pending: List[Tuple[int, Any, Any]] = []  # (kaynak satır, İL, ham TARİH)
+
+        def write_pending() -> None:
+            nonlocal new_row_idx, real_row_count
+            dates = normalizer.normalize([date_val for _, _, date_val in pending])
+            for (row, city_val, date_val), fixed_date in zip(pending, dates):
+                # Tarih hücresini oluştur (çevrilen tarih "YYYY-MM-DD" metni)
+                target_date_cell = target_ws.cell(row=new_row_idx, column=1, value=fixed_date)
+                if fixed_date is not date_val:
+                    target_date_cell.number_format = "YYYY-MM-DD"
+
+                # Şehir bilgisini yaz
+                target_ws.cell(row=new_row_idx, column=2, value=city_val)
 
-        for row in range(header_row + 1, source_ws.max_row + 1):
+                # Diğer sütunları kopyala
+                for new_col_idx, source_col in enumerate(other_columns, start=3):
+                    target_ws.cell(
+                        row=new_row_idx,
+                        column=new_col_idx,
+                        value=source_ws.cell(row=row, column=source_col).value
+                    )
+
+                new_row_idx += 1
+                real_row_count += 1
+            pending.clear()
+
+        for row in range(header_row + 1, bounds.max_row + 1):
             city_val = source_ws.cell(row=row, column=city_idx).value
-            source_date_cell = source_ws.cell(row=row, column=date_idx)
-            date_val = source_date_cell.value
+            date_val = source_ws.cell(row=row, column=date_idx).value
             
             # 🔴 SADECE BU KONTROL
             if city_val is None and date_val is None:
                 continue
 
             # ✔ GERÇEK VERİ SATIRI
-            # Tarih hücresini oluştur
-            target_date_cell = target_ws.cell(row=new_row_idx, column=1)
-            
-            # datetime nesnesini string olarak formatla
-            if isinstance(date_val, datetime):
-                # Sadece tarih kısmını al (YYYY-MM-DD formatında)
-                date_str = date_val.strftime("%Y-%m-%d")
-                target_date_cell.value = date_str
-                target_date_cell.number_format = "YYYY-MM-DD"
-            elif isinstance(date_val, date):  # datetime.date nesnesi
-                date_str = date_val.strftime("%Y-%m-%d")
-                target_date_cell.value = date_str
-                target_date_cell.number_format = "YYYY-MM-DD"
-            else:
-                # Diğer durumlarda olduğu gibi kopyala
-                target_date_cell.value = date_val
-            
-            # Şehir bilgisini yaz
-            target_ws.cell(row=new_row_idx, column=2, value=city_val)
-
-            # Diğer sütunları kopyala
-            for new_col_idx, source_col in enumerate(other_columns, start=3):
-                target_ws.cell(
-                    row=new_row_idx,
-                    column=new_col_idx,
-                    value=source_ws.cell(row=row, column=source_col).value
-                )
-
-            new_row_idx += 1
-            real_row_count += 1
+            pending.append((row, city_val, date_val))
+            if len(pending) >= CHUNK_SIZE:
+                write_pending()
 
+        write_pending()
         return real_row_count
     
 
     
+    # ------ Streaming motor -------------------------------
+    # read_only + iter_rows(values_only=True) → xlsxwriter constant_memory
+    # Bellek kullanımı satır sayısından bağımsızdır (hücre nesnesi oluşmaz)
+
+    def build_chunk_cleaner(self, column_count: int, column_indices: Dict[str, int],
+                            date_normalizer: DateNormalizer, other_positions: Optional[List[int]] = None):
+        """
+        Ham satır listesini temizlenmiş satır listesine çeviren fonksiyon döndürür.
+        Sıra: TARİH, İL, diğer sütunlar. Hayalet satırlar atılır, TARİH sütunu chunk başına bir kez normalize edilir.
+        other_positions: diğer sütunların kaynak pozisyonları (çok sayfalı birleşim); column_count → None
+        """
+        date_pos = column_indices["TARİH"] - 1
+        city_pos = column_indices["İL"] - 1
+        if other_positions is None:
+            other_positions = [pos for pos in range(column_count) if pos not in (date_pos, city_pos)]
+        pick_others = _row_picker(other_positions)
+        width = max(column_count, max(other_positions, default=-1) + 1)
+        padding = (None,) * width
+
+        def clean_chunk(rows: List[tuple]) -> List[tuple]:
+            rows = [
+                row if len(row) >= width else tuple(row) + padding[len(row):]
+                for row in rows
+            ]
+            rows = [row for row in rows if row[city_pos] is not None or row[date_pos] is not None]
+            dates = date_normalizer.normalize([row[date_pos] for row in rows])
+            return [(fixed_date, row[city_pos]) + pick_others(row) for fixed_date, row in zip(dates, rows)]
+
+        return clean_chunk
+
+    @staticmethod
+    def _iter_clean_rows(parts, date_normalizer: DateNormalizer):
+        """Ham satırları CHUNK_SIZE parçalar halinde temizleyip tek tek üretir (parts: [(satırlar, clean_chunk)])"""
+        for data_rows, clean_chunk in parts:
+            while True:
+                chunk = list(itertools.islice(data_rows, CHUNK_SIZE))
+                if not chunk:
+                    break
+                yield from clean_chunk(chunk)
+
+        if date_normalizer.unparsed:
+            logger.warning(
+                f"⚠️ TARİH: {date_normalizer.unparsed} hücre tarihe çevrilemedi, olduğu gibi bırakıldı "
+                f"(tespit edilen biçim: {date_normalizer.detected_format or 'yok'})"
+            )
+
+    def _sync_scan_header(self, rows) -> Tuple[List[str], Any]:
+        """
+        Satır iteratöründen başlık satırını bulur.
+        (temiz başlıklar, veri satırları iteratörü) döndürür.
+        """
+        buffered = []
+        for row in rows:
+            buffered.append(row)
+            if any(row):
+                return self._clean_header_values(row), rows
+            if len(buffered) >= MAX_HEADER_SEARCH_ROWS:
+                break
+
+        # İlk satırlarda veri yok → eski davranış: başlık 1. satır
+        if not buffered:
+            return [], iter(())
+        return self._clean_header_values(buffered[0]), itertools.chain(buffered[1:], rows)
+
+    def open_clean_source(self, input_path: Source, date_normalizer: Optional[DateNormalizer] = None):
+        """
+        Kaynak dosyayı read_only açar (WorkbookSession verilirse bellekteki satırlar), başlığı çözer.
+        MultiSheetSource verilirse seçilen sayfalar sırayla tek satır akışında birleştirilir.
+        (workbook, temiz başlıklar, yeni başlıklar, temiz satır iteratörü) döndürür.
+        Workbook'u kapatmak çağırana aittir. date_normalizer verilirse sayaçları (unparsed) çağırana kalır.
+        """
+        wb = open_source(input_path)
+        try:
+            sheets = input_sheets(wb)
+            date_normalizer = date_normalizer or DateNormalizer()
+            if len(sheets) > 1:
+                headers, new_headers, parts = self._open_sheet_union(sheets, date_normalizer)
+                return wb, headers, new_headers, self._iter_clean_rows(parts, date_normalizer)
+
+            ws = sheets[0]
+            real_bounds(ws)  # iter_rows genişliği/uzunluğu gerçek veriye daraltılır
+            headers, data_rows = self._sync_scan_header(ws.iter_rows(values_only=True))
+            column_indices = self._find_required_columns(headers)
+            new_headers = self._organize_headers(headers, column_indices)
+            clean_chunk = self.build_chunk_cleaner(len(headers), column_indices, date_normalizer)
+
+            cleaned_rows = self._iter_clean_rows([(data_rows, clean_chunk)], date_normalizer)
+            return wb, headers, new_headers, cleaned_rows
+        except Exception:
+            wb.close()
+            raise
+
+    def _open_sheet_union(self, sheets: list, date_normalizer: DateNormalizer):
+        """
+        Çok sayfalı kaynak: her sayfanın başlığı ayrı çözülür, diğer sütunlar ada göre tek düzende
+        birleştirilir (ilk görülme sırası; sayfada olmayan sütun None). Aynı DateNormalizer paylaşılır.
+        (ilk sayfanın başlıkları, birleşik başlıklar, [(satırlar, clean_chunk)]) döndürür.
+        """
+        scanned = []
+        layout: List[Tuple[str, int]] = []  # (başlık, aynı adın kaçıncı tekrarı)
+        for ws in sheets:
+            real_bounds(ws)
+            headers, data_rows = self._sync_scan_header(ws.iter_rows(values_only=True))
+            try:
+                column_indices = self._find_required_columns(headers)
+            except ValueError as e:
+                raise ValueError(f"{ws.title}: {e}") from None
+
+            used = set(column_indices.values())
+            seen: Dict[str, int] = {}
+            positions: Dict[Tuple[str, int], int] = {}
+            for idx, header in enumerate(headers, 1):
+                if idx in used or header in ("TARİH", "İL"):
+                    continue
+                key = (header, seen.get(header, 0))
+                seen[header] = key[1] + 1
+                positions[key] = idx - 1
+                if key not in layout:
+                    layout.append(key)
+            scanned.append((ws.title, headers, column_indices, positions, data_rows))
+
+        parts = []
+        for title, headers, column_indices, positions, data_rows in scanned:
+            other_positions = [positions.get(key, len(headers)) for key in layout]
+            parts.append((data_rows, self.build_chunk_cleaner(
+                len(headers), column_indices, date_normalizer, other_positions)))
+
+        new_headers = ["TARİH", "İL"] + [header for header, _ in layout]
+        logger.info(f"📑 {len(sheets)} sayfa birleştiriliyor: {[title for title, *_ in scanned]}")
+        return scanned[0][1], new_headers, parts
+
+    def select_input_sheets(self, input_path: Source, option: str) -> List[str]:
+        """
+        INPUT_SHEETS → işlenecek sayfa adları (dosya sırası).
+        "auto": başlığında TARİH ve İL olan sayfalar; aksi halde virgülle ayrılmış adlar (hepsi bulunmalı).
+        """
+        wb = open_workbook(input_path)
+        try:
+            if option.strip().lower() == SHEETS_AUTO:
+                titles = []
+                for ws in wb.worksheets:
+                    headers, _ = self._sync_scan_header(
+                        ws.iter_rows(min_row=1, max_row=MAX_HEADER_SEARCH_ROWS, values_only=True))
+                    try:
+                        self._find_required_columns(headers)
+                    except ValueError:
+                        continue
+                    titles.append(ws.title)
+                if not titles:
+                    raise ValueError("Başlığında TARİH ve İL olan sayfa bulunamadı")
+            else:
+                titles = [name.strip() for name in option.split(",") if name.strip()]
+                missing = [name for name in titles if name not in wb.sheetnames]
+                if missing:
+                    raise ValueError(f"Sayfa bulunamadı: {', '.join(missing)}")
+            return titles
+        finally:
+            wb.close()
+
+    def _sync_stream_clean(self, input_path: Source, output_path: str) -> Dict[str, Any]:
+        """Streaming temizleme: satırlar okunurken doğrudan diske yazılır"""
+        date_normalizer = DateNormalizer()
+        wb, headers, new_headers, cleaned_rows = self.open_clean_source(input_path, date_normalizer)
+        try:
+            logger.info(f"Temizlenen başlıklar: {headers}")
+            logger.info(f"Yeni başlık düzeni: {new_headers}")
+
+            if (config.bot.XLSX_WRITER or "").lower() == "native":
+                row_count = self._sync_write_native(output_path, new_headers, cleaned_rows)
+            else:
+                out_wb = xlsxwriter.Workbook(output_path, {
+                    "constant_memory": True,
+                    "default_date_format": "yyyy-mm-dd",
+                })
+                try:
+                    out_ws = out_wb.add_worksheet(CLEANED_SHEET_NAME)
+                    out_ws.write_row(0, 0, new_headers)
+                    out_ws.set_column(0, len(new_headers) - 1, MAX_COLUMN_WIDTH)
+
+                    row_count = 0
+                    for cleaned in cleaned_rows:
+                        row_count += 1
+                        out_ws.write_row(row_count, 0, cleaned)
+                finally:
+                    out_wb.close()
+        finally:
+            wb.close()
+
+        return {
+            "headers": new_headers,
+            "original_headers": headers,
+            "row_count": row_count,
+            "unparsed_dates": date_normalizer.unparsed,
+        }
+
+    @staticmethod
+    def _sync_write_native(output_path: str, headers: List[str], cleaned_rows) -> int:
+        """Temizlenmiş satırları native xlsx writer ile yazar (1000'lik batch'ler)"""
+        writer = StreamingXlsxWriter(Path(output_path), headers, CLEANED_SHEET_NAME,
+                                     column_width=MAX_COLUMN_WIDTH, date_format="yyyy-mm-dd")
+        row_count = 0
+        try:
+            while True:
+                batch = list(itertools.islice(cleaned_rows, 1000))
+                if not batch:
+                    break
+                writer.write_rows(row_count + 1, batch)
+                row_count += len(batch)
+        finally:
+            writer.close()
+        return row_count
+
+    async def _stream_clean(self, input_path: Source, output_path: str) -> Dict[str, Any]:
+        """Streaming temizleme (asenkron wrapper)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.thread_pool,
+            self._sync_stream_clean,
+            input_path, output_path
+        )
+
+    @staticmethod
+    def _create_temp_path() -> str:
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
+        temp_file.close()
+        return temp_file.name
+
     async def _adjust_column_widths(self, ws: Worksheet):
         """Sütun genişliklerini asenkron olarak ayarlar"""
         loop = asyncio.get_event_loop()
@@ -290,12 +545,14 @@ class AsyncExcelCleaner:
             file_path
         )
     
-    async def clean_excel_headers(self, input_path: str) -> Dict[str, Any]:
+    async def clean_excel_headers(self, input_path: str, session: Optional[Source] = None) -> Dict[str, Any]:
         """
         Excel dosyasının başlıklarını asenkron olarak temizler ve düzenler
         
         Args:
             input_path: Giriş Excel dosyası yolu
+            session: Dosyanın açık yükleme oturumu (streaming motor satırları tekrar ayrıştırmaz)
+                     veya çok sayfalı kaynak (MultiSheetSource)
             
         Returns:
             İşlem sonucunu içeren sözlük
@@ -304,29 +561,50 @@ class AsyncExcelCleaner:
         temp_path = None
         
         try:
+            # Bellekte üretilmiş oturumun (SGK bellek akışı) diskte dosyası olmayabilir: kontroller atlanır
+            in_memory = session is not None and not os.path.exists(input_path)
+
             # Dosya varlığını kontrol et
-            if not os.path.exists(input_path):
+            if not in_memory and not os.path.exists(input_path):
                 raise FileNotFoundError(f"Dosya bulunamadı: {input_path}")
             
             # Dosya boyutunu kontrol et
-            if not await self._check_file_size(input_path):
+            if not in_memory and not await self._check_file_size(input_path):
                 return {
                     "success": False, 
                     "error": f"Dosya boyutu {MAX_FILE_SIZE_MB}MB'den büyük"
                 }
             
-            logger.info(f"Excel temizleme başlatıldı: {input_path}")
+            logger.info(f"Excel temizleme başlatıldı: {input_path} (motor: {self.engine})")
+
+            # Streaming motor: sabit bellek, ara workbook yok (çok sayfalı / dosyasız kaynak her zaman bu motorla)
+            if self.engine == ENGINE_STREAMING or isinstance(session, MultiSheetSource) or in_memory:
+                temp_path = self._create_temp_path()
+                stream_result = await self._stream_clean(session or input_path, temp_path)
+                logger.info(f"Toplam {stream_result['row_count']} satır kopyalandı")
+                logger.info(f"Geçici dosya oluşturuldu: {temp_path}")
+
+                return {
+                    "success": True,
+                    "temp_path": temp_path,
+                    "headers": stream_result["headers"],
+                    "row_count": stream_result["row_count"],
+                    "original_headers": stream_result["original_headers"],
+                    "unparsed_dates": stream_result["unparsed_dates"],
+                    "processed_at": datetime.now().isoformat()
+                }
             
             # Kaynak dosyayı asenkron yükle
             wb = await self._load_workbook(input_path)
             ws = wb.active
+            bounds = real_bounds(ws)  # biçimlendirmeden şişmiş max_row / max_column yerine
             
             # Başlık satırını asenkron bul
-            header_row = await self._find_header_row(ws)
+            header_row = await self._find_header_row(ws, bounds)
             logger.info(f"Başlık satırı bulundu: {header_row}")
             
             # Başlıkları asenkron temizle
-            headers = await self._clean_headers(ws, header_row)
+            headers = await self._clean_headers(ws, header_row, bounds)
             logger.info(f"Temizlenen başlıklar: {headers}")
             
             # Gerekli sütunları bul
@@ -340,23 +618,24 @@ class AsyncExcelCleaner:
             # Yeni workbook oluştur
             new_wb = Workbook()
             new_ws = new_wb.active
-            new_ws.title = "Düzenlenmiş Veri"
+            new_ws.title = CLEANED_SHEET_NAME
             
             # Yeni başlıkları yaz
             for col_idx, header in enumerate(new_headers, 1):
                 new_ws.cell(row=1, column=col_idx, value=header)
             
             # Verileri asenkron kopyala
-            row_count = await self._copy_data_chunked(ws, new_ws, header_row, column_indices)
+            date_normalizer = DateNormalizer()
+            row_count = await self._copy_data_chunked(ws, new_ws, header_row, column_indices, bounds, date_normalizer)
             logger.info(f"Toplam {row_count} satır kopyalandı")
+            if date_normalizer.unparsed:
+                logger.warning(f"⚠️ TARİH: {date_normalizer.unparsed} hücre tarihe çevrilemedi, olduğu gibi bırakıldı")
             
             # Sütun genişliklerini asenkron ayarla
             await self._adjust_column_widths(new_ws)
             
             # Geçici dosyaya asenkron kaydet
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
-            temp_path = temp_file.name
-            temp_file.close()
+            temp_path = self._create_temp_path()
             
             await self._save_workbook(new_wb, temp_path)
             logger.info(f"Geçici dosya oluşturuldu: {temp_path}")
@@ -367,6 +646,7 @@ class AsyncExcelCleaner:
                 "headers": new_headers,
                 "row_count": row_count,
                 "original_headers": headers,
+                "unparsed_dates": date_normalizer.unparsed,
                 "processed_at": datetime.now().isoformat()
             }
             
@@ -437,3 +717,8 @@ class AsyncExcelCleaner:
         """Nesne yok edilirken thread pool'u temizle"""
         if hasattr(self, 'thread_pool'):
             self.thread_pool.shutdown(wait=False)
+
+
+def select_input_sheets(input_path: Source, option: str) -> List[str]:
+    """AsyncExcelCleaner.select_input_sheets, modül seviyesinde (run_job ile sandbox süreçte çağrılabilir)"""
+    return AsyncExcelCleaner().select_input_sheets(input_path, option)
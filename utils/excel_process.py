@@ -24,20 +24,22 @@ SMTP bağlantısı her mailde 1 kere kullanılır aç-kapat
 """
 # utils/excel_process.py
 import asyncio
+import os
 import zipfile
 import tempfile
 
 
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from config import config
-from utils.excel_cleaner import AsyncExcelCleaner
-from utils.excel_splitter import split_excel_by_groups
+from utils.excel_cleaner import AsyncExcelCleaner, ENGINE_STREAMING, MAX_FILE_SIZE_MB
+from utils.excel_splitter import split_excel_by_groups, split_excel_fused
 from utils.reporter import generate_processing_report
 from utils.mailer import send_email
 from utils.group_manager import group_manager
+from utils.workbook_session import Source
 from utils.logger import logger
 
 
@@ -81,7 +83,14 @@ def calculate_mail_stats(mail_results: List[Dict]) -> Dict:
 # ANA AKIŞ
 # ============================================================
 
-async def process_excel_task(input_path: Path, user_id: int, main_excel_name: str = None) -> Dict[str, Any]:
+async def process_excel_task(input_path: Path, user_id: int, main_excel_name: str = None,
+                             session: Optional[Source] = None,
+                             streaming_only: bool = False,
+                             extra_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # session: yüklemenin açık oturumu (handler doğrulamada açtıysa) → dosya tekrar ayrıştırılmaz
+    #          MultiSheetSource ise seçilen sayfalar tek geçişte işlenir (grup başına tek dosya / mail)
+    # streaming_only: ön kontrol (upload_inspector) dosyayı büyük buldu → tam yükleme yapan motor kullanılmaz
+    # extra_stats: ön adımların rapor sayıları (ör. SGK invalid_tc) → processing_context'e eklenir
         
     mail_results: List[Dict] = []
     temp_files: List[str] = []
@@ -93,18 +102,29 @@ async def process_excel_task(input_path: Path, user_id: int, main_excel_name: st
     try:
         logger.info(f"📊 Excel işleme başlatıldı: {input_path.name}")
 
-        cleaning_result = await _clean_excel_headers_async(str(input_path))
-        if not cleaning_result["success"]:
-            return {"success": False, "error": cleaning_result.get("error")}
-
-        temp_files.append(cleaning_result["temp_path"])
-
-        splitting_result = await split_excel_by_groups(
-            cleaning_result["temp_path"],
-            cleaning_result["headers"]
-        )
-        if not splitting_result["success"]:
-            return {"success": False, "error": splitting_result.get("error")}
+        if config.bot.FUSED_PIPELINE:
+            # Temizleme + split tek geçiş (ara xlsx yok)
+            splitting_result = await _split_fused_async(str(input_path), session, streaming_only)
+            if not splitting_result["success"]:
+                return {"success": False, "error": splitting_result.get("error")}
+            total_rows = splitting_result["processed_rows"]
+            unparsed_dates = splitting_result.get("unparsed_dates", 0)
+        else:
+            cleaning_result = await _clean_excel_headers_async(str(input_path), session, streaming_only)
+            if not cleaning_result["success"]:
+                return {"success": False, "error": cleaning_result.get("error")}
+
+            temp_files.append(cleaning_result["temp_path"])
+
+            splitting_result = await split_excel_by_groups(
+                cleaning_result["temp_path"],
+                cleaning_result["headers"],
+                streaming=True if streaming_only else None
+            )
+            if not splitting_result["success"]:
+                return {"success": False, "error": splitting_result.get("error")}
+            total_rows = cleaning_result["row_count"]
+            unparsed_dates = cleaning_result.get("unparsed_dates", 0)
 
         output_files = splitting_result["output_files"]
 
@@ -121,10 +141,11 @@ async def process_excel_task(input_path: Path, user_id: int, main_excel_name: st
         processing_context = {
             "success": True,
             "output_files": output_files,
-            "total_rows": cleaning_result["row_count"],
+            "total_rows": total_rows,
             "processed_rows": splitting_result["processed_rows"],
             "matched_rows": splitting_result["matched_rows"],
             "unmatched_cities": splitting_result.get("unmatched_cities", []),
+            "unparsed_dates": unparsed_dates,  # TARİH'i tarihe çevrilemeyen hücre sayısı
             "mail_results": mail_results,
             "mail_stats": calculate_mail_stats(mail_results),
             "input_filename": input_path.name,
@@ -134,6 +155,7 @@ async def process_excel_task(input_path: Path, user_id: int, main_excel_name: st
             "all_cities": list(all_cities),
             "city_count": len(all_cities),
         }
+        processing_context.update(extra_stats or {})
 
         mail_results.extend(
             await _send_personal_email(input_path, output_files, processing_context)
@@ -158,15 +180,29 @@ async def process_excel_task(input_path: Path, user_id: int, main_excel_name: st
 # EXCEL
 # ============================================================
 
-async def _clean_excel_headers_async(input_path: str) -> Dict[str, Any]:
+async def _clean_excel_headers_async(input_path: str, session: Optional[Source] = None,
+                                     streaming_only: bool = False) -> Dict[str, Any]:
     try:
-        cleaner = AsyncExcelCleaner()
-        return await cleaner.clean_excel_headers(input_path)
+        cleaner = AsyncExcelCleaner(ENGINE_STREAMING if streaming_only else None)
+        return await cleaner.clean_excel_headers(input_path, session)
     except Exception as e:
         logger.error(f"❌ Excel temizleme hatası: {e}")
         return {"success": False, "error": str(e)}
 
 
+async def _split_fused_async(input_path: str, session: Optional[Source] = None,
+                             streaming_only: bool = False) -> Dict[str, Any]:
+    try:
+        cleaner = AsyncExcelCleaner(ENGINE_STREAMING if streaming_only else None)
+        in_memory = session is not None and not os.path.exists(input_path)  # dosyasız oturum (SGK bellek akışı)
+        if not in_memory and not await cleaner._check_file_size(input_path):
+            return {"success": False, "error": f"Dosya boyutu {MAX_FILE_SIZE_MB}MB'den büyük"}
+        return await split_excel_fused(session or input_path, cleaner, streaming=True if streaming_only else None)
+    except Exception as e:
+        logger.error(f"❌ Fused Excel işleme hatası: {e}")
+        return {"success": False, "error": str(e)}
+
+
 # ============================================================
 # MAIL – GROUP
 # ============================================================
@@ -198,7 +234,7 @@ async def _send_group_emails(output_files: Dict) -> List[Dict]:
                 "filename": file_info["path"].name,
                 "subject": subject,
                 "body": body,
-                "attachment": file_info["path"]
+                "attachments": file_info.get("parts") or [file_info["path"]]  # satır sınırı aşılırsa _part2 ...
             })
 
     for mail in mail_queue:
@@ -206,7 +242,7 @@ async def _send_group_emails(output_files: Dict) -> List[Dict]:
             to_emails=[mail["recipient"]],
             subject=mail["subject"],
             body=mail["body"],
-            attachments=[mail["attachment"]]
+            attachments=mail["attachments"]
         )
 
         results.append(
@@ -315,8 +351,9 @@ async def create_backup_zip(input_path: Path, output_files: Dict) -> Path:
             if input_path.exists():
                 z.write(input_path, input_path.name)
             for f in output_files.values():
-                if f["path"].exists():
-                    z.write(f["path"], f["filename"])
+                for part in f.get("parts") or [f["path"]]:
+                    if part.exists():
+                        z.write(part, part.name)
         return zip_path
 
     loop = asyncio.get_running_loop()
@@ -1,50 +1,216 @@
 # utils/excel_splitter.py - GÜNCELLENMİŞ
 import asyncio
+import os
+import shutil
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, Set
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple, Set, Iterator, AsyncIterator, Sequence
 import functools
+import itertools
 from concurrent.futures import ThreadPoolExecutor
 
-import xlsxwriter
-from openpyxl import load_workbook
+import numpy as np
 
 from utils.group_manager import group_manager
 from utils.file_namer import generate_output_filename
+from utils.file_utils import monitor_memory_usage
+from utils.parallel_writer import ProcessWriterPool
+from utils.city_router import VectorizedCityRouter
+from utils.columnar_store import ColumnarRowStore
+from utils.date_normalizer import DateNormalizer
+from utils.spill_store import SpillRunStore
+from utils.external_sort import ExternalGroupSorter, row_sort_key
+from utils.workbook_session import Source, open_source
+from utils.sheet_rollover import ROLLOVER_SHEET, rollover_part_path
+from utils.output_writers import (
+    FORMAT_XLSX, GroupWriter, create_group_writer, normalize_output_format, output_layout,
+)
 from utils.logger import logger
 from config import config
 
 # Worker pool for sync IO (openpyxl + xlsxwriter)
 _DEFAULT_POOL = ThreadPoolExecutor(max_workers=4)
 
+UNMATCHED_GROUP_ID = "grup_0"
+UNMATCHED_SHEET_NAME = "Eşleşmeyenler"
 
-def _sync_read_all_rows(path: str) -> List[tuple]:
+# Yazıcı backend'leri
+WRITER_BACKEND_THREAD = "thread"    # xlsxwriter _DEFAULT_POOL thread'lerinde
+WRITER_BACKEND_PROCESS = "process"  # xlsxwriter worker süreçlerinde (ProcessWriterPool)
+
+# Yönlendirme motorları
+ROUTING_ENGINE_ROW = "row"                # satır satır şehir cache lookup
+ROUTING_ENGINE_VECTORIZED = "vectorized"  # chunk bazında şehir kodu × grup maskesi (VectorizedCityRouter)
+
+# Aşamalar arası satır taşıma
+ROW_STORE_TUPLE = "tuple"        # tuple listesi
+ROW_STORE_COLUMNAR = "columnar"  # ColumnarRowStore (sözlük kodlu sütunlar, grup dilimi = RowView)
+
+
+def _sync_collect_rows(rows: Iterator[tuple], columnar: bool, chunk_size: int) -> Sequence[tuple]:
+    """Senkron: generator'ı tüketir; columnar ise parça parça depoya kodlar (tuple listesi birikmez)"""
+    if not columnar:
+        return list(rows)
+    store = ColumnarRowStore()
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return store
+        store.extend(chunk)
+
+
+def _sync_read_all_rows(path: Source, columnar: bool = False, chunk_size: int = 5000) -> Sequence[tuple]:
     """Senkron: workbook'u açıp tüm satırları (values_only) okur ve kapatır."""
-    wb = load_workbook(path, read_only=True)
+    wb = open_source(path)
     try:
         ws = wb.active
-        rows = list(ws.iter_rows(min_row=2, values_only=True))
+        rows = _sync_collect_rows(ws.iter_rows(min_row=2, values_only=True), columnar, chunk_size)
     finally:
         wb.close()
     return rows
 
 
-def _sync_create_writer(file_path: Path, headers: List[str], sheet_name: str = "Veriler") -> Tuple[xlsxwriter.Workbook, xlsxwriter.worksheet.Worksheet]:
-    wb = xlsxwriter.Workbook(file_path, {'constant_memory': True})
-    ws = wb.add_worksheet(sheet_name)
-    ws.write_row(0, 0, headers)
-    ws.set_column(0, len(headers) - 1, 15)
-    return wb, ws
+def _sync_read_clean_rows(cleaner, path: Source, columnar: bool = False, chunk_size: int = 5000,
+                          date_normalizer: Optional[DateNormalizer] = None) -> Tuple[List[str], Sequence[tuple]]:
+    """
+    Senkron (fused): ham dosyayı okurken cleaner'ın sütun sıralama ve tarih
+    düzeltmesini chunk bazında uygular. Ara workbook oluşmaz.
+    """
+    wb, _, new_headers, cleaned_rows = cleaner.open_clean_source(path, date_normalizer)
+    try:
+        rows = _sync_collect_rows(cleaned_rows, columnar, chunk_size)
+    finally:
+        wb.close()
+    return new_headers, rows
+
+
+def _sync_open_row_source(path: Source, cleaner=None,
+                          date_normalizer: Optional[DateNormalizer] = None) -> Tuple[Any, Optional[List[str]], Iterator[tuple]]:
+    """
+    Senkron: kaynağı read_only açar, satır generator'ı döndürür (liste oluşmaz).
+    cleaner verilirse (fused) satırlar okunurken temizlenir ve başlıklar kaynaktan çözülür.
+    Workbook'u kapatmak çağırana aittir.
+    """
+    if cleaner is not None:
+        wb, _, headers, rows = cleaner.open_clean_source(path, date_normalizer)
+        return wb, headers, rows
+
+    wb = open_source(path)
+    ws = wb.active
+    return wb, None, ws.iter_rows(min_row=2, values_only=True)
+
+
+def _sync_next_chunk(rows: Iterator[tuple], size: int, columnar: bool = False) -> Sequence[tuple]:
+    """Senkron: generator'dan en fazla size satır alır (columnar: ColumnarRowStore)"""
+    chunk = list(itertools.islice(rows, size))
+    if columnar and chunk:
+        return ColumnarRowStore.from_rows(chunk)
+    return chunk
+
+
+def _chunk_rows(chunk: Sequence[tuple], row_ids: np.ndarray) -> Sequence[tuple]:
+    """Chunk'ın grup dilimi: depoda kopyasız RowView, listede tuple listesi"""
+    if isinstance(chunk, ColumnarRowStore):
+        return chunk.view(row_ids)
+    return [chunk[i] for i in row_ids]
+
+
+def _sync_materialize(pieces: List[Sequence[tuple]]) -> List[tuple]:
+    """Tampondaki parçaları (tuple listesi / RowView) tek satır listesine çevirir"""
+    if len(pieces) == 1 and isinstance(pieces[0], list):
+        return pieces[0]
+    return list(itertools.chain.from_iterable(pieces))
+
 
+def _writer_options(output_format: str = FORMAT_XLSX) -> Dict[str, Any]:
+    """create_group_writer parametreleri (thread ve writer süreçleri için aynı)"""
+    return {
+        "output_format": output_format,
+        "rollover": (config.bot.SHEET_ROLLOVER or ROLLOVER_SHEET).lower(),
+        "max_rows": config.bot.SHEET_MAX_ROWS,
+        "csv_delimiter": config.bot.CSV_DELIMITER,
+        "xlsx_engine": (config.bot.XLSX_WRITER or "xlsxwriter").lower(),
+    }
 
-def _sync_close_writer(wb: xlsxwriter.Workbook):
+
+def _sync_create_writer(file_path: Path, headers: List[str], sheet_name: str = "Veriler",
+                        output_format: str = FORMAT_XLSX) -> GroupWriter:
+    """
+    Grup dosyası writer'ı (xlsx / csv / csv.gz).
+    xlsx satır sınırı dolunca Veriler_2 sayfasına / _part2 dosyasına devreder.
+    """
+    return create_group_writer(file_path, headers, sheet_name, **_writer_options(output_format))
+
+
+def _sync_close_writer(wb: GroupWriter):
     try:
         wb.close()
     except Exception:
         raise
 
 
-def _sync_write_row(ws: xlsxwriter.worksheet.Worksheet, row_index: int, row: tuple):
-    ws.write_row(row_index, 0, row)
+def _sync_write_rows(ws: GroupWriter, start_index: int, rows: List[tuple]):
+    """Bir batch satırı tek seferde yazar (tek executor çağrısı)"""
+    ws.write_rows(start_index, rows)
+
+
+def _sync_write_pieces(ws: GroupWriter, start_index: int, pieces: List[Sequence[tuple]]):
+    """Tampon parçalarını thread'de tuple'a çevirip yazar"""
+    ws.write_rows(start_index, _sync_materialize(pieces))
+
+
+def _sync_spill_pieces(store: SpillRunStore, group_id: str, pieces: List[Sequence[tuple]]):
+    store.append(group_id, _sync_materialize(pieces))
+
+
+def _sync_assemble_spilled(store: SpillRunStore, group_id: str, file_path: Path,
+                           headers: List[str], sheet_name: str, output_format: str = FORMAT_XLSX) -> None:
+    """Run dosyasındaki batch'lerden grubun workbook'unu kurar"""
+    writer = _sync_create_writer(file_path, headers, sheet_name, output_format)
+    row_index = 1
+    try:
+        for rows in store.iter_batches(group_id):
+            _sync_write_rows(writer, row_index, rows)
+            row_index += len(rows)
+    finally:
+        writer.close()
+        store.discard(group_id)
+
+
+def _sync_sort_pieces(sorter: ExternalGroupSorter, group_id: str, pieces: List[Sequence[tuple]]):
+    sorter.add(group_id, _sync_materialize(pieces))
+
+
+def _sync_assemble_sorted(sorter: ExternalGroupSorter, group_id: str, file_path: Path, headers: List[str],
+                          sheet_name: str, output_format: str = FORMAT_XLSX, batch_rows: int = 1000) -> None:
+    """Sıralı run'ların birleşiminden grubun workbook'unu kurar"""
+    writer = _sync_create_writer(file_path, headers, sheet_name, output_format)
+    row_index = 1
+    try:
+        for rows in sorter.iter_sorted(group_id, batch_rows):
+            _sync_write_rows(writer, row_index, rows)
+            row_index += len(rows)
+    finally:
+        writer.close()
+        sorter.discard(group_id)
+
+
+def _sync_link_or_copy(source: Path, target: Path) -> None:
+    """Aynı içerikli grup dosyası: hardlink, desteklenmiyorsa kopya"""
+    if target.exists():
+        target.unlink()
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _sync_link_parts(sources: List[Path], target: Path) -> List[Path]:
+    """Alias grup: kaynağın tüm part dosyaları aynı sırayla bağlanır"""
+    targets = [rollover_part_path(target, index) for index in range(len(sources))]
+    for source, part in zip(sources, targets):
+        _sync_link_or_copy(source, part)
+    return targets
 
 
 class ExcelSplitter:
@@ -52,71 +218,420 @@ class ExcelSplitter:
     Async-friendly ExcelSplitter:
     - Senkron heavy IO'yu threadpool'a atar (openpyxl, xlsxwriter)
     - group_manager çağrılarını şehir bazlı cache'ler
+    - cleaner verilirse (fused mod) ham dosyayı okurken temizler; headers kaynaktan çözülür
+    - input_path bir WorkbookSession olabilir: satırlar (alias yeniden okuması dahil) bellekten gelir
+    - satırlar grup bazında tamponlanır, batch_size dolunca tek executor çağrısıyla yazılır
+    - streaming modda satırlar CHUNK_SIZE'lık parçalarla okunur; grup_0 dahil her satır
+      geldiği anda yazılır, bellekte satır listesi tutulmaz (sadece sayaçlar)
+    - writer_backend="process" ile workbook'lar worker süreçlerde yazılır, ana süreç sadece yönlendirir
+    - routing_engine="vectorized" ile her chunk tek geçişte gruplara ayrılır, grup dilimi tek blok yazılır
+    - dedupe açıkken (vectorized) aynı satırları alan gruplar tek workbook'a yazılır,
+      diğerleri alias olarak hardlink ile üretilir; alias ayrışırsa kendi dosyasına geçer
+    - sayfa 1.048.576 satırı aşınca Veriler_2, Veriler_3 ... (veya _part2 dosyaları) açılır
+    - açık dosya sayısı MAX_OPEN_WRITERS ile sınırlı: workbook sınırı dolunca yeni gruplar
+      satırlarını run dosyalarına yazar (tanıtıcılar LRU), workbook'ları sonda kurulur.
+      Sınır workbook başına sayar: SHEET_ROLLOVER=sheet ile biten Veriler_N sayfaları workbook
+      kapanana kadar kendi geçici dosyasını açık tutar (file modunda dolan part hemen kapanır)
+    - her grubun dosya formatı groups.json'daki output_format'tan gelir (xlsx / csv / csv.gz)
+    - row_store="columnar" ile chunk'lar ColumnarRowStore'a kodlanır; grup dilimleri RowView olarak
+      tamponlanır, tuple'lar yazım anında thread'de kurulur; İL kodları doğrudan router'a gider
+    - sort_outputs açıkken grup satırları TARİH, İL sırasıyla yazılır: satırlar ExternalGroupSorter'a
+      gider (CHUNK_SIZE satır bütçe, sıralı run'lar diske), workbook'lar sonda k-yollu birleştirmeyle kurulur
     """
 
-    def __init__(self, input_path: str, headers: List[str], executor: ThreadPoolExecutor = None):
+    def __init__(self, input_path: Source, headers: Optional[List[str]], executor: ThreadPoolExecutor = None,
+                 cleaner=None, batch_size: Optional[int] = None, streaming: Optional[bool] = None,
+                 writer_backend: Optional[str] = None, routing_engine: Optional[str] = None,
+                 row_store: Optional[str] = None, sort_outputs: Optional[bool] = None):
         self.input_path = input_path
         self.headers = headers
-        self.writers: Dict[str, xlsxwriter.Workbook] = {}
-        self.sheets: Dict[str, Any] = {}
+        self.cleaner = cleaner
+        self.batch_size = max(1, batch_size or config.bot.BATCH_PROCESSING_SIZE)
+        self.streaming = config.bot.STREAMING_SPLITTER if streaming is None else streaming
+        self.chunk_size = max(1, config.bot.CHUNK_SIZE)
+        self.writer_backend = (writer_backend or config.bot.WRITER_BACKEND or WRITER_BACKEND_THREAD).lower()
+        self._process_pool: Optional[ProcessWriterPool] = None
+        self.routing_engine = (routing_engine or config.bot.ROUTING_ENGINE or ROUTING_ENGINE_ROW).lower()
+        self._router: Optional[VectorizedCityRouter] = None
+        self.columnar = (row_store or config.bot.ROW_STORE or ROW_STORE_TUPLE).lower() == ROW_STORE_COLUMNAR
+        self.dedupe = config.bot.DEDUPE_GROUP_OUTPUTS
+        self.aliases: Dict[str, str] = {}  # alias group → aynı satırları alan (yazılan) grup
+        # Açık dosya bütçesi: bir kısmı run dosyası tanıtıcılarına (LRU) ayrılır, kalanı workbook
+        max_open = max(2, config.bot.MAX_OPEN_WRITERS)
+        self._spill_handles = max(1, max_open // 4)
+        self._live_writer_limit = max_open - self._spill_handles
+        self._live_groups: Set[str] = set()
+        self._spill: Optional[SpillRunStore] = None
+        self.sort_outputs = config.bot.SORT_GROUP_OUTPUTS if sort_outputs is None else sort_outputs
+        self._sorter: Optional[ExternalGroupSorter] = None
+        self.sheet_names: Dict[str, str] = {}
+        self.output_paths: Dict[str, Path] = {}
+        self.writers: Dict[str, GroupWriter] = {}
+        self.rollover = (config.bot.SHEET_ROLLOVER or ROLLOVER_SHEET).lower()
+        self.output_formats: Dict[str, str] = {}
         self.row_counts: Dict[str, int] = {}
-        self.matched_row_ids: Set[int] = set()
-        self.unmatched_data: List[tuple] = []
+        self.buffers: Dict[str, List[Sequence[tuple]]] = {}  # parçalar: tuple listesi / RowView
+        self.buffered: Dict[str, int] = {}
+        self.processed_rows = 0
+        self.matched_rows = 0
+        self.unmatched_rows = 0
         self.unmatched_cities: Set[str] = set()
         self._city_cache: Dict[Any, List[str]] = {}
+        # fused modda TARİH normalizasyon sayaçları (çevrilemeyen hücreler)
+        self.date_normalizer: Optional[DateNormalizer] = DateNormalizer() if cleaner is not None else None
         self._executor = executor or _DEFAULT_POOL
         
-        # YENİ: Gruplara göre şehir bilgisi
-        self.group_cities: Dict[str, Set[str]] = {}
+        # YENİ: Gruplara göre şehir bilgisi (şehir → satır sayısı)
+        self.group_cities: Dict[str, Counter] = {}
 
     # ---------- helpers ----------
     async def _read_rows(self) -> List[tuple]:
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(self._executor, functools.partial(_sync_read_all_rows, self.input_path))
+        if self.cleaner is not None:
+            headers, rows = await loop.run_in_executor(
+                self._executor, functools.partial(_sync_read_clean_rows, self.cleaner, self.input_path,
+                                                  self.columnar, self.chunk_size, self.date_normalizer))
+            self.headers = headers
+            logger.info(f"excelsplit Fused mod başlıkları: {headers}")
+            return rows
+        return await loop.run_in_executor(
+            self._executor, functools.partial(_sync_read_all_rows, self.input_path, self.columnar, self.chunk_size))
+
+    async def _iter_row_chunks(self) -> AsyncIterator[List[tuple]]:
+        """Satırları parça parça üretir (streaming) veya tek parça olarak (eski mod)"""
+        if not self.streaming:
+            yield await self._read_rows()
+            return
+
+        async for chunk in self._iter_source_chunks():
+            yield chunk
+
+    async def _iter_source_chunks(self, limit: Optional[int] = None) -> AsyncIterator[List[tuple]]:
+        """Kaynağı read_only açıp CHUNK_SIZE parçalar üretir (limit: en fazla bu kadar satır)"""
+        loop = asyncio.get_running_loop()
+        # Yeniden okuma (limit) sayaçları tekrar artırmasın
+        date_normalizer = self.date_normalizer if limit is None else None
+        wb, headers, rows = await loop.run_in_executor(
+            self._executor, functools.partial(_sync_open_row_source, self.input_path, self.cleaner, date_normalizer))
+        try:
+            if headers is not None:
+                self.headers = headers
+                logger.info(f"excelsplit Fused mod başlıkları: {headers}")
+
+            remaining = limit
+            while remaining is None or remaining > 0:
+                size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                chunk = await loop.run_in_executor(
+                    self._executor, functools.partial(_sync_next_chunk, rows, size, self.columnar))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await loop.run_in_executor(self._executor, wb.close)
+
+    async def _groups_for_city(self, city: Any) -> List[str]:
+        """Şehir → grup listesi (şehir bazlı cache)"""
+        groups = self._city_cache.get(city)
+        if groups is None:
+            try:
+                groups = await group_manager.get_groups_for_city(city) or []
+            except Exception as e:
+                logger.warning(f"excelsplit City lookup failed for {city}: {e}")
+                groups = []
+            self._city_cache[city] = groups
+        return groups
+
+    async def _route_row(self, row: tuple) -> None:
+        """Satırı eşleşen grup(lar)a, eşleşmezse grup_0'a yazar"""
+        self.processed_rows += 1
+        city = row[1] if row and len(row) > 1 else None
+        groups = await self._groups_for_city(city) if city else []
+
+        has_match = False
+        for g in groups:
+            if g != UNMATCHED_GROUP_ID:
+                has_match = True
+
+                await self._ensure_group_writer(g)
+                await self._write_row(g, row)
+
+                # YENİ: Şehri gruba ekle
+                self.group_cities[g][city] += 1
+
+        if has_match:
+            self.matched_rows += 1
+        elif city:
+            self.unmatched_cities.add(city)
+            self.unmatched_rows += 1
+
+            await self._ensure_group_writer(UNMATCHED_GROUP_ID, UNMATCHED_SHEET_NAME)
+            await self._write_row(UNMATCHED_GROUP_ID, row)
+            self.group_cities[UNMATCHED_GROUP_ID][city] += 1
+
+    @staticmethod
+    def _lookup_city_groups(city: Any) -> List[str]:
+        """Senkron şehir → grup listesi (group_manager.get_groups_for_city ile aynı kural)"""
+        normalized_city = group_manager.normalize_city_name(city)
+        return group_manager.city_to_group.get(normalized_city, [UNMATCHED_GROUP_ID])
+
+    async def _route_chunk(self, chunk: List[tuple]) -> None:
+        """Vektörel motor: chunk'ı tek geçişte gruplara ayırır, her grup dilimini blok halinde yazar"""
+        chunk_start = self.processed_rows
+        routed = self._router.route(chunk)
+        self.processed_rows += len(chunk)
+        self.matched_rows += routed.matched_count
+
+        if self.dedupe:
+            await self._resolve_aliases(dict(routed.group_rows), chunk_start)
+
+        for group_id, row_ids in routed.group_rows:
+            await self._ensure_group_writer(group_id)
+            self._count_cities(group_id, routed.codes[row_ids])
+
+            if group_id in self.aliases:
+                # Satırlar alias'ın kopyası olduğu grupta yazılıyor, burada sadece sayılır
+                self.row_counts[group_id] += len(row_ids)
+                continue
+            await self._write_rows(group_id, _chunk_rows(chunk, row_ids))
+
+        if len(routed.unmatched_rows):
+            row_ids = routed.unmatched_rows
+            self.unmatched_cities.update(self._router.city(code) for code in np.unique(routed.codes[row_ids]))
+            self.unmatched_rows += len(row_ids)
+
+            await self._ensure_group_writer(UNMATCHED_GROUP_ID, UNMATCHED_SHEET_NAME)
+            await self._write_rows(UNMATCHED_GROUP_ID, _chunk_rows(chunk, row_ids))
+            self._count_cities(UNMATCHED_GROUP_ID, routed.codes[row_ids])
+
+    def _count_cities(self, group_id: str, codes: np.ndarray) -> None:
+        """Şehir kodlarından grubun şehir → satır sayısı sayacını günceller"""
+        unique_codes, counts = np.unique(codes, return_counts=True)
+        counter = self.group_cities[group_id]
+        for code, count in zip(unique_codes.tolist(), counts.tolist()):
+            counter[self._router.city(code)] += count
+
+    async def _resolve_aliases(self, group_rows: Dict[str, np.ndarray], chunk_start: int) -> None:
+        """
+        Aynı satır kümesini alan grupları eşler (dedupe).
+        - Bu chunk'ta ilk kez görülen ve satır indeksleri birebir aynı olan gruplar → alias
+        - Kopyası olduğu gruptan farklı satır alan alias → kendi dosyasına geçer (materialize)
+        """
+        empty = np.empty(0, dtype=np.intp)
+
+        by_target: Dict[str, List[str]] = {}
+        for alias, target in self.aliases.items():
+            by_target.setdefault(target, []).append(alias)
+
+        for target, aliases in by_target.items():
+            target_rows = group_rows.get(target, empty)
+            diverged: Dict[bytes, List[str]] = {}
+            for alias in aliases:
+                alias_rows = group_rows.get(alias, empty)
+                if not np.array_equal(alias_rows, target_rows):
+                    diverged.setdefault(alias_rows.tobytes(), []).append(alias)
+
+            # Birlikte ayrışanlar kendi aralarında hâlâ aynı → tek dosya
+            for members in diverged.values():
+                new_target = members[0]
+                del self.aliases[new_target]
+                await self._materialize_alias(new_target, chunk_start)
+                for alias in members[1:]:
+                    self.aliases[alias] = new_target
+
+        first_seen: Dict[Tuple[str, bytes], str] = {}
+        for group_id, row_ids in group_rows.items():
+            if group_id in self.output_paths:
+                continue
+            # Sadece aynı formattaki gruplar aynı dosyayı paylaşabilir
+            key = (await self._output_format(group_id), row_ids.tobytes())
+            if key in first_seen:
+                self.aliases[group_id] = first_seen[key]
+                await self._ensure_group_writer(group_id, open_writer=False)
+                logger.debug(f"excelsplit {group_id} aynı satırları alıyor: {first_seen[key]} dosyası kullanılacak")
+            else:
+                first_seen[key] = group_id
+
+    async def _materialize_alias(self, group_id: str, upto_row: int) -> None:
+        """Alias grubu kendi workbook'una geçirir: ilk upto_row satır kaynaktan yeniden okunur"""
+        logger.info(f"excelsplit {group_id} ayrıştı, ilk {upto_row} satır yeniden okunuyor")
+        await self._open_writer(group_id, self.output_paths[group_id], "Veriler")
+
+        expected = self.row_counts[group_id]
+        self.row_counts[group_id] = 1
+        async for chunk in self._iter_source_chunks(limit=upto_row):
+            for routed_group, row_ids in self._router.route(chunk).group_rows:
+                if routed_group == group_id:
+                    await self._write_rows(group_id, _chunk_rows(chunk, row_ids))
+
+        if self.row_counts[group_id] != expected:
+            raise RuntimeError(
+                f"{group_id} yeniden okuma satır sayısı uyuşmuyor: "
+                f"{self.row_counts[group_id] - 1} != {expected - 1}"
+            )
+
+    async def _open_writer(self, group_id: str, file_path: Path, sheet_name: str) -> None:
+        """Create workbook + sheet for group (in threadpool or writer process)."""
+        self.sheet_names[group_id] = sheet_name
+        if self.sort_outputs:
+            # Sıralı çıktı: satırlar sıralayıcıya gider, workbook sonda birleştirilmiş run'lardan kurulur
+            if self._sorter is None:
+                key = row_sort_key([self.headers.index(name) for name in ("TARİH", "İL") if name in self.headers])
+                self._sorter = ExternalGroupSorter(config.paths.TEMP_DIR, key, self.chunk_size)
+            self._sorter.register(group_id)
+            return
+
+        if len(self._live_groups) >= self._live_writer_limit:
+            # Workbook sınırı dolu: grup run dosyasına yazılır, workbook sonda kurulur
+            if self._spill is None:
+                self._spill = SpillRunStore(config.paths.TEMP_DIR, self._spill_handles)
+                logger.info(
+                    f"🗂️ excelsplit Açık workbook sınırı ({self._live_writer_limit}) doldu, "
+                    f"yeni gruplar run dosyalarına yazılacak"
+                )
+            self._spill.register(group_id)
+            return
 
-    async def _ensure_group_writer(self, group_id: str) -> None:
-        """Create workbook + sheet for group if not exists (in threadpool)."""
-        if group_id in self.writers:
+        self._live_groups.add(group_id)
+        if self._process_pool is not None:
+            await self._process_pool.open_group(group_id, file_path, self.headers, sheet_name,
+                                                _writer_options(self.output_formats[group_id]))
+        else:
+            loop = asyncio.get_running_loop()
+            writer = await loop.run_in_executor(
+                self._executor,
+                functools.partial(_sync_create_writer, file_path, self.headers, sheet_name,
+                                  self.output_formats[group_id]))
+            self.writers[group_id] = writer
+
+    async def _output_format(self, group_id: str) -> str:
+        """Grubun çıktı formatı (groups.json output_format; bilinmeyen → xlsx)"""
+        output_format = self.output_formats.get(group_id)
+        if output_format is None:
+            group_info = await group_manager.get_group_info(group_id)
+            output_format = normalize_output_format(group_info.get("output_format"))
+            self.output_formats[group_id] = output_format
+        return output_format
+
+    async def _ensure_group_writer(self, group_id: str, sheet_name: str = "Veriler",
+                                   open_writer: bool = True) -> None:
+        """Register group output (path, counters) and open its writer if not exists."""
+        if group_id in self.output_paths:
             return
 
         group_info = await group_manager.get_group_info(group_id)
-        filename = await generate_output_filename(group_info)
+        output_format = await self._output_format(group_id)
+        filename = await generate_output_filename(group_info, output_format)
 
         output_dir = config.paths.OUTPUT_DIR
         output_dir.mkdir(parents=True, exist_ok=True)
 
         file_path = output_dir / filename
 
-        loop = asyncio.get_running_loop()
-        wb_ws = await loop.run_in_executor(self._executor, functools.partial(_sync_create_writer, file_path, self.headers))
-        wb, ws = wb_ws
-        self.writers[group_id] = wb
-        self.sheets[group_id] = ws
+        if open_writer:
+            await self._open_writer(group_id, file_path, sheet_name)
+        self.output_paths[group_id] = file_path
         self.row_counts[group_id] = 1
+        self.buffers[group_id] = []
+        self.buffered[group_id] = 0
         
-        # YENİ: Grup için şehir seti oluştur
-        self.group_cities[group_id] = set()
+        # YENİ: Grup için şehir sayacı oluştur
+        self.group_cities[group_id] = Counter()
         
         logger.debug(f"excelsplit Writer created for group {group_id}: {file_path}")
 
     async def _write_row(self, group_id: str, row: tuple) -> None:
-        """Write a row to group's sheet (performed in threadpool)."""
-        ws = self.sheets[group_id]
-        row_index = self.row_counts[group_id]
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(self._executor, functools.partial(_sync_write_row, ws, row_index, row))
+        """Buffer a row for group's sheet; flush to threadpool when batch is full."""
+        buffer = self.buffers[group_id]
+        if buffer and isinstance(buffer[-1], list):
+            buffer[-1].append(row)
+        else:
+            buffer.append([row])
+        self.buffered[group_id] += 1
         self.row_counts[group_id] += 1
+        if self.buffered[group_id] >= self.batch_size:
+            await self._flush_group(group_id)
+
+    async def _write_rows(self, group_id: str, rows: Sequence[tuple]) -> None:
+        """Buffer a block of rows (list or RowView) for group's sheet; flush when batch is full."""
+        self.buffers[group_id].append(rows)
+        self.buffered[group_id] += len(rows)
+        self.row_counts[group_id] += len(rows)
+        if self.buffered[group_id] >= self.batch_size:
+            await self._flush_group(group_id)
+
+    async def _flush_group(self, group_id: str) -> None:
+        """Write buffered rows of a group in a single threadpool call (or one queue message)."""
+        pieces = self.buffers.get(group_id)
+        if not pieces:
+            return
+        start_index = self.row_counts[group_id] - self.buffered[group_id]
+        self.buffers[group_id] = []
+        self.buffered[group_id] = 0
+        loop = asyncio.get_running_loop()
+
+        if self._sorter is not None and group_id in self._sorter:
+            await loop.run_in_executor(
+                self._executor, functools.partial(_sync_sort_pieces, self._sorter, group_id, pieces))
+            return
+
+        if self._spill is not None and group_id in self._spill:
+            await loop.run_in_executor(
+                self._executor, functools.partial(_sync_spill_pieces, self._spill, group_id, pieces))
+            return
+
+        if self._process_pool is not None:
+            rows = await loop.run_in_executor(self._executor, functools.partial(_sync_materialize, pieces))
+            await self._process_pool.write_rows(group_id, start_index, rows)
+            return
+
+        ws = self.writers[group_id]
+        await loop.run_in_executor(self._executor, functools.partial(_sync_write_pieces, ws, start_index, pieces))
 
     async def _close_all_writers(self) -> Dict[str, Dict[str, Any]]:
-        """Close workbooks in threadpool and return output_files dict."""
+        """Close workbooks (threadpool or writer processes) and return output_files dict."""
         output_files: Dict[str, Dict[str, Any]] = {}
         loop = asyncio.get_running_loop()
+        close_errors: Dict[str, str] = {}
 
-        for group_id, wb in list(self.writers.items()):
+        if self._process_pool is not None:
+            # Worker'lar workbook'ları paralel kapatır
+            for group_id in self.output_paths:
+                await self._flush_group(group_id)
+            pool, self._process_pool = self._process_pool, None
+            close_errors = await pool.close()
+
+        # grup_0 her zaman en sona (mail ve rapor sırası)
+        ordered = sorted(self.output_paths.items(), key=lambda item: item[0] == UNMATCHED_GROUP_ID)
+
+        for group_id, ws_path in ordered:
+            if group_id in self.aliases:
+                continue
             try:
                 row_count = self.row_counts.get(group_id, 1) - 1
-                await loop.run_in_executor(self._executor, functools.partial(_sync_close_writer, wb))
-                ws_path = Path(wb.filename)
+                wb = self.writers.get(group_id)
+                if wb is not None:
+                    await self._flush_group(group_id)
+                    await loop.run_in_executor(self._executor, functools.partial(_sync_close_writer, wb))
+                elif self._sorter is not None and group_id in self._sorter:
+                    await self._flush_group(group_id)
+                    if row_count > 0:
+                        await loop.run_in_executor(
+                            self._executor,
+                            functools.partial(_sync_assemble_sorted, self._sorter, group_id, ws_path,
+                                              self.headers, self.sheet_names.get(group_id, "Veriler"),
+                                              self.output_formats[group_id], self.batch_size))
+                elif self._spill is not None and group_id in self._spill:
+                    await self._flush_group(group_id)
+                    if row_count > 0:
+                        await loop.run_in_executor(
+                            self._executor,
+                            functools.partial(_sync_assemble_spilled, self._spill, group_id, ws_path,
+                                              self.headers, self.sheet_names.get(group_id, "Veriler"),
+                                              self.output_formats[group_id]))
+                if group_id in close_errors:
+                    raise RuntimeError(close_errors[group_id])
                 
                 if row_count <= 0:
                     if ws_path.exists():
@@ -128,21 +643,72 @@ class ExcelSplitter:
                     continue
 
                 # YENİ: Şehir bilgisini output_files'a ekle
-                cities_in_group = list(self.group_cities.get(group_id, set()))
+                city_counts = dict(self.group_cities.get(group_id, {}))
+                cities_in_group = list(city_counts)
+                parts, sheets = output_layout(
+                    self.output_formats[group_id], ws_path, self.sheet_names.get(group_id, "Veriler"),
+                    row_count, self.rollover, config.bot.SHEET_MAX_ROWS)
                 
                 output_files[group_id] = {
                     "filename": ws_path.name,
                     "path": ws_path,
                     "row_count": row_count,
-                    "cities": cities_in_group  # YENİ!
+                    "cities": cities_in_group,  # YENİ!
+                    "city_counts": city_counts,  # şehir → satır sayısı
+                    "parts": parts,    # satır sınırı aşılırsa _part2, _part3 ... (ilk eleman = path)
+                    "sheets": sheets,  # Veriler, Veriler_2 ... (csv: boş)
+                    "format": self.output_formats[group_id],
                 }
                 
                 logger.info(f"📄 Saved: {ws_path.name} ({row_count} rows, {len(cities_in_group)} cities)")
+                if len(parts) > 1 or len(sheets) > 1:
+                    logger.info(f"📑 excelsplit {group_id} satır sınırını aştı: {len(parts)} dosya, {len(sheets)} sayfa")
                 
             except Exception as e:
                 logger.error(f"excelsplit Error closing workbook for {group_id}: {e}", exc_info=True)
 
-        return output_files
+        # Alias gruplar: aynı içerikli dosya bir kez yazıldı, hardlink/kopya ile çoğaltılır
+        for group_id, target in self.aliases.items():
+            try:
+                source = output_files.get(target)
+                if source is None:
+                    raise RuntimeError(f"kaynak dosya yok: {target}")
+
+                ws_path = self.output_paths[group_id]
+                parts = await loop.run_in_executor(
+                    self._executor, functools.partial(_sync_link_parts, source["parts"], ws_path))
+
+                output_files[group_id] = {
+                    "filename": ws_path.name,
+                    "path": ws_path,
+                    "row_count": self.row_counts.get(group_id, 1) - 1,
+                    "cities": list(self.group_cities.get(group_id, {})),
+                    "city_counts": dict(self.group_cities.get(group_id, {})),
+                    "parts": parts,
+                    "sheets": source["sheets"],
+                    "format": source["format"],
+                    "same_as": target,
+                }
+                logger.info(f"📄 Linked: {ws_path.name} (= {source['filename']})")
+
+            except Exception as e:
+                logger.error(f"excelsplit Error linking output for {group_id}: {e}", exc_info=True)
+
+        if self._sorter is not None:
+            logger.info(f"🔀 excelsplit Sıralı çıktı: {self._sorter.spilled_runs} run diske yazıldı "
+                        f"(bellek bütçesi {self._sorter.memory_rows} satır)")
+            await loop.run_in_executor(self._executor, self._sorter.cleanup)
+            self._sorter = None
+
+        if self._spill is not None:
+            logger.info(
+                f"🗂️ excelsplit Açık workbook: {len(self._live_groups)}, run dosyasından kurulan: "
+                f"{len(self.sheet_names) - len(self._live_groups)}, en fazla açık run dosyası: {self._spill.peak_handles}"
+            )
+            await loop.run_in_executor(self._executor, self._spill.cleanup)
+            self._spill = None
+
+        return {group_id: output_files[group_id] for group_id, _ in ordered if group_id in output_files}
 
     # ---------- main ----------
     async def run(self) -> Dict[str, Any]:
@@ -150,108 +716,68 @@ class ExcelSplitter:
             logger.info("🔄 excelsplit Group manager initializing…")
             await group_manager._ensure_initialized()
 
-            logger.info("📥 excelsplit Reading input file…")
-            rows = await self._read_rows()
-            processed_rows = 0
-
-            # Build unique city set for caching
-            cities = set()
-            for row in rows:
-                if row and len(row) > 1 and row[1]:
-                    cities.add(row[1])
-
-            logger.debug(f"excelsplit Unique cities found: {len(cities)}")
-
-            # Fetch groups for each city concurrently and cache results
-            city_tasks = {city: asyncio.create_task(group_manager.get_groups_for_city(city)) 
-                         for city in cities}
-            
-            for city, task in city_tasks.items():
-                try:
-                    groups = await task
-                    self._city_cache[city] = groups or []
-                except Exception as e:
-                    logger.warning(f"excelsplit City lookup failed for {city}: {e}")
-                    self._city_cache[city] = []
-
-            # Process rows
-            for row_idx, row in enumerate(rows):
-                processed_rows += 1
-                city = row[1] if row and len(row) > 1 else None
-                groups = []
-                
-                if city:
-                    groups = self._city_cache.get(city, [])
-
-                has_match = False
-                if groups:
-                    for g in groups:
-                        if g != "grup_0":
-                            has_match = True
-                            self.matched_row_ids.add(row_idx)
-                            
-                            await self._ensure_group_writer(g)
-                            await self._write_row(g, row)
-                            
-                            # YENİ: Şehri gruba ekle
-                            if city and g in self.group_cities:
-                                self.group_cities[g].add(city)
-
-                if not has_match:
-                    if city:
-                        self.unmatched_cities.add(city)
-                        self.unmatched_data.append(row)
-            
-            logger.info(f"✔ excelsplit Processing complete. Total rows processed: {processed_rows}")
-
-            # Finalize writers
+            if self.writer_backend == WRITER_BACKEND_PROCESS:
+                loop = asyncio.get_running_loop()
+                self._process_pool = await loop.run_in_executor(
+                    self._executor,
+                    functools.partial(ProcessWriterPool, self._executor,
+                                      config.bot.WRITER_PROCESSES, config.bot.WRITER_QUEUE_SIZE))
+                logger.info(f"🧵 excelsplit Writer süreçleri başlatıldı: {config.bot.WRITER_PROCESSES}")
+
+            if self.routing_engine == ROUTING_ENGINE_VECTORIZED:
+                self._router = VectorizedCityRouter(list(group_manager.groups.keys()), self._lookup_city_groups)
+
+            logger.info(
+                f"📥 excelsplit Reading input file… (streaming: {self.streaming}, routing: {self.routing_engine})"
+            )
+            peak_memory_mb = 0.0
+
+            async for chunk in self._iter_row_chunks():
+                if self._router is not None:
+                    await self._route_chunk(chunk)
+                else:
+                    for row in chunk:
+                        await self._route_row(row)
+
+                memory_mb = await monitor_memory_usage()
+                peak_memory_mb = max(peak_memory_mb, memory_mb)
+
+            logger.info(
+                f"✔ excelsplit Processing complete. Total rows processed: {self.processed_rows} "
+                f"(peak memory: {peak_memory_mb:.1f}MB)"
+            )
+
+            # Finalize writers (grup_0 dahil)
             output_files = await self._close_all_writers()
 
-            # If unmatched data exists, create grup_0 file
-            if self.unmatched_data:
-                group_id = "grup_0"
-                try:
-                    group_info = await group_manager.get_group_info(group_id)
-                    filename = await generate_output_filename(group_info)
-                    output_dir = config.paths.OUTPUT_DIR
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    file_path = output_dir / filename
-
-                    loop = asyncio.get_running_loop()
-                    wb_ws = await loop.run_in_executor(self._executor, 
-                        functools.partial(_sync_create_writer, file_path, self.headers, "Eşleşmeyenler"))
-                    wb, ws = wb_ws
-                    
-                    for idx, row in enumerate(self.unmatched_data, start=1):
-                        await loop.run_in_executor(self._executor, 
-                            functools.partial(_sync_write_row, ws, idx, row))
-                    
-                    await loop.run_in_executor(self._executor, 
-                        functools.partial(_sync_close_writer, wb))
-
-                    output_files[group_id] = {
-                        "filename": file_path.name,
-                        "path": file_path,
-                        "row_count": len(self.unmatched_data),
-                        "cities": list(self.unmatched_cities)  # YENİ: Eşleşmeyen şehirler
-                    }
-                    
-                    logger.info(f"📄 excelsplit Eşleşmeyenler dosyası: {filename} ({len(self.unmatched_data)} satır)")
-                    
-                except Exception as e:
-                    logger.error(f"excelsplit Eşleşmeyenler dosyası hatası: {e}", exc_info=True)
+            if UNMATCHED_GROUP_ID in output_files:
+                logger.info(
+                    f"📄 excelsplit Eşleşmeyenler dosyası: "
+                    f"{output_files[UNMATCHED_GROUP_ID]['filename']} ({self.unmatched_rows} satır)"
+                )
 
             return {
                 "success": True,
-                "processed_rows": processed_rows,
-                "matched_rows": len(self.matched_row_ids),
-                "unmatched_rows": len(self.unmatched_data),
+                "processed_rows": self.processed_rows,
+                "matched_rows": self.matched_rows,
+                "unmatched_rows": self.unmatched_rows,
                 "output_files": output_files,
                 "unmatched_cities": list(self.unmatched_cities),
+                "headers": self.headers,
+                "unparsed_dates": self.date_normalizer.unparsed if self.date_normalizer else 0,
             }
 
         except Exception as e:
             logger.error(f"❌ Error in ExcelSplitter.run: {e}", exc_info=True)
+            if self._process_pool is not None:
+                await self._process_pool.terminate()
+                self._process_pool = None
+            if self._spill is not None:
+                self._spill.cleanup()
+                self._spill = None
+            if self._sorter is not None:
+                self._sorter.cleanup()
+                self._sorter = None
             return {
                 "success": False,
                 "error": str(e),
@@ -260,8 +786,15 @@ class ExcelSplitter:
             }
 
 # external API
-async def split_excel_by_groups(input_path: str, headers: List[str]) -> Dict[str, Any]:
-    splitter = ExcelSplitter(input_path, headers)
+async def split_excel_by_groups(input_path: str, headers: List[str], batch_size: Optional[int] = None,
+                                streaming: Optional[bool] = None) -> Dict[str, Any]:
+    splitter = ExcelSplitter(input_path, headers, batch_size=batch_size, streaming=streaming)
+    return await splitter.run()
+
+
+async def split_excel_fused(input_path: Source, cleaner, streaming: Optional[bool] = None) -> Dict[str, Any]:
+    """Temizleme + bölme tek geçişte: ara temp xlsx yazılmaz (oturum verilirse dosya tekrar ayrıştırılmaz)"""
+    splitter = ExcelSplitter(input_path, None, cleaner=cleaner, streaming=streaming)
     return await splitter.run()
 
 
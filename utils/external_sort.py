@@ -0,0 +1,150 @@
+# utils/external_sort.py
+"""
+Grup çıktıları için dış sıralama (external sort): TARİH, sonra İL
+
+Bellekte sıralamak streaming modun anlamını bozar; sıralayıcı sabit bir satır bütçesiyle çalışır:
+- Gruplara gelen satırlar bellekte tamponlanır (toplam memory_rows satır, CHUNK_SIZE'dan)
+- Bütçe dolunca en büyük grup tamponları sıralanıp run olarak diske yazılır (SpillRunStore)
+- Grup dosyası kurulurken run'lar heapq.merge ile birleştirilir; run sayısı fan_in'i aşarsa
+  önce ara birleştirme turları yapılır (açık dosya ve bellek sınırlı)
+- Run kayıtları record_rows satırdır; birleştirmede her run'dan bir kayıt bellekte durur,
+  yani birleştirme de ~memory_rows satırla çalışır
+
+Sıralama kararlıdır: aynı anahtarlı satırlar giriş sırasını korur.
+Metinler Türk alfabesine göre sıralanır (Ç C'den, İ I'dan sonra); None en sona gider.
+
+Tüm metotlar senkrondur; ExcelSplitter bunları threadpool'da sırayla çağırır.
+"""
+
+import heapq
+import itertools
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from utils.spill_store import SpillRunStore
+
+SORT_MERGE_FAN_IN = 16  # bir birleştirme turunda en fazla açık run
+
+TURKISH_ALPHABET = "AaBbCcÇçDdEeFfGgĞğHhIıİiJjKkLlMmNnOoÖöPpQqRrSsŞşTtUuÜüVvWwXxYyZz"
+_COLLATION = {ord(ch): chr(0x100 + index) for index, ch in enumerate(TURKISH_ALPHABET)}
+
+
+def _sortable(value: Any) -> Tuple[int, Any]:
+    """Karışık türleri karşılaştırılabilir yapar: metin/tarih < sayı < None"""
+    if value is None:
+        return 2, ""
+    if isinstance(value, str):
+        return 0, value.translate(_COLLATION)
+    if isinstance(value, (datetime, date)):
+        return 0, value.isoformat()
+    if isinstance(value, (int, float)):
+        return 1, value
+    return 0, str(value).translate(_COLLATION)
+
+
+def row_sort_key(positions: Sequence[int]) -> Callable[[tuple], tuple]:
+    """Verilen sütun pozisyonlarına göre satır anahtarı (kısa satırda eksik sütun None)"""
+    def key(row: tuple) -> tuple:
+        return tuple(_sortable(row[pos] if pos < len(row) else None) for pos in positions)
+    return key
+
+
+class ExternalGroupSorter:
+    """Grup başına sıralı run'lar; bellekte en fazla memory_rows satır tamponlanır"""
+
+    def __init__(self, temp_dir: Path, key: Callable[[tuple], Any], memory_rows: int,
+                 fan_in: int = SORT_MERGE_FAN_IN):
+        self.key = key
+        self.memory_rows = max(1, memory_rows)
+        self.fan_in = max(2, fan_in)
+        self.record_rows = max(1, self.memory_rows // self.fan_in)
+        self._store = SpillRunStore(temp_dir, max_handles=1)  # run'lar tek seferde yazılır
+        self._buffers: Dict[str, List[tuple]] = {}
+        self._buffered = 0
+        self._runs: Dict[str, List[Tuple[str, int]]] = {}
+        self._run_ids = itertools.count()
+        self.spilled_runs = 0
+
+    def __contains__(self, group_id: str) -> bool:
+        return group_id in self._buffers
+
+    def register(self, group_id: str) -> None:
+        self._buffers.setdefault(group_id, [])
+        self._runs.setdefault(group_id, [])
+
+    def add(self, group_id: str, rows: List[tuple]) -> None:
+        """Satırları grubun tamponuna ekler; bütçe aşılırsa büyük tamponlar run olarak yazılır"""
+        self.register(group_id)
+        self._buffers[group_id].extend(rows)
+        self._buffered += len(rows)
+        if self._buffered < self.memory_rows:
+            return
+        # En büyük tamponlardan başlayarak bütçenin yarısına inene kadar boşalt
+        for gid in sorted(self._buffers, key=lambda g: len(self._buffers[g]), reverse=True):
+            if self._buffered <= self.memory_rows // 2:
+                break
+            self._spill(gid)
+
+    def _write_run(self, group_id: str, rows: Iterator[tuple]) -> Tuple[str, int]:
+        run = (group_id, next(self._run_ids))
+        self._store.register(run)
+        while True:
+            record = list(itertools.islice(rows, self.record_rows))
+            if not record:
+                break
+            self._store.append(run, record)
+        self.spilled_runs += 1
+        return run
+
+    def _spill(self, group_id: str) -> None:
+        rows = self._buffers[group_id]
+        if not rows:
+            return
+        rows.sort(key=self.key)
+        self._runs[group_id].append(self._write_run(group_id, iter(rows)))
+        self._buffered -= len(rows)
+        self._buffers[group_id] = []
+
+    def _iter_run(self, run: Tuple[str, int]) -> Iterator[tuple]:
+        for record in self._store.iter_batches(run):
+            yield from record
+
+    def _merge(self, runs: List[Tuple[str, int]]) -> Iterator[tuple]:
+        # heapq.merge kararlı: eşit anahtarda önceki run (giriş sırasında önce gelen) önce çıkar
+        return heapq.merge(*(self._iter_run(run) for run in runs), key=self.key)
+
+    def iter_sorted(self, group_id: str, batch_rows: int) -> Iterator[List[tuple]]:
+        """Grubun tüm satırlarını sıralı batch'ler halinde üretir; run dosyaları okundukça silinir"""
+        runs = self._runs.get(group_id, [])
+        if not runs:
+            rows = self._buffers.get(group_id, [])
+            rows.sort(key=self.key)
+            for start in range(0, len(rows), max(1, batch_rows)):
+                yield rows[start:start + batch_rows]
+            return
+
+        self._spill(group_id)  # kalan tampon son run olur (giriş sırası korunur)
+        while len(runs) > self.fan_in:
+            merged = self._write_run(group_id, self._merge(runs[:self.fan_in]))
+            for run in runs[:self.fan_in]:
+                self._store.discard(run)
+            runs[:self.fan_in] = [merged]
+
+        rows = self._merge(runs)
+        while True:
+            batch = list(itertools.islice(rows, max(1, batch_rows)))
+            if not batch:
+                break
+            yield batch
+
+    def discard(self, group_id: str) -> None:
+        for run in self._runs.pop(group_id, []):
+            self._store.discard(run)
+        self._buffered -= len(self._buffers.pop(group_id, []))
+
+    def cleanup(self) -> None:
+        self._store.cleanup()
+        self._buffers.clear()
+        self._runs.clear()
+        self._buffered = 0
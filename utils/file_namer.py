@@ -14,16 +14,16 @@ Tamamen Async Basit Versiyon
 
 import asyncio
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 import re
 
 
-async def generate_output_filename(group_info: Dict, file_extension: str = "xlsx") -> str:
+async def generate_output_filename(group_info: Dict, file_extension: Optional[str] = None) -> str:
     """Async çıktı dosyası için isim oluşturur
     
     Args:
         group_info: Grup bilgilerini içeren sözlük
-        file_extension: Dosya uzantısı (varsayılan: xlsx)
+        file_extension: Dosya uzantısı (varsayılan: grubun output_format'ı, yoksa xlsx)
     
     Returns:
         Oluşturulan dosya adı
@@ -47,6 +47,8 @@ async def generate_output_filename(group_info: Dict, file_extension: str = "xlsx
         lambda: "".join(c for c in base_name if c.isalnum() or c in ('-', '_', '.')).rstrip()
     )
     
+    if file_extension is None:
+        file_extension = group_info.get("output_format") or "xlsx"
     clean_extension = file_extension.lstrip('.').lower()
     
     return f"{safe_filename}.{clean_extension}"
\ No newline at end of file
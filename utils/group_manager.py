@@ -20,6 +20,7 @@ class GroupConfig:
     group_name: str
     email_recipients: List[str]
     cities: List[str]
+    output_format: str = "xlsx"  # grup dosyası formatı: xlsx | csv | csv.gz
 
 class GroupManager:
     """TAM ASYNC Group Manager - Basitleştirilmiş"""
@@ -137,7 +138,8 @@ class GroupManager:
                                 group_id=group_id,
                                 group_name=group_data.get("group_name", group_id),
                                 email_recipients=group_data.get("email_recipients", []),
-                                cities=group_data.get("cities", [])
+                                cities=group_data.get("cities", []),
+                                output_format=group_data.get("output_format", "xlsx")
                             )
                 else:
                     for group_id, group_data in groups_data.items():
@@ -145,7 +147,8 @@ class GroupManager:
                             group_id=group_id,
                             group_name=group_data.get('group_name', group_id),
                             email_recipients=group_data.get('email_recipients', []),
-                            cities=group_data.get('cities', [])
+                            cities=group_data.get('cities', []),
+                            output_format=group_data.get('output_format', 'xlsx')
                         )
 
                 logger.info(f"✅ {len(self.groups)} grup async yüklendi")
@@ -192,7 +195,8 @@ class GroupManager:
                             "group_id": group_id,
                             "group_name": group_config.group_name,
                             "email_recipients": group_config.email_recipients,
-                            "cities": group_config.cities
+                            "cities": group_config.cities,
+                            "output_format": group_config.output_format
                         }
                         for group_id, group_config in self.groups.items()
                     ]
@@ -274,7 +278,7 @@ class GroupManager:
 
             try:
                 group_config = self.groups[group_id]
-                valid_fields = ["group_name", "email_recipients", "cities"]
+                valid_fields = ["group_name", "email_recipients", "cities", "output_format"]
                 
                 for key, value in kwargs.items():
                     if key in valid_fields and hasattr(group_config, key):
@@ -293,7 +297,8 @@ class GroupManager:
                 return False
 
     async def create_group(self, group_id: str, group_name: str, 
-                          email_recipients: List[str], cities: List[str]) -> bool:
+                          email_recipients: List[str], cities: List[str],
+                          output_format: str = "xlsx") -> bool:
         """Yeni grup async oluştur"""
         await self._ensure_initialized()
         
@@ -306,7 +311,8 @@ class GroupManager:
                     group_id=group_id,
                     group_name=group_name,
                     email_recipients=email_recipients,
-                    cities=cities
+                    cities=cities,
+                    output_format=output_format
                 )
 
                 # Mapping'i yenile
@@ -17,9 +17,10 @@ import json
 import logging
 import aiofiles
 import asyncio
-from openpyxl import load_workbook
 from typing import Dict, List, Any
 
+from utils.xlsx_reader import open_workbook
+
 logger = logging.getLogger(__name__)
 
 async def process_excel_to_json(excel_file_path: str) -> str:
@@ -33,9 +34,9 @@ async def process_excel_to_json(excel_file_path: str) -> str:
         Oluşturulan JSON dosyasının yolu
     """
     try:
-        # Excel dosyasını senkron olarak yükle (openpyxl async desteklemiyor)
+        # Excel dosyasını senkron olarak aç (READER_BACKEND: native / openpyxl)
         def load_excel_sync():
-            return load_workbook(excel_file_path, read_only=True)
+            return open_workbook(excel_file_path)
         
         # Thread pool'da Excel yükleme
         loop = asyncio.get_event_loop()
@@ -89,43 +90,45 @@ def extract_groups_data(worksheet) -> List[Dict[str, Any]]:
     Worksheet'ten grup verilerini çıkarır.
     
     Args:
-        worksheet: Openpyxl worksheet objesi
+        worksheet: Worksheet objesi (native okuyucu veya openpyxl read_only)
         
     Returns:
         Grup verileri listesi
     """
     groups = []
     
+    # Sayfa tek geçişte satırlara alınır (read_only'de hücre adresiyle erişim her seferinde XML'i tarar)
+    rows = list(worksheet.iter_rows(values_only=True))
+    
+    def cell_value(row_number: int, column_number: int):
+        if row_number > len(rows):
+            return None
+        row = rows[row_number - 1]
+        return row[column_number - 1] if column_number <= len(row) else None
+    
     # Sütunları D'dan başlayarak tarayın (sütun 4)
     column_index = 4  # D sütunu = 4
     
     while True:
-        # Sütun harfini al (AA, AB, ... dahil)
-        column_letter = get_column_letter(column_index)
-        
         # Grup ID kontrolü (1. satır)
-        group_id_cell = f"{column_letter}1"
-        group_id = worksheet[group_id_cell].value if worksheet[group_id_cell].value else None
+        group_id = cell_value(1, column_index) or None
         
         # Boş sütun bulunursa dur
         if not group_id:
             break
         
         # Grup adı (2. satır)
-        group_name_cell = f"{column_letter}2"
-        group_name = worksheet[group_name_cell].value if worksheet[group_name_cell].value else ""
+        group_name = cell_value(2, column_index) or ""
         
         # E-posta listesi (3. satır)
-        email_cell = f"{column_letter}3"
-        email_recipients = worksheet[email_cell].value if worksheet[email_cell].value else ""
+        email_recipients = cell_value(3, column_index) or ""
         
         # Şehirleri topla (4. satırdan itibaren)
         cities = []
         row_index = 4
         
         while True:
-            city_cell = f"{column_letter}{row_index}"
-            city = worksheet[city_cell].value
+            city = cell_value(row_index, column_index)
             
             # Boş hücre bulunursa şehirleri toplamayı durdur
             if not city:
@@ -84,6 +84,7 @@ class EmailAttachment:
                 '.jpeg': 'jpeg',
                 '.png': 'png',
                 '.zip': 'zip',
+                '.gz': 'gzip',
                 '.rar': 'vnd.rar'
             }
             ext = self.file_path.suffix.lower()
@@ -0,0 +1,82 @@
+# utils/output_writers.py
+"""
+Grup dosyası çıktı formatları (groups.json → "output_format")
+
+- xlsx   : RolloverWriter (xlsxwriter constant_memory) veya StreamingXlsxWriter (native),
+           satır sınırında sayfa/dosya devri
+- csv    : düz CSV (utf-8-sig, Excel Türkçe ayarında ";" ayraç)
+- csv.gz : gzip sıkıştırılmış CSV (en küçük ek, en hızlı üretim)
+
+Tüm writer'lar aynı arayüzü sunar: write_rows(start_index, rows) ve close().
+Modül config/logger import etmez (writer süreçlerinde de kullanılır).
+"""
+
+import csv
+import gzip
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from utils.sheet_rollover import ROLLOVER_SHEET, EXCEL_MAX_ROWS, RolloverWriter, rollover_layout
+from utils.xlsx_writer import StreamingXlsxWriter
+
+FORMAT_XLSX = "xlsx"
+FORMAT_CSV = "csv"
+FORMAT_CSV_GZ = "csv.gz"
+OUTPUT_FORMATS = (FORMAT_XLSX, FORMAT_CSV, FORMAT_CSV_GZ)
+
+XLSX_ENGINE_XLSXWRITER = "xlsxwriter"
+XLSX_ENGINE_NATIVE = "native"  # utils/xlsx_writer: satır XML'i doğrudan zip girdisine
+
+CSV_ENCODING = "utf-8-sig"  # BOM: Excel Türkçe karakterleri doğru açsın
+CSV_GZIP_LEVEL = 6
+
+
+def normalize_output_format(value) -> str:
+    """groups.json değeri → desteklenen format (bilinmeyen/boş → xlsx)"""
+    fmt = str(value or FORMAT_XLSX).strip().lower().lstrip(".")
+    return fmt if fmt in OUTPUT_FORMATS else FORMAT_XLSX
+
+
+class CsvGroupWriter:
+    """CSV / csv.gz grup dosyası; satır sınırı yok, satırlar geldiği sırayla yazılır"""
+
+    def __init__(self, file_path: Path, headers: List[str], compress: bool = False, delimiter: str = ";"):
+        self.file_path = Path(file_path)
+        if compress:
+            self._fh = gzip.open(self.file_path, "wt", encoding=CSV_ENCODING, newline="",
+                                 compresslevel=CSV_GZIP_LEVEL)
+        else:
+            self._fh = open(self.file_path, "w", encoding=CSV_ENCODING, newline="")
+        self._writer = csv.writer(self._fh, delimiter=delimiter)
+        self._writer.writerow(headers)
+
+    def write_rows(self, start_index: int, rows: List[tuple]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+GroupWriter = Union[RolloverWriter, StreamingXlsxWriter, CsvGroupWriter]
+
+
+def create_group_writer(file_path: Path, headers: List[str], sheet_name: str = "Veriler",
+                        output_format: str = FORMAT_XLSX, rollover: str = ROLLOVER_SHEET,
+                        max_rows: int = EXCEL_MAX_ROWS, csv_delimiter: str = ";",
+                        xlsx_engine: str = XLSX_ENGINE_XLSXWRITER) -> GroupWriter:
+    """Formata göre grup writer'ı"""
+    if output_format == FORMAT_CSV:
+        return CsvGroupWriter(file_path, headers, compress=False, delimiter=csv_delimiter)
+    if output_format == FORMAT_CSV_GZ:
+        return CsvGroupWriter(file_path, headers, compress=True, delimiter=csv_delimiter)
+    if xlsx_engine == XLSX_ENGINE_NATIVE:
+        return StreamingXlsxWriter(file_path, headers, sheet_name, rollover, max_rows)
+    return RolloverWriter(file_path, headers, sheet_name, rollover, max_rows)
+
+
+def output_layout(output_format: str, file_path: Path, sheet_name: str, data_rows: int,
+                  rollover: str = ROLLOVER_SHEET, max_rows: int = EXCEL_MAX_ROWS) -> Tuple[List[Path], List[str]]:
+    """Oluşan (dosyalar, sayfa adları); CSV tek dosya, sayfa yok"""
+    if output_format == FORMAT_XLSX:
+        return rollover_layout(file_path, sheet_name, data_rows, rollover, max_rows)
+    return [file_path], []
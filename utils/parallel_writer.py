@@ -0,0 +1,152 @@
+# utils/parallel_writer.py
+"""
+Çok süreçli (multiprocess) grup dosyası yazıcı
+
+xlsxwriter serileştirmesi thread'lerde GIL yüzünden sıraya girer.
+Bu modülde her worker süreci grupların bir alt kümesinin workbook'larına sahiptir;
+ana süreç sadece satırları yönlendirir ve batch'leri sınırlı (bounded) kuyruklarla gönderir.
+
+# Mesajlar (ana süreç → worker):
+- ("open", group_id, file_path, headers, sheet_name, options)  → options: create_group_writer parametreleri
+- ("rows", group_id, start_index, rows)
+- ("close",)  → worker tüm workbook'ları kapatır, sonucu result kuyruğuna yazar ve çıkar
+
+Bu modül config/logger import etmez; ancak spawn edilen worker ana modülü (main.py) __mp_main__
+olarak tekrar import eder ve onun importlarının maliyetini öder. main.py logger'ı sadece __main__
+altında kurduğu için worker'da log dosyası yazıcısı açılmaz.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import queue as queue_module
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from utils.output_writers import GroupWriter, create_group_writer
+
+PUT_POLL_SECONDS = 1.0
+CLOSE_TIMEOUT_SECONDS = 600
+
+
+def _writer_worker(worker_id: int, inbox, results) -> None:
+    """Worker süreci: kendisine atanan grupların workbook'larını yazar"""
+    books: Dict[str, GroupWriter] = {}
+    errors: Dict[str, str] = {}
+
+    while True:
+        message = inbox.get()
+        kind = message[0]
+
+        if kind == "close":
+            for group_id, wb in books.items():
+                try:
+                    wb.close()
+                except Exception as e:
+                    errors.setdefault(group_id, str(e))
+            results.put((worker_id, errors))
+            return
+
+        group_id = message[1]
+        if group_id in errors:
+            continue
+
+        try:
+            if kind == "open":
+                _, _, file_path, headers, sheet_name, options = message
+                books[group_id] = create_group_writer(file_path, headers, sheet_name, **options)
+            elif kind == "rows":
+                _, _, start_index, rows = message
+                books[group_id].write_rows(start_index, rows)
+        except Exception as e:
+            errors[group_id] = str(e)
+
+
+class ProcessWriterPool:
+    """
+    Grup workbook'larını worker süreçlere dağıtır.
+    Grup → worker ataması ilk açılışta round-robin yapılır ve değişmez
+    (aynı grubun batch'leri her zaman aynı kuyruktan, sırayla gider).
+    """
+
+    def __init__(self, executor: Executor, processes: int, queue_size: int):
+        self._executor = executor
+        self._ctx = multiprocessing.get_context("spawn")
+        self._results = self._ctx.Queue()
+        self._workers: List[Tuple[Any, Any]] = []
+        self._assignment: Dict[str, int] = {}
+
+        for worker_id in range(max(1, processes)):
+            inbox = self._ctx.Queue(maxsize=max(1, queue_size))
+            proc = self._ctx.Process(
+                target=_writer_worker,
+                args=(worker_id, inbox, self._results),
+                name=f"kova-writer-{worker_id}",
+                daemon=True,
+            )
+            proc.start()
+            self._workers.append((proc, inbox))
+
+    # ---------- sync (threadpool'da çalışır) ----------
+    def _sync_put(self, worker_id: int, message: tuple) -> None:
+        """Kuyruk doluysa bekler (backpressure); worker ölmüşse hata verir"""
+        proc, inbox = self._workers[worker_id]
+        while True:
+            try:
+                inbox.put(message, timeout=PUT_POLL_SECONDS)
+                return
+            except queue_module.Full:
+                if not proc.is_alive():
+                    raise RuntimeError(f"Writer süreci durdu: {proc.name} (exitcode={proc.exitcode})")
+
+    def _sync_close(self) -> Dict[str, str]:
+        for worker_id in range(len(self._workers)):
+            self._sync_put(worker_id, ("close",))
+
+        errors: Dict[str, str] = {}
+        pending = len(self._workers)
+        while pending:
+            try:
+                _, worker_errors = self._results.get(timeout=CLOSE_TIMEOUT_SECONDS)
+            except queue_module.Empty:
+                raise RuntimeError("Writer süreçleri zamanında kapanmadı")
+            errors.update(worker_errors)
+            pending -= 1
+
+        for proc, _ in self._workers:
+            proc.join(timeout=PUT_POLL_SECONDS * 5)
+        return errors
+
+    def _sync_terminate(self) -> None:
+        for proc, _ in self._workers:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join(timeout=PUT_POLL_SECONDS)
+
+    # ---------- async API ----------
+    async def _put(self, worker_id: int, message: tuple) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, functools.partial(self._sync_put, worker_id, message))
+
+    async def open_group(self, group_id: str, file_path: Path, headers: List[str], sheet_name: str,
+                         options: Dict[str, Any]) -> None:
+        worker_id = len(self._assignment) % len(self._workers)
+        self._assignment[group_id] = worker_id
+        await self._put(worker_id, ("open", group_id, file_path, list(headers), sheet_name, options))
+
+    async def write_rows(self, group_id: str, start_index: int, rows: List[tuple]) -> None:
+        await self._put(self._assignment[group_id], ("rows", group_id, start_index, rows))
+
+    async def close(self) -> Dict[str, str]:
+        """Tüm workbook'ları kapatır; {group_id: hata} döndürür"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._sync_close)
+        except Exception:
+            await loop.run_in_executor(self._executor, self._sync_terminate)
+            raise
+
+    async def terminate(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._sync_terminate)
@@ -0,0 +1,154 @@
+# utils/process_sandbox.py
+"""
+Sandbox süreçlerde ayrıştırma / birleştirme işleri
+
+openpyxl, pandas ve xlsxwriter CPU yoğun; thread'lerde çalışınca GIL yüzünden event loop
+(Telegram handler'ları) aç kalır. PARSE_BACKEND="process" (isteğe bağlı) ile her iş kendi (spawn) sürecinde çalışır:
+- iş başına RLIMIT_AS (bellek) ve RLIMIT_CPU (CPU saniyesi) — resource modülü olan sistemlerde
+- duvar saati zaman aşımı: süre dolunca süreç öldürülür (SandboxTimeout)
+- aynı anda en fazla SANDBOX_PROCESSES iş; fazlası sırada bekler
+- sonuç pipe üzerinden pickle (protocol 5) döner; tablolar ColumnarRowStore olarak
+  (sütun tamponları + sözlük değerleri, kompakt)
+- işte oluşan istisna aynı türüyle yeniden fırlatılır (ValueError → ValueError)
+
+Süreçler yeniden kullanılmaz: RLIMIT_CPU süreç ömrü boyunca birikir, iş başına limit
+ancak iş başına süreçle sağlanır. PARSE_BACKEND="thread" (varsayılan) eski davranıştır (limit yok).
+
+Spawn edilen süreç ana modülü (main.py) __mp_main__ olarak tekrar import eder: aiogram / aiohttp /
+config importlarının maliyeti her işte ödenir. main.py logger'ı sadece __main__ altında kurar, yani
+süreçte log dosyası yazıcısı açılmaz (loguru varsayılan stderr çıktısı). İş başına başlangıç maliyeti
+ölçülene kadar process backend varsayılan değildir.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import pickle
+import signal
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: limitler uygulanmaz, zaman aşımı yine geçerli
+    resource = None
+
+from config import config
+from utils.logger import logger
+
+BACKEND_PROCESS = "process"
+BACKEND_THREAD = "thread"
+
+CPU_HARD_LIMIT_GRACE = 5  # soft limitte SIGXCPU, birkaç saniye sonra hard limitte SIGKILL
+JOIN_SECONDS = 5
+
+_slots: Optional[asyncio.Semaphore] = None
+
+
+class SandboxError(RuntimeError):
+    """İş sandbox sürecinde tamamlanamadı (limit aşımı, çökme, serileştirilemeyen hata)"""
+
+
+class SandboxTimeout(SandboxError):
+    """İş zaman aşımına uğradı, süreç öldürüldü"""
+
+
+def _apply_limits(memory_mb: Optional[int], cpu_seconds: Optional[int]) -> None:
+    if resource is None:
+        return
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + CPU_HARD_LIMIT_GRACE))
+
+
+def _sandbox_worker(conn, func: Callable, args: tuple, kwargs: dict,
+                    memory_mb: Optional[int], cpu_seconds: Optional[int]) -> None:
+    """Sandbox süreci: limitleri uygular, işi çalıştırır, sonucu tek mesaj olarak gönderir"""
+    try:
+        _apply_limits(memory_mb, cpu_seconds)
+        payload = ("ok", func(*args, **kwargs))
+    except MemoryError:
+        payload = ("error", SandboxError(f"Bellek sınırı aşıldı ({memory_mb}MB)"))
+    except BaseException as e:
+        payload = ("error", e)
+
+    try:
+        data = pickle.dumps(payload, protocol=5)
+    except Exception as e:
+        error = payload[1] if payload[0] == "error" else e
+        data = pickle.dumps(("error", SandboxError(f"{type(error).__name__}: {error}")), protocol=5)
+    try:
+        conn.send_bytes(data)
+    finally:
+        conn.close()
+
+
+def _exit_reason(exitcode: Optional[int], memory_mb: Optional[int], cpu_seconds: Optional[int]) -> str:
+    if exitcode == -signal.SIGKILL:
+        return f"süreç öldürüldü (bellek {memory_mb}MB / CPU {cpu_seconds}s sınırı)"
+    if hasattr(signal, "SIGXCPU") and exitcode == -signal.SIGXCPU:
+        return f"CPU süresi sınırı aşıldı ({cpu_seconds}s)"
+    return f"süreç beklenmedik şekilde sonlandı (exitcode={exitcode})"
+
+
+def run_sandboxed_sync(func: Callable, *args, timeout: Optional[float] = None,
+                       memory_mb: Optional[int] = None, cpu_seconds: Optional[int] = None, **kwargs) -> Any:
+    """Senkron: işi yeni bir sandbox sürecinde çalıştırır ve sonucunu döndürür (executor thread'inde)"""
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    name = getattr(func, "__name__", "job")
+    proc = ctx.Process(
+        target=_sandbox_worker,
+        args=(sender, func, args, kwargs, memory_mb, cpu_seconds),
+        name=f"kova-sandbox-{name}",
+        daemon=True,
+    )
+    proc.start()
+    sender.close()  # süreç ölürse recv EOF görsün
+
+    try:
+        if not receiver.poll(timeout):
+            raise SandboxTimeout(f"{name}: {timeout}s içinde bitmedi, süreç öldürüldü")
+        try:
+            status, value = pickle.loads(receiver.recv_bytes())
+        except EOFError:
+            proc.join(JOIN_SECONDS)
+            raise SandboxError(f"{name}: {_exit_reason(proc.exitcode, memory_mb, cpu_seconds)}") from None
+    finally:
+        receiver.close()
+        if proc.is_alive():
+            proc.kill()
+        proc.join(JOIN_SECONDS)
+
+    if status == "error":
+        raise value
+    return value
+
+
+async def run_job(func: Callable, *args, **kwargs) -> Any:
+    """
+    Ayrıştırma / birleştirme işini PARSE_BACKEND'e göre çalıştırır.
+    process: sandbox süreç (SANDBOX_* limitleri), thread: varsayılan executor (limit yok).
+    func ve argümanları pickle edilebilir olmalı (modül seviyesinde fonksiyon).
+    """
+    loop = asyncio.get_running_loop()
+    bot = config.bot
+    if (bot.PARSE_BACKEND or BACKEND_THREAD).lower() != BACKEND_PROCESS:
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(1, bot.SANDBOX_PROCESSES))
+
+    async with _slots:
+        try:
+            return await loop.run_in_executor(None, functools.partial(
+                run_sandboxed_sync, func, *args,
+                timeout=bot.SANDBOX_TIMEOUT_SECONDS or None,
+                memory_mb=bot.SANDBOX_MEMORY_MB or None,
+                cpu_seconds=bot.SANDBOX_CPU_SECONDS or None,
+                **kwargs))
+        except SandboxError as e:
+            logger.error(f"🧱 Sandbox işi durduruldu: {e}")
+            raise
@@ -13,6 +13,7 @@ Revize Tarihi: 20-11-2025
 
 from typing import Dict, List, Any
 from datetime import datetime
+from config import config
 from utils.group_manager import group_manager
 from utils.logger import logger 
 
@@ -78,10 +79,13 @@ def generate_processing_report(
         
         # YENİ: Tüm işlenen şehirleri topla
         all_cities = set()
+        city_rows: Dict[str, int] = {}  # şehir → satır (şehrin tüm satırları her grubuna gider → max)
         for group_id, file_info in output_files.items():
             cities = file_info.get("cities", [])
             if isinstance(cities, list):
                 all_cities.update(cities)
+            for city, count in (file_info.get("city_counts") or {}).items():
+                city_rows[city] = max(city_rows.get(city, 0), count)
         
         city_count = len(all_cities)
         cities_list = sorted(list(all_cities))
@@ -103,7 +107,10 @@ def generate_processing_report(
                 "group_id": group_id,
                 "group_name": group_id,
                 "filename": file_info.get("filename", ""),
-                "row_count": file_info.get("row_count", 0)
+                "row_count": file_info.get("row_count", 0),
+                "same_as": file_info.get("same_as"),  # aynı içerikli dosya tekrar yazılmadı
+                "part_count": len(file_info.get("parts") or [None]),
+                "sheet_count": len(file_info.get("sheets") or [None]),
             })
         
         # -------------------------------------------------
@@ -123,11 +130,20 @@ def generate_processing_report(
         # -------------------------------------------------
         # 5) İSTATİSTİKLER (HER İKİ RAPOR İÇİN)
         # -------------------------------------------------
+        unparsed_dates = result.get("unparsed_dates", 0)
         report_lines.extend([
             f"📊  İstatistikler:",
             f"• Excel (input) satır: {total_rows}",
             f"• Oluşan grup dosyası: {len(groups_list)}",
             f"• Dosyadaki il sayısı: {city_count}",
+        ])
+        if unparsed_dates:
+            report_lines.append(f"• Tarihe çevrilemeyen TARİH hücresi: {unparsed_dates}")
+        invalid_tc = result.get("invalid_tc", 0)
+        if invalid_tc:
+            dropped = " (gruplamaya alınmadı)" if config.bot.TC_CHECKSUM_FILTER else ""
+            report_lines.append(f"• Geçersiz TC (sağlama hatası): {invalid_tc}{dropped}")
+        report_lines.extend([
             "",
             f"📧  Mail Gönderim: ({mail_stats.get('total', 0)} tane)",
             f"• Grup | Input : {mail_stats.get('by_type', {}).get('group_sent', 0)} | {mail_stats.get('by_type', {}).get('input_sent', 0)}",
@@ -138,9 +154,12 @@ def generate_processing_report(
         # 6) TELEGRAM RAPORU İÇİN EKSTRA
         # -------------------------------------------------
         if for_internal_message:
+            cities_text = ", ".join(
+                f"{city} ({city_rows[city]})" if city in city_rows else str(city) for city in cities_list
+            )
             report_lines.extend([
                 f"• Personal: {mail_stats.get('by_type', {}).get('personal_sent', 0)}",
-                f"• Dosyadaki iller: {', '.join(cities_list) if cities_list else 'Yok'}",
+                f"• Dosyadaki iller: {cities_text or 'Yok'}",
             ])
 
         # -------------------------------------------------
@@ -166,9 +185,15 @@ def generate_processing_report(
         report_lines.append(f"📁  Grup Dosyaları: ({len(groups_list)} tane)")
         
         for g in groups_list:
+            same_as = f" = {g['same_as']}" if g.get("same_as") else ""
+            split = ""
+            if g.get("part_count", 1) > 1:
+                split = f" [{g['part_count']} dosya]"
+            elif g.get("sheet_count", 1) > 1:
+                split = f" [{g['sheet_count']} sayfa]"
             report_lines.append(
                 f"• {g.get('group_name', g.get('group_id'))}: "
-                f"{g.get('filename')} ({g.get('row_count', 0)} satır)"
+                f"{g.get('filename')} ({g.get('row_count', 0)} satır){split}{same_as}"
             )
         
         # -------------------------------------------------
@@ -0,0 +1,108 @@
+# utils/sheet_rollover.py
+"""
+Excel satır sınırında otomatik sayfa / dosya devri (roll-over)
+
+Bir sayfa en fazla 1.048.576 satır alır (başlık dahil). Büyük bir grup
+(örn. ülke geneli yüklemede grup_0) bu sınırı aşınca:
+- "sheet" modu: aynı dosyada Veriler, Veriler_2, Veriler_3 ... sayfaları açılır
+- "file" modu: <dosya>_part2.xlsx, <dosya>_part3.xlsx ... ek dosyaları açılır
+Her yeni sayfa/dosya başlık satırıyla başlar.
+
+Satırlar constant_memory modunda sırayla yazılır; dolan sayfaya geri dönülmez.
+"file" modunda dolan part dosyası hemen kapatılır (aynı anda tek workbook açık).
+"sheet" modunda biten sayfaların geçici dosyaları workbook kapanana kadar açık kalır;
+bu sayfalar MAX_OPEN_WRITERS sayımına girmez.
+Modül config/logger import etmez (writer süreçlerinde de kullanılır).
+"""
+
+from pathlib import Path
+from typing import List, Tuple
+
+import xlsxwriter
+
+EXCEL_MAX_ROWS = 1_048_576
+SHEET_NAME_MAX_LEN = 31
+
+ROLLOVER_SHEET = "sheet"
+ROLLOVER_FILE = "file"
+
+
+def rollover_sheet_name(base: str, index: int) -> str:
+    """0 → Veriler, 1 → Veriler_2 ... (Excel'in 31 karakter sınırına göre kısaltılır)"""
+    if index == 0:
+        return base
+    suffix = f"_{index + 1}"
+    return base[:SHEET_NAME_MAX_LEN - len(suffix)] + suffix
+
+
+def rollover_part_path(file_path: Path, index: int) -> Path:
+    """0 → dosya.xlsx, 1 → dosya_part2.xlsx ..."""
+    if index == 0:
+        return file_path
+    return file_path.with_name(f"{file_path.stem}_part{index + 1}{file_path.suffix}")
+
+
+def rollover_layout(file_path: Path, sheet_name: str, data_rows: int, mode: str,
+                    max_rows: int = EXCEL_MAX_ROWS) -> Tuple[List[Path], List[str]]:
+    """data_rows satır için oluşacak (dosyalar, sayfa adları)"""
+    per_sheet = max(1, min(max_rows, EXCEL_MAX_ROWS) - 1)
+    count = max(1, -(-data_rows // per_sheet))
+    if mode == ROLLOVER_FILE:
+        return [rollover_part_path(file_path, i) for i in range(count)], [sheet_name]
+    return [file_path], [rollover_sheet_name(sheet_name, i) for i in range(count)]
+
+
+class RolloverWriter:
+    """
+    Grup çıktısı: mantıksal satır indeksi (1 = ilk veri satırı) sayfalara/dosyalara bölünür.
+    Sınır dolduğunda bir sonraki sayfa veya part dosyası açılır.
+    """
+
+    def __init__(self, file_path: Path, headers: List[str], sheet_name: str = "Veriler",
+                 mode: str = ROLLOVER_SHEET, max_rows: int = EXCEL_MAX_ROWS):
+        self.file_path = Path(file_path)
+        self.headers = list(headers)
+        self.sheet_name = sheet_name
+        self.mode = mode
+        self.per_sheet = max(1, min(max_rows, EXCEL_MAX_ROWS) - 1)
+        self.workbooks: List[xlsxwriter.Workbook] = []  # sadece açık (yazılan) workbook
+        self._part_count = 0
+        self._sheets: List = []
+        self._add_sheet()
+
+    def _add_sheet(self) -> None:
+        index = len(self._sheets)
+        if self.mode == ROLLOVER_FILE or not self.workbooks:
+            if self.workbooks:  # dolan part dosyasına bir daha yazılmaz: tanıtıcısı hemen bırakılır
+                self.workbooks.pop().close()
+            path = rollover_part_path(self.file_path, self._part_count)
+            self.workbooks.append(xlsxwriter.Workbook(str(path), {'constant_memory': True}))
+            self._part_count += 1
+            name = self.sheet_name
+        else:
+            name = rollover_sheet_name(self.sheet_name, index)
+
+        ws = self.workbooks[-1].add_worksheet(name)
+        ws.write_row(0, 0, self.headers)
+        ws.set_column(0, len(self.headers) - 1, 15)
+        self._sheets.append(ws)
+
+    def write_rows(self, start_index: int, rows: List[tuple]) -> None:
+        """start_index: ilk satırın mantıksal indeksi (1'den başlar)"""
+        offset = 0
+        while offset < len(rows):
+            sheet_index, row_in_sheet = divmod(start_index + offset - 1, self.per_sheet)
+            while sheet_index >= len(self._sheets):
+                self._add_sheet()
+
+            ws = self._sheets[sheet_index]
+            take = min(len(rows) - offset, self.per_sheet - row_in_sheet)
+            for i in range(take):
+                ws.write_row(row_in_sheet + 1 + i, 0, rows[offset + i])
+            offset += take
+
+    def close(self) -> None:
+        """Açık workbook'u (file modunda son part) kapatır"""
+        workbooks, self.workbooks = self.workbooks, []
+        for wb in workbooks:
+            wb.close()
@@ -0,0 +1,97 @@
+# utils/spill_store.py
+"""
+Soğuk grup satırları için diskteki run dosyaları (ExcelSplitter)
+
+Yüzlerce grup olduğunda her gruba açık bir xlsxwriter workbook'u tutmak
+dosya tanıtıcı (file descriptor) ve bellek sınırlarına takılır.
+Açık workbook sınırı dolunca yeni gruplar satırlarını buraya yazar:
+- Her grup için bir run dosyası; her batch pickle kaydı olarak sona eklenir
+- Run dosyası tanıtıcıları LRU ile sınırlıdır; en eski tanıtıcı kapatılır,
+  grup tekrar yazınca dosya "ab" ile yeniden açılır
+- Çalışma sonunda her grubun workbook'u run dosyasından tek tek kurulur (assemble)
+
+Tüm metotlar senkrondur; ExcelSplitter bunları threadpool'da sırayla çağırır.
+"""
+
+import itertools
+import pickle
+import shutil
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List
+
+
+class SpillRunStore:
+    """Grup başına run dosyası, açık tanıtıcı sayısı max_handles ile sınırlı"""
+
+    def __init__(self, temp_dir: Path, max_handles: int):
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        self._dir = Path(tempfile.mkdtemp(prefix="kova_spill_", dir=temp_dir))
+        self._max_handles = max(1, max_handles)
+        self._handles: "OrderedDict[str, BinaryIO]" = OrderedDict()
+        self._paths: Dict[str, Path] = {}
+        self._file_ids = itertools.count()  # discard sonrası da dosya adları çakışmaz
+        self.peak_handles = 0
+
+    def __contains__(self, group_id: str) -> bool:
+        return group_id in self._paths
+
+    def _handle(self, group_id: str) -> BinaryIO:
+        fh = self._handles.get(group_id)
+        if fh is not None:
+            self._handles.move_to_end(group_id)
+            return fh
+
+        while len(self._handles) >= self._max_handles:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+
+        self.register(group_id)
+        fh = open(self._paths[group_id], "ab")
+        self._handles[group_id] = fh
+        self.peak_handles = max(self.peak_handles, len(self._handles))
+        return fh
+
+    def register(self, group_id: str) -> None:
+        """Grubu run dosyasına yönlendirir (henüz satır yazılmadan)"""
+        if group_id not in self._paths:
+            self._paths[group_id] = self._dir / f"{next(self._file_ids):05d}.run"
+
+    def append(self, group_id: str, rows: List[tuple]) -> None:
+        pickle.dump(rows, self._handle(group_id), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def iter_batches(self, group_id: str) -> Iterator[List[tuple]]:
+        """Grubun batch'lerini yazıldığı sırayla okur"""
+        fh = self._handles.pop(group_id, None)
+        if fh is not None:
+            fh.close()
+
+        path = self._paths.get(group_id)
+        if path is None or not path.exists():
+            return
+
+        with open(path, "rb") as run:
+            while True:
+                try:
+                    yield pickle.load(run)
+                except EOFError:
+                    return
+
+    def discard(self, group_id: str) -> None:
+        fh = self._handles.pop(group_id, None)
+        if fh is not None:
+            fh.close()
+        path = self._paths.pop(group_id, None)
+        if path is not None and path.exists():
+            path.unlink()
+
+    def cleanup(self) -> None:
+        for fh in self._handles.values():
+            try:
+                fh.close()
+            except Exception:
+                pass
+        self._handles.clear()
+        self._paths.clear()
+        shutil.rmtree(self._dir, ignore_errors=True)
@@ -0,0 +1,72 @@
+# utils/tc_kimlik.py
+"""
+TC Kimlik numarası: int64 anahtar + vektörel sağlama (checksum) kontrolü
+
+TC'ler str olarak taşınınca her anahtar ayrı bir Python str nesnesidir ve eşleştirme /
+tekrar silme metin karşılaştırmasıyla yapılır. Burada TC bir kez int64'e çevrilir
+(anahtar başına 8 bayt); eşleştirme ve tekrar silme tamsayılar üzerinde çalışır.
+- tc_int_key / tc_int_keys: TC biçimindeki değer (11 hane, 0 ile başlamaz) → int,
+  diğerleri TC_NO_KEY (0); çağıran bunları eski (str) yolla işler
+- tc_checksum_valid(keys): 10. ve 11. hane numpy aritmetiğiyle doğrulanır
+    d10 = ((d1 + d3 + d5 + d7 + d9) * 7 - (d2 + d4 + d6 + d8)) mod 10
+    d11 = (d1 + ... + d10) mod 10
+"""
+
+import re
+from typing import Any, Iterable
+
+import numpy as np
+
+TC_NO_KEY = 0
+TC_MIN, TC_MAX = 10 ** 10, 10 ** 11 - 1
+_TC_TEXT_RE = re.compile(r"[1-9][0-9]{10}")
+
+
+def tc_int_key(value: Any) -> int:
+    """Tek değer: TC biçimindeyse int, değilse TC_NO_KEY (metin olduğu gibi, boşluksuz olmalı)"""
+    if isinstance(value, bool):
+        return TC_NO_KEY
+    if isinstance(value, int):
+        return value if TC_MIN <= value <= TC_MAX else TC_NO_KEY
+    if isinstance(value, float):
+        return int(value) if value.is_integer() and TC_MIN <= value <= TC_MAX else TC_NO_KEY
+    if isinstance(value, str) and _TC_TEXT_RE.fullmatch(value):
+        return int(value)
+    return TC_NO_KEY
+
+
+def tc_int_keys(values: Iterable[Any]) -> np.ndarray:
+    """Sütun → int64 anahtarlar (TC biçiminde olmayan: TC_NO_KEY)"""
+    return np.fromiter((tc_int_key(value) for value in values), dtype=np.int64)
+
+
+def tc_checksum_valid(keys: np.ndarray) -> np.ndarray:
+    """int64 anahtarlar → geçerli TC maskesi (aralık dışı / TC_NO_KEY geçersiz)"""
+    keys = np.asarray(keys, dtype=np.int64)
+    valid = (keys >= TC_MIN) & (keys <= TC_MAX)
+    rest = np.where(valid, keys, TC_MIN)
+
+    last = rest % 10  # d11
+    rest = rest // 10
+    tenth = rest % 10  # d10
+    rest = rest // 10
+
+    odd = np.zeros_like(rest)   # d1 + d3 + d5 + d7 + d9
+    even = np.zeros_like(rest)  # d2 + d4 + d6 + d8
+    for position in range(9, 0, -1):  # d9 → d1
+        digit = rest % 10
+        rest = rest // 10
+        if position % 2:
+            odd += digit
+        else:
+            even += digit
+
+    valid &= (odd * 7 - even) % 10 == tenth
+    valid &= (odd + even + tenth) % 10 == last
+    return valid
+
+
+def is_valid_tc(value: Any) -> bool:
+    """Tek değer için biçim + sağlama kontrolü"""
+    key = tc_int_key(value)
+    return key != TC_NO_KEY and bool(tc_checksum_valid(np.array([key], dtype=np.int64))[0])
@@ -11,10 +11,33 @@ ham + tel
 ↓>> sgk2  (İL düzenler + TC validasyonu + satır- sutun temizler)
 >> excel_process (gruplama / mail / rapor)
 
+Merge motoru (MERGE_ENGINE): "streaming" (tel dosyasından TC → GSM indeksi, ham satırları
+akış halinde) | "pandas" (iki dosya da DataFrame'e okunur). Sonuç aynı left-merge'dür.
+Streaming motorda tel indeksi içerik özetine göre diskte saklanır (utils/tel_index_cache);
+aynı tel dosyası tekrar yüklenince ayrıştırılmaz.
+
+SGK_PIPELINE="memory": build_sgk_session merge + İL + TC temizliğini bellekte yapar,
+sonucu WorkbookSession olarak excel_process'e verir (sgk1/sgk2.xlsx sadece istenirse yazılır).
+
 """
+import itertools
+import re
+from array import array
+
+import numpy as np
 import pandas as pd
+import xlsxwriter
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config import config
+from utils.city_matcher import CityMatcher, fold_turkish
+from utils.logger import logger
+from utils.tc_kimlik import TC_NO_KEY, tc_checksum_valid, tc_int_key, tc_int_keys
+from utils.tel_index_cache import CachedIndex, TelIndexCache, file_digest
+from utils.workbook_session import WorkbookSession
+from utils.xlsx_reader import open_workbook, real_bounds
 
 # -------------------------------------------------
 # işlem-1 → dosya1(ham)  ile dosya2(tel)  arasında eşleştirme yapılır İL-TC-GSM oluşur
@@ -22,10 +45,10 @@ from typing import List
 # -------------------------------------------------
 # 1) Excel oku – normalize ve tekrar eden kolonları düzelt
 # -------------------------------------------------
-def normalize_and_deduplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
+def _deduplicate_names(columns) -> List[str]:
     new_cols = []
     seen = {}
-    for c in df.columns:
+    for c in columns:
         col = str(c).strip()
         if not col:
             col = "auto"
@@ -35,7 +58,10 @@ def normalize_and_deduplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
         else:
             seen[col] = 1
         new_cols.append(col)
-    df.columns = new_cols
+    return new_cols
+
+def normalize_and_deduplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = _deduplicate_names(df.columns)
     return df
 
 def read_excel_smart(path: Path) -> pd.DataFrame:
@@ -46,18 +72,33 @@ def read_excel_smart(path: Path) -> pd.DataFrame:
 # -------------------------------------------------
 # 2) Kolon bulucu (case/space insensitive)
 # -------------------------------------------------
-def find_col(df: pd.DataFrame, name: str) -> str:
+def _find_name(columns, name: str) -> str:
     name = name.strip().upper()
-    for c in df.columns:
+    for c in columns:
         if str(c).strip().upper() == name:
             return c
     raise ValueError(f"Zorunlu kolon bulunamadı: {name}")
 
+def find_col(df: pd.DataFrame, name: str) -> str:
+    return _find_name(df.columns, name)
+
 # -------------------------------------------------
 # 3) ANA MERGE (TC ASLA SİLİNMEZ)
 # TC referans alır, tel eşleştirmesi yapar
 # -------------------------------------------------
+MERGE_ENGINE_STREAMING = "streaming"
+MERGE_ENGINE_PANDAS = "pandas"
+
 def build_merged_excel(ham_dosya: Path, tel_dosya: Path, output_path: Path) -> Path:
+    engine = (config.bot.MERGE_ENGINE or MERGE_ENGINE_STREAMING).lower()
+    if engine == MERGE_ENGINE_STREAMING:
+        try:
+            return _build_merged_excel_streaming(ham_dosya, tel_dosya, output_path)
+        except _NeedsPandasMerge as e:
+            logger.warning(f"⚠️ Streaming merge pandas motoruna düştü: {e}")
+    return _build_merged_excel_pandas(ham_dosya, tel_dosya, output_path)
+
+def _build_merged_excel_pandas(ham_dosya: Path, tel_dosya: Path, output_path: Path) -> Path:
     df_ham = read_excel_smart(ham_dosya)
     df_tel = read_excel_smart(tel_dosya)
 
@@ -100,32 +141,326 @@ def build_merged_excel(ham_dosya: Path, tel_dosya: Path, output_path: Path) -> P
 
 
 # -------------------------------------------------
-# işlem-2 → City/İL düzenleme kovaya tam uyumu yapı
+# 3b) STREAMING MERGE (hash join)
+# tel dosyasından sadece TC → TEL indeksi kurulur; ham satırları okundukça indeksten
+# geçirilip yazılır. Bellek tel dosyasının anahtar sayısıyla büyür, ham dosyanın boyutuyla değil.
+# pandas merge ile aynı sonuç için read_excel davranışı taklit edilir:
+# - 1. satır başlıktır; boş başlık "Unnamed: i", tekrarlar ".1" (sonra read_excel_smart düzeltmesi)
+# - aradaki boş satırlar korunur (TC'si "nan" olur), sondaki boş satırlar atılır
+# - NA metinleri ("NULL", "N/A" ...) ve hata hücreleri boş, tam sayı float'lar int
+# - tekrar eden tel anahtarında her eşleşme ayrı satır (tel sırasıyla); eksik TC'ler "nan" anahtarında eşleşir
+# Birebir taklit edilemeyen durumlarda (_NeedsPandasMerge) pandas motoruna düşülür.
 # -------------------------------------------------
+EXCEL_MAX_ROWS = 1_048_576
+
+# pandas read_excel varsayılan na_values + Excel hata hücreleri (native okuyucu metin döndürür)
+_NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    "#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!",
+})
+_TRAILING_ZERO_RE = re.compile(r"\.0$")
+_INT_TEXT_RE = re.compile(r"[+-]?\d+")
+_FLOAT_TEXT_RE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+
+class _NeedsPandasMerge(Exception):
+    """Streaming motorun pandas sonucunu birebir üretemediği girdi"""
+
+
+class _Matches(list):
+    """Tekrar eden tel anahtarının TEL değerleri (tel dosyasındaki sırayla)"""
+
+
+def _cell(value: Any) -> Any:
+    """pandas hücre dönüşümü: NA metni → None, tam sayı float → int"""
+    if isinstance(value, str):
+        return None if value in _NA_STRINGS else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _tc_key(value: Any) -> str:
+    """astype(str) + ".0" temizliği + strip; eksik TC pandas'taki gibi "nan" olur"""
+    if value is None:
+        return "nan"
+    if not isinstance(value, str):
+        return _TRAILING_ZERO_RE.sub("", str(value)).strip()
+
+    key = _TRAILING_ZERO_RE.sub("", value).strip()
+    text = value.strip()
+    if _INT_TEXT_RE.fullmatch(text):
+        numeric = str(int(text))
+    elif _FLOAT_TEXT_RE.fullmatch(text):
+        numeric = _TRAILING_ZERO_RE.sub("", str(float(text)))
+    else:
+        return key
+    if numeric != key:
+        # pandas tamamı sayısal olan sütunu sayıya çevirir ("0123" → 123); sütunun tamamı görülmeden bilinemez
+        raise _NeedsPandasMerge(f"TC değeri {value!r} metin/sayı olarak farklı anahtar verir")
+    return key
+
+def _frame_names(header: Sequence[Any], width: int) -> List[str]:
+    """read_excel + read_excel_smart ile aynı sütun adları"""
+    names = []
+    for i in range(width):
+        value = header[i] if i < len(header) else None
+        if value is None or value == "":
+            value = f"Unnamed: {i}"
+        elif isinstance(value, float) and value.is_integer():
+            value = int(value)
+        names.append(value)
+
+    # pandas tekrar eki: x, x.1, x.2
+    counts: Dict[Any, int] = {}
+    for i, name in enumerate(names):
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return _deduplicate_names(names)
+
+def _iter_frame_rows(rows: Iterator[tuple], width: int) -> Iterator[List[Any]]:
+    """Veri satırları (genişliğe tamamlanmış); boş satırlar sonrasında veri gelirse yazılır"""
+    blank = 0
+    for row in rows:
+        if all(value is None or value == "" for value in row):
+            blank += 1
+            continue
+        for _ in range(blank):
+            yield [None] * width
+        blank = 0
+        cells = [_cell(value) for value in row[:width]]
+        if len(cells) < width:
+            cells.extend([None] * (width - len(cells)))
+        yield cells
+
+def _open_frame(path: Path) -> Tuple[Any, List[str], Iterator[List[Any]]]:
+    """(workbook, sütun adları, veri satırları); aktif sayfa gerçek sınırlarında okunur"""
+    wb = open_workbook(path)
+    ws = wb.active
+    bounds = real_bounds(ws)
+    rows = ws.iter_rows(values_only=True) if bounds.max_row else iter(())
+    header = next(rows, None)
+    width = bounds.max_column or 0
+    if header is None or not width:
+        return wb, [], iter(())
+    return wb, _frame_names(header, width), _iter_frame_rows(rows, width)
+
+class _TelIndex:
+    """
+    TC → TEL indeksi. TC biçimindeki anahtarlar int64 dizide (sıralı, anahtar başına 8 bayt),
+    diğerleri ("nan", metin) str sözlükte; metin anahtar eşitliği aynen korunur.
+    """
+
+    def __init__(self):
+        self._int_keys = array("q")
+        self._values: List[Any] = []
+        self._other: Dict[str, Any] = {}
+        self._sorted = np.empty(0, dtype=np.int64)
+        self.key_count = 0
+
+    def add(self, key: str, value: Any) -> None:
+        int_key = tc_int_key(key)
+        if int_key != TC_NO_KEY:
+            self._int_keys.append(int_key)
+            self._values.append(value)
+        elif key not in self._other:
+            self._other[key] = value
+        elif isinstance(self._other[key], _Matches):
+            self._other[key].append(value)
+        else:
+            self._other[key] = _Matches((self._other[key], value))
+
+    def freeze(self) -> None:
+        """Anahtarları sıralar (kararlı: tekrar eden anahtarda tel sırası korunur)"""
+        keys = np.frombuffer(self._int_keys, dtype=np.int64) if len(self._int_keys) else np.empty(0, np.int64)
+        order = np.argsort(keys, kind="stable")
+        self._sorted = keys[order]
+        self._values = [self._values[i] for i in order.tolist()]
+        self._int_keys = array("q")
+        self.key_count = len(np.unique(self._sorted)) + len(self._other)
+
+    def to_cache(self) -> Tuple[np.ndarray, List[Any], Dict[str, Any]]:
+        """freeze sonrası: (sıralı anahtarlar, değerler, meta) → TelIndexCache.store"""
+        other = {key: list(value) if isinstance(value, _Matches) else [value] for key, value in self._other.items()}
+        return self._sorted, self._values, {"other": other, "key_count": self.key_count}
+
+    @classmethod
+    def from_cache(cls, cached: CachedIndex) -> "_TelIndex":
+        """Önbellek kaydı → indeks; anahtarlar memmap, değerler eşleştikçe çözülür"""
+        index = cls()
+        index._sorted = cached.keys
+        index._values = cached.values
+        index._other = {key: _Matches(values) if len(values) > 1 else values[0]
+                        for key, values in cached.meta["other"].items()}
+        index.key_count = cached.meta["key_count"]
+        return index
+
+    def lookup(self, keys: List[str]) -> List[Any]:
+        """Anahtarlar → eşleşme (değer, _Matches veya None); TC anahtarları tek searchsorted ile"""
+        int_keys = tc_int_keys(keys)
+        left = np.searchsorted(self._sorted, int_keys, side="left").tolist()
+        right = np.searchsorted(self._sorted, int_keys, side="right").tolist()
+        found = []
+        for key, int_key, lo, hi in zip(keys, int_keys.tolist(), left, right):
+            if int_key == TC_NO_KEY:
+                found.append(self._other.get(key))
+            elif hi - lo == 1:
+                found.append(self._values[lo])
+            elif hi > lo:
+                found.append(_Matches(self._values[lo:hi]))
+            else:
+                found.append(None)
+        return found
+
+def _parse_tel_index(tel_dosya: Path) -> Tuple[str, str, _TelIndex]:
+    """(TC adı, TEL adı, TC → TEL indeksi); tekrar eden anahtarda değerler _Matches listesinde"""
+    wb, names, rows = _open_frame(tel_dosya)
+    try:
+        tel_tc = _find_name(names, "TC")
+        tel_col = _find_name(names, "TEL")
+        tc_pos, tel_pos = names.index(tel_tc), names.index(tel_col)
+
+        index = _TelIndex()
+        for row in rows:
+            index.add(_tc_key(row[tc_pos]), row[tel_pos])
+        index.freeze()
+    finally:
+        wb.close()
+    return tel_tc, tel_col, index
+
+def _tel_index_cache() -> Optional[TelIndexCache]:
+    """TEL_INDEX_CACHE_MB > 0 ise data/cache/tel_index önbelleği"""
+    if config.bot.TEL_INDEX_CACHE_MB <= 0:
+        return None
+    try:
+        return TelIndexCache(config.paths.CACHE_DIR / "tel_index", config.bot.TEL_INDEX_CACHE_MB * 1024 * 1024)
+    except OSError as e:
+        logger.warning(f"⚠️ Tel indeks önbelleği kullanılamıyor: {e}")
+        return None
+
+def _build_tel_index(tel_dosya: Path) -> Tuple[str, str, _TelIndex]:
+    """_parse_tel_index; aynı içerikli tel dosyası daha önce indekslendiyse önbellekten (ayrıştırma yok)"""
+    cache = _tel_index_cache()
+    if cache is None:
+        return _parse_tel_index(tel_dosya)
+
+    digest = file_digest(tel_dosya)
+    cached = cache.load(digest)
+    if cached is not None:
+        logger.info(f"🗃️ Tel indeksi önbellekten: {Path(tel_dosya).name} ({cached.meta['key_count']} anahtar)")
+        return cached.meta["tel_tc"], cached.meta["tel_col"], _TelIndex.from_cache(cached)
+
+    tel_tc, tel_col, index = _parse_tel_index(tel_dosya)
+    keys, values, meta = index.to_cache()
+    cache.store(digest, keys, values, {**meta, "tel_tc": tel_tc, "tel_col": tel_col})
+    return tel_tc, tel_col, index
+
+@contextmanager
+def _merged_rows(ham_dosya: Path, tel_dosya: Path) -> Iterator[Tuple[List[str], Iterator[List[Any]], int]]:
+    """(sütun adları, birleştirilmiş satırlar, tel indeksi anahtar sayısı); ham satırları okundukça üretilir"""
+    ham_wb, ham_names, ham_rows = _open_frame(ham_dosya)
+    try:
+        ham_tc = _find_name(ham_names, "TC")
+        tel_tc, tel_col, index = _build_tel_index(tel_dosya)
+        if tel_tc != ham_tc or tel_col in ham_names:
+            # pandas burada "_TEL" son ekli sütunlar üretir; o düzen pandas motoruna bırakılır
+            raise _NeedsPandasMerge(f"sütun adları çakışıyor (ham: {ham_tc}, tel: {tel_tc}/{tel_col})")
+
+        # GSM'yi TC yanına koy (ham'da GSM varsa yerinde değiştirilir)
+        tc_pos = ham_names.index(ham_tc)
+        headers = list(ham_names)
+        insert_gsm = "GSM" not in headers
+        if insert_gsm:
+            gsm_pos = tc_pos + 1
+            headers.insert(gsm_pos, "GSM")
+        else:
+            gsm_pos = headers.index("GSM")
+
+        def rows() -> Iterator[List[Any]]:
+            chunk_size = max(1, config.bot.CHUNK_SIZE)
+            while True:
+                chunk = list(itertools.islice(ham_rows, chunk_size))
+                if not chunk:
+                    break
+                keys = [_tc_key(row[tc_pos]) for row in chunk]
+                for row, key, found in zip(chunk, keys, index.lookup(keys)):
+                    row[tc_pos] = key
+                    for gsm in (found if isinstance(found, _Matches) else (found,)):
+                        if insert_gsm:
+                            yield row[:gsm_pos] + [gsm] + row[gsm_pos:]
+                        else:
+                            merged = list(row)
+                            merged[gsm_pos] = gsm
+                            yield merged
+
+        yield headers, rows(), index.key_count
+    finally:
+        ham_wb.close()
+
+class _SheetWriter:
+    """Tek sayfalık xlsx yazıcı (pandas to_excel düzeni: Sheet1, başlık + değerler); satır satır yazar"""
+
+    def __init__(self, output_path: Path, headers: List[str]):
+        self._workbook = xlsxwriter.Workbook(str(output_path), {
+            "constant_memory": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",  # pandas to_excel tarih biçimi
+        })
+        self._ws = self._workbook.add_worksheet()
+        self._ws.write_row(0, 0, headers)
+        self.row_count = 0
+
+    def write(self, row: Sequence[Any]) -> None:
+        self.row_count += 1
+        if self.row_count >= EXCEL_MAX_ROWS:
+            raise ValueError(f"Satır sayısı Excel sınırını aşıyor ({EXCEL_MAX_ROWS})")
+        self._ws.write_row(self.row_count, 0, row)
+
+    def passthrough(self, rows: Iterator[Sequence[Any]]) -> Iterator[Sequence[Any]]:
+        """Satırları yazarken aynen geçirir (tek geçişte hem dosya hem tüketici)"""
+        for row in rows:
+            self.write(row)
+            yield row
+
+    def close(self) -> None:
+        self._workbook.close()
+
+def _write_xlsx(output_path: Path, headers: List[str], rows) -> int:
+    """Satırları tek sayfaya yazar; satır sayısı döner"""
+    writer = _SheetWriter(output_path, headers)
+    try:
+        for row in rows:
+            writer.write(row)
+    finally:
+        writer.close()
+    return writer.row_count
+
+def _build_merged_excel_streaming(ham_dosya: Path, tel_dosya: Path, output_path: Path) -> Path:
+    with _merged_rows(ham_dosya, tel_dosya) as (headers, rows, key_count):
+        row_count = _write_xlsx(output_path, headers, rows)
+    logger.info(f"🔗 Streaming merge: {row_count} satır, tel indeksi {key_count} anahtar → {Path(output_path).name}")
+    return output_path
 
-import re
-import unicodedata
+
+# -------------------------------------------------
+# işlem-2 → City/İL düzenleme kovaya tam uyumu yapı
+# -------------------------------------------------
 
 class CityProcessor:
     _CITY_DICT = None
     _CITY_REGEX = None
+    _CITY_MATCHER = None
 
     @staticmethod
     def normalize_turkish(text: str) -> str:
+        # İ/ı, lower, NFKD, ş/ç/ü/ö/ğ → tek str.translate tablosu (utils/city_matcher)
         if not isinstance(text, str):
             return ""
-
-        text = text.replace("İ", "I").replace("ı", "i").lower()
-        text = unicodedata.normalize("NFKD", text)
-        text = "".join(c for c in text if not unicodedata.combining(c))
-
-        return (
-            text.replace("ş", "s")
-                .replace("ç", "c")
-                .replace("ü", "u")
-                .replace("ö", "o")
-                .replace("ğ", "g")
-        )
+        return fold_turkish(text)
 
     @classmethod
     def get_city_dict(cls):
@@ -157,6 +492,18 @@ class CityProcessor:
             cls._CITY_REGEX = re.compile(pattern)
         return cls._CITY_REGEX
 
+    @classmethod
+    def get_city_matcher(cls) -> CityMatcher:
+        # get_city_regex ile aynı eşleşme; Aho-Corasick + ham metin önbelleği
+        if cls._CITY_MATCHER is None:
+            cls._CITY_MATCHER = CityMatcher(cls.get_city_dict())
+        return cls._CITY_MATCHER
+
+    @classmethod
+    def match_cities(cls, values) -> List[Optional[str]]:
+        """Sütun → şehir adları (bulunamayan: None); tekrar eden hücre bir kez çözülür"""
+        return cls.get_city_matcher().match_column(values)
+
 def process_city_il_eski(input_file: Path, output_file: Path):
     df = pd.read_excel(input_file)
 
@@ -245,12 +592,8 @@ def process_city_il(input_file: Path, output_file: Path):
     if "İL" not in df.columns:
         df.insert(df.columns.get_loc("City") + 1, "İL", "")
 
-    city_dict = CityProcessor.get_city_dict()
-    city_regex = CityProcessor.get_city_regex()
-
-    city_norm = df["City"].astype(str).map(CityProcessor.normalize_turkish)
-    found = city_norm.str.extract(city_regex, expand=False)
-    df["İL"] = found.map(city_dict)
+    found = CityProcessor.match_cities(df["City"].astype(str))
+    df["İL"] = pd.Series(found, index=df.index, dtype=object)
     df["İL"] = df["İL"].ffill().infer_objects(copy=False)
 
     if "City" in df.columns:
@@ -259,6 +602,7 @@ def process_city_il(input_file: Path, output_file: Path):
     # 2- TC Geçersiz Satırları Sil
     tc_col = "TC" 
     df = df[df[tc_col].notna() & (df[tc_col].astype(str).str.strip() != "") & (df[tc_col].astype(str).str.lower() != "nan")]
+    tc_valid = tc_checksum_valid(tc_int_keys(df[tc_col].tolist()))
 
     # =================================================
     # 🔥 SIRALAMA VE TEMİZLİK MANTIĞI
@@ -285,16 +629,208 @@ def process_city_il(input_file: Path, output_file: Path):
 
     # 4. Final Temizlik
     df = df.loc[:, ~df.columns.str.startswith("Unnamed")]
-    df = df.drop_duplicates(subset=["TC"], keep="first")
+    unique = ~df.duplicated(subset=["TC"], keep="first").to_numpy()
+    df = df[unique]
+    tc_valid = tc_valid[unique]
+
+    # 5. TC sağlama (checksum) kontrolü: sayılır, TC_CHECKSUM_FILTER açıksa satır silinir
+    invalid_tc = int((~tc_valid).sum())
+    if config.bot.TC_CHECKSUM_FILTER:
+        df = df[tc_valid]
 
     # Kaydet
     df.to_excel(output_file, index=False)
     print(f"✅ İşlem ve Özel Sıralama Tamamlandı → {output_file}")
+    return invalid_tc
     
 
 
 
 
+# -------------------------------------------------
+# işlem-1 + işlem-2 bellekte (SGK_PIPELINE="memory")
+# sgk1.xlsx yazılıp pd.read_excel ile geri okunmaz, sgk2.xlsx excel_process'te tekrar ayrıştırılmaz:
+# birleştirilmiş tablo bellekte kalır, process_city_il adımları sütunlar üzerinde uygulanır ve
+# sonuç WorkbookSession olarak gruplamaya verilir.
+# Dosya akışıyla aynı sonuç için ara xlsx'lerin etkisi taklit edilir:
+# - sgk1 okuması: NA metinleri boş, tamamı sayısal olan sütun sayıya çevrilir ("0123" → 123)
+# - sgk2 okuması: sayılar xlsx'e yazılıp okunduğu haliyle (16 anlamlı hane, tam sayı float → int)
+# -------------------------------------------------
+SGK_PIPELINE_MEMORY = "memory"
+SGK_PIPELINE_FILES = "files"
+
+_BOOL_TEXT = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+
+def _infer_column(values: List[Any]) -> List[Any]:
+    """pd.read_excel sütun çıkarımı: tamamı sayısal → sayı, tamamı mantıksal metin → bool"""
+    converted = []
+    for value in values:
+        if value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)):
+            converted.append(value)
+            continue
+        text = value.strip() if isinstance(value, str) else None
+        if text is not None and _INT_TEXT_RE.fullmatch(text):
+            converted.append(int(text))
+        elif text is not None and _FLOAT_TEXT_RE.fullmatch(text):
+            converted.append(float(text))
+        else:
+            break
+    else:
+        return converted
+    if values and all(isinstance(value, str) and value in _BOOL_TEXT for value in values):
+        return [_BOOL_TEXT[value] for value in values]
+    return values
+
+def _as_written(value: Any) -> Any:
+    """xlsxwriter sayıları %.16G yazar; native okuyucu noktasız sayıyı int okur"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    text = f"{value:.16G}"
+    return float(text) if ("." in text or "E" in text) else int(text)
+
+def _fill_cities(values: List[Any]) -> List[Any]:
+    """City → İL: şehir eşleştirici, bulunamayan satırlara üstteki il (ffill)"""
+    found = CityProcessor.match_cities("nan" if value is None else str(value) for value in values)
+    filled = []
+    last = None
+    for city in found:
+        if city is not None:
+            last = city
+        filled.append(last)
+    return filled
+
+def _unique_tc_positions(values: List[Any], candidates: List[int]) -> List[int]:
+    """
+    TC'ye göre tekrarlar (drop_duplicates keep="first"): sayısal TC'ler int64 anahtarla np.unique,
+    metin ve TC biçiminde olmayanlar küme ile; sonuç ilk görülme sırasında pozisyonlar
+    """
+    keys = np.fromiter(
+        (TC_NO_KEY if isinstance(values[index], str) else tc_int_key(values[index]) for index in candidates),
+        dtype=np.int64, count=len(candidates))
+    positions = np.asarray(candidates, dtype=np.int64)
+    int_mask = keys != TC_NO_KEY
+    _, first = np.unique(keys[int_mask], return_index=True)
+    kept = positions[int_mask][first].tolist()
+
+    seen = set()
+    for index in positions[~int_mask].tolist():
+        value = values[index]
+        if value not in seen:
+            seen.add(value)
+            kept.append(index)
+    kept.sort()
+    return kept
+
+def _process_city_rows(headers: List[str], columns: List[List[Any]]) -> Tuple[List[str], Iterator[tuple], int]:
+    """
+    process_city_il'in bellekteki karşılığı: İL, TC filtresi, SIRANO, sıralama, Unnamed, TC tekrarı.
+    Satırlar sütunlardan tüketildikçe kurulur (liste tutulmaz); üçüncü değer sağlama kontrolünden
+    geçmeyen TC sayısı
+    """
+    names = list(headers)
+    row_count = len(columns[0]) if columns else 0
+
+    # 1- İL → City → İL (City sütunu yerine bulunan il gelir)
+    if "İL" in names:
+        if "City" in names:
+            raise ValueError("Dosyada hem İL hem City sütunu var")
+        position = names.index("İL")
+        columns[position] = _fill_cities(columns[position])
+    else:
+        if "City" in names:  # pandas'ta df["City"] = "" ile ezilip silinir
+            position = names.index("City")
+            del names[position], columns[position]
+        names.append("İL")
+        columns.append(_fill_cities([""] * row_count))
+
+    # 2- TC geçersiz satırlar
+    if "TC" not in names:
+        raise KeyError("TC")
+    tc_values = columns[names.index("TC")]
+    candidates = [
+        index for index, value in enumerate(tc_values)
+        if value is not None and str(value).strip() != "" and str(value).lower() != "nan"
+    ]
+    kept = _unique_tc_positions(tc_values, candidates)  # TC'ye göre tekrarlar: ilk satır kalır
+
+    # TC sağlama (checksum) kontrolü: sayılır, TC_CHECKSUM_FILTER açıksa satır silinir
+    tc_valid = tc_checksum_valid(tc_int_keys(tc_values[index] for index in kept))
+    invalid_tc = int((~tc_valid).sum())
+    if config.bot.TC_CHECKSUM_FILTER:
+        kept = [index for index, valid in zip(kept, tc_valid.tolist()) if valid]
+
+    # SIRANO sil, [BAŞ] + [DİĞERLERİ] + [SON], Unnamed sil
+    all_names = names
+    names = [name for name in names if "SIRANO" not in str(name).upper()]
+    bas = [c for c in ["İL", "TARİH", "TEDAVİ", "DURUM"] if c in names]
+    son = [c for c in ["TC", "AD", "GSM"] if c in names]
+    order = bas + [c for c in names if c not in bas and c not in son] + son
+    order = [c for c in order if not str(c).startswith("Unnamed")]
+
+    by_name = dict(zip(all_names, columns))
+    picked = [by_name[name] for name in order]
+    rows = (tuple(_as_written(column[index]) for column in picked) for index in kept)
+    return order, rows, invalid_tc
+
+def _collect_columns(headers: List[str], rows: Iterator[List[Any]],
+                     merged_path: Optional[Path] = None) -> Tuple[List[List[Any]], int]:
+    """
+    Birleştirilmiş satırlar → sütun listeleri, tek geçişte (satır listesi tutulmaz).
+    merged_path verilirse sgk1.xlsx aynı geçişte yazılır. Sonra sgk1 okuması taklit edilir:
+    sütun bazında NA + tür çıkarımı
+    """
+    columns: List[List[Any]] = [[] for _ in headers]
+    appends = [column.append for column in columns]
+    writer = _SheetWriter(merged_path, headers) if merged_path else None
+    row_count = 0
+    try:
+        for row in rows:
+            row_count += 1
+            if row_count >= EXCEL_MAX_ROWS:  # dosya akışında sgk1.xlsx yazılamazdı
+                raise ValueError(f"Birleştirilmiş satır sayısı Excel sınırını aşıyor ({EXCEL_MAX_ROWS})")
+            if writer is not None:
+                writer.write(row)
+            for append, value in zip(appends, row):
+                append(_cell(value))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    for position, column in enumerate(columns):
+        columns[position] = _infer_column(column)
+    return columns, row_count
+
+def build_sgk_session(ham_dosya: Path, tel_dosya: Path, merged_path: Optional[Path] = None,
+                      final_path: Optional[Path] = None) -> Optional[Tuple[WorkbookSession, int]]:
+    """
+    Senkron (sandbox süreçte çalışır): merge → İL → TC temizliği bellekte.
+    Dönüş: (oturum, sağlama kontrolünden geçmeyen TC sayısı).
+    merged_path / final_path verilirse sgk1 / sgk2.xlsx ayrıca yazılır (hata ayıklama, input maili).
+    Streaming merge'ün birebir üretemediği girdide None döner; çağıran dosya akışına düşer.
+    """
+    try:
+        with _merged_rows(ham_dosya, tel_dosya) as (headers, rows, key_count):
+            columns, merged_count = _collect_columns(headers, rows, merged_path)
+    except _NeedsPandasMerge as e:
+        logger.warning(f"⚠️ Bellek içi SGK akışı kullanılamıyor, dosya akışına düşülüyor: {e}")
+        return None
+
+    # Son tablo oturum deposuna chunk chunk akar; sgk2.xlsx istenirse aynı geçişte yazılır
+    final_headers, final_rows, invalid_tc = _process_city_rows(headers, columns)
+    writer = _SheetWriter(final_path, final_headers) if final_path else None
+    try:
+        session = WorkbookSession.from_rows(final_path or Path(ham_dosya), final_headers,
+                                            writer.passthrough(final_rows) if writer else final_rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    del columns
+
+    logger.info(f"🔗 SGK bellek içi akış: {merged_count} birleştirilmiş satır, tel indeksi {key_count} anahtar, "
+                f"{session.row_count} satır gruplamaya, {invalid_tc} geçersiz TC")
+    return session, invalid_tc
+
+
 # -------------------------------------------------
 # 5) Ana program
 # bağımsız test için: dosya+ham+tel aynı klasörde olmalı
@@ -0,0 +1,204 @@
+# utils/tel_index_cache.py
+"""
+SGK tel dosyası için kalıcı indeks önbelleği (içerik adresli)
+
+Aynı TC → TEL dosyası gün içinde farklı ham dosyalarla defalarca yükleniyor; streaming merge
+her seferinde dosyayı ayrıştırıp indeksi yeniden kuruyordu. Burada kurulan indeks diske yazılır:
+- anahtar: dosya içeriğinin sha256'sı (+ biçim sürümü); dosya adı / yükleme zamanı önemsiz
+- kayıt (data/cache/tel_index/<özet>/):
+    keys.npy     sıralı int64 TC dizisi
+    offsets.npy  int64, değer i → values.bin[offsets[i]:offsets[i + 1]]
+    values.bin   türü etiketli değer blob'u (s: metin, i: tam sayı, f: float, n: None, b: bool, p: pickle)
+    meta.pickle  sütun adları, TC biçiminde olmayan anahtarlar, anahtar sayısı
+- okuma np.load(mmap_mode="r") ile: diziler kopyalanmaz, değerler sadece eşleşince çözülür
+- LRU: kayıt kullanıldıkça mtime güncellenir; toplam boyut TEL_INDEX_CACHE_MB'ı aşarsa
+  en eski kullanılanlar silinir
+
+Kayıt önce geçici klasöre yazılıp tek rename ile yerine konur; eşzamanlı sandbox süreçleri
+yarım kayıt görmez (aynı kaydı iki süreç yazarsa ikincisi atılır).
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from utils.logger import logger
+
+CACHE_FORMAT = 1  # indeks kurma mantığı / kayıt düzeni değişirse artırılır (eski kayıtlar eşleşmez)
+HASH_CHUNK_BYTES = 1024 * 1024
+
+_KEYS = "keys.npy"
+_OFFSETS = "offsets.npy"
+_VALUES = "values.bin"
+_META = "meta.pickle"
+
+
+def file_digest(path) -> str:
+    """Dosya içeriğinin sha256'sı (parça parça okunur)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    return f"v{CACHE_FORMAT}-{digest.hexdigest()}"
+
+
+def encode_value(value: Any) -> bytes:
+    """Hücre değeri → etiketli bayt; türler aynen geri döner"""
+    if value is None:
+        return b"n"
+    if isinstance(value, bool):
+        return b"b1" if value else b"b0"
+    if isinstance(value, int):
+        return b"i" + str(value).encode("ascii")
+    if isinstance(value, float):
+        return b"f" + repr(value).encode("ascii")
+    if isinstance(value, str):
+        return b"s" + value.encode("utf-8")
+    return b"p" + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_value(data: bytes) -> Any:
+    tag, body = data[:1], data[1:]
+    if tag == b"s":
+        return body.decode("utf-8")
+    if tag == b"i":
+        return int(body)
+    if tag == b"n":
+        return None
+    if tag == b"f":
+        return float(body)
+    if tag == b"b":
+        return body == b"1"
+    return pickle.loads(body)
+
+
+class BlobValues(Sequence):
+    """values.bin üzerinde liste görünümü; eleman erişildiğinde çözülür"""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return max(0, len(self._offsets) - 1)
+
+    def _decode(self, index: int) -> Any:
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return decode_value(self._blob[start:end].tobytes())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._decode(index)
+
+
+class CachedIndex(NamedTuple):
+    """Önbellekten okunan indeks: keys memmap, values tembel görünüm, meta serbest sözlük"""
+    keys: np.ndarray
+    values: Sequence[Any]
+    meta: Dict[str, Any]
+
+
+class TelIndexCache:
+    """data/cache/tel_index altında özet başına bir klasör; toplam boyut max_bytes ile sınırlı"""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max(0, max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def load(self, digest: str) -> Optional[CachedIndex]:
+        entry = self.root / digest
+        if not entry.is_dir():
+            return None
+        try:
+            keys = np.load(entry / _KEYS, mmap_mode="r")
+            offsets = np.load(entry / _OFFSETS, mmap_mode="r")
+            if (entry / _VALUES).stat().st_size:
+                blob = np.memmap(entry / _VALUES, dtype=np.uint8, mode="r")
+            else:
+                blob = np.empty(0, dtype=np.uint8)  # boş dosya memmap edilemez
+            with open(entry / _META, "rb") as fh:
+                meta = pickle.load(fh)
+            if len(offsets) != len(keys) + 1:
+                raise ValueError("offsets / keys uzunluğu uyuşmuyor")
+        except Exception as e:
+            logger.warning(f"⚠️ Tel indeks önbelleği okunamadı, kayıt siliniyor: {digest} ({e})")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(entry)  # LRU: son kullanım
+        return CachedIndex(keys, BlobValues(blob, offsets), meta)
+
+    def store(self, digest: str, keys: np.ndarray, values: List[Any], meta: Dict[str, Any]) -> bool:
+        """Kaydı yazar (geçici klasör → rename) ve LRU temizliği yapar; sığmayan kayıt yazılmaz"""
+        entry = self.root / digest
+        if entry.exists():
+            return True
+        temp = self.root / f".tmp-{digest}-{os.getpid()}"
+        try:
+            temp.mkdir(parents=True, exist_ok=True)
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            with open(temp / _VALUES, "wb") as fh:
+                for index, value in enumerate(values):
+                    data = encode_value(value)
+                    fh.write(data)
+                    offsets[index + 1] = offsets[index] + len(data)
+            np.save(temp / _KEYS, np.ascontiguousarray(keys, dtype=np.int64))
+            np.save(temp / _OFFSETS, offsets)
+            with open(temp / _META, "wb") as fh:
+                pickle.dump(meta, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+            size = self._entry_size(temp)
+            if self.max_bytes and size > self.max_bytes:
+                logger.info(f"🗃️ Tel indeksi önbelleğe sığmıyor ({size // 1024} KB), yazılmadı")
+                return False
+            try:
+                os.rename(temp, entry)
+            except OSError:  # başka süreç aynı kaydı yazdı
+                return entry.exists()
+        except OSError as e:
+            logger.warning(f"⚠️ Tel indeks önbelleği yazılamadı: {e}")
+            return False
+        finally:
+            shutil.rmtree(temp, ignore_errors=True)
+
+        self.evict()
+        return True
+
+    @staticmethod
+    def _entry_size(entry: Path) -> int:
+        return sum(item.stat().st_size for item in entry.iterdir() if item.is_file())
+
+    def _entries(self) -> Iterator[Path]:
+        return (item for item in self.root.iterdir() if item.is_dir() and not item.name.startswith("."))
+
+    def evict(self) -> int:
+        """Toplam boyut max_bytes altına inene kadar en eski kullanılan kayıtları siler; silinen sayısı"""
+        if not self.max_bytes:
+            return 0
+        entries = []
+        for entry in self._entries():
+            try:
+                entries.append((entry.stat().st_mtime, self._entry_size(entry), entry))
+            except OSError:  # başka süreç sildi
+                continue
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)  # açık memmap'ler silinen dosyada geçerli kalır
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"🧹 Tel indeks önbelleği: {removed} eski kayıt silindi")
+        return removed
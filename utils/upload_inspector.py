@@ -0,0 +1,144 @@
+# utils/upload_inspector.py
+"""
+Yükleme ön kontrolü: ayrıştırmadan önce zip merkez dizini incelenir
+
+MAX_FILE_SIZE_MB sadece sıkıştırılmış (indirilen) boyuta bakar; 5MB'lik bir xlsx açıldığında
+gigabaytlarca XML çıkabilir (zip bombası veya A1:XFD1048576 gibi şişik sayfalar).
+inspect_upload(path) openpyxl / pandas / native okuyucu hiçbir şey ayırmadan önce:
+- merkez dizindeki (infolist) açılmış boyutları toplar: sayfalar (xl/worksheets/*.xml) + sharedStrings
+- parça başına sıkıştırma oranına bakar (gerçek xlsx'lerde ~5-15x)
+- her sayfanın ilk 64KB'ından <dimension> etiketini okuyup satır/sütun sayısını tahmin eder
+
+Karar:
+- "ok"        → tüm motorlar serbest (yükleme oturumu dahil)
+- "streaming" → sadece parça parça okuma: oturum açılmaz, temizleyici streaming motorla çalışır
+- "reject"    → kullanıcıya sebep bildirilir, dosya hiç ayrıştırılmaz
+
+Not: zipfile açarken merkez dizindeki file_size'ı aşan veriyi üretmez; beyan edilen boyut
+okuma sırasında da üst sınırdır.
+"""
+
+import re
+import zipfile
+from pathlib import Path
+from typing import NamedTuple
+
+from config import config
+from utils.logger import logger
+from utils.xlsx_reader import _DIMENSION_RE, _parse_dimension
+
+VERDICT_OK = "ok"
+VERDICT_STREAMING = "streaming"
+VERDICT_REJECT = "reject"
+
+DIMENSION_PROBE_BYTES = 64 * 1024
+RATIO_MIN_BYTES = 1024 * 1024  # küçük parçalarda oran anlamsız (boş sayfa, tema)
+_SHEET_PART_RE = re.compile(r"^xl/worksheets/[^/]+\.xml$", re.IGNORECASE)
+_SHARED_STRINGS_RE = re.compile(r"^xl/sharedStrings\.xml$", re.IGNORECASE)
+
+MB = 1024 * 1024
+
+
+class UploadInspection(NamedTuple):
+    """Ön kontrol sonucu; boyutlar bayt, tahminler <dimension> etiketinden (yoksa 0)"""
+    verdict: str
+    reason: str
+    compressed_bytes: int
+    sheet_bytes: int = 0
+    shared_strings_bytes: int = 0
+    max_ratio: float = 0.0
+    estimated_rows: int = 0
+    estimated_columns: int = 0
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        return self.sheet_bytes + self.shared_strings_bytes
+
+    @property
+    def rejected(self) -> bool:
+        return self.verdict == VERDICT_REJECT
+
+    @property
+    def streaming_only(self) -> bool:
+        return self.verdict == VERDICT_STREAMING
+
+
+def _estimate_dimension(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> tuple:
+    """Sayfanın ilk 64KB'ındaki <dimension> → (satır, sütun); bulunamazsa (0, 0)"""
+    try:
+        with archive.open(info) as fh:
+            match = _DIMENSION_RE.search(fh.read(DIMENSION_PROBE_BYTES))
+    except (zipfile.BadZipFile, NotImplementedError, RuntimeError, OSError):
+        return 0, 0
+    if not match:
+        return 0, 0
+    rows, columns = _parse_dimension(match.group(1).decode("ascii", "replace"))
+    return rows or 0, columns or 0
+
+
+def inspect_upload(path) -> UploadInspection:
+    """
+    Senkron ve hızlı: sadece merkez dizin + sayfa başlarından 64KB okunur.
+    Limitler BotConfig.UPLOAD_* (0: o kontrol kapalı).
+    """
+    path = Path(path)
+    bot = config.bot
+    compressed = path.stat().st_size
+
+    if bot.MAX_FILE_SIZE_MB and compressed > bot.MAX_FILE_SIZE_MB * MB:
+        return UploadInspection(VERDICT_REJECT, f"Dosya boyutu {bot.MAX_FILE_SIZE_MB}MB'den büyük", compressed)
+
+    try:
+        archive = zipfile.ZipFile(path)
+    except (zipfile.BadZipFile, OSError):
+        return UploadInspection(
+            VERDICT_REJECT, "Dosya xlsx biçiminde değil (.xls ve bozuk dosyalar okunamaz)", compressed)
+
+    sheet_bytes = shared_bytes = 0
+    max_ratio = 0.0
+    rows = columns = 0
+    with archive:
+        for info in archive.infolist():
+            if info.file_size >= RATIO_MIN_BYTES:
+                max_ratio = max(max_ratio, info.file_size / max(1, info.compress_size))
+            if _SHARED_STRINGS_RE.match(info.filename):
+                shared_bytes += info.file_size
+            elif _SHEET_PART_RE.match(info.filename):
+                sheet_bytes += info.file_size
+                sheet_rows, sheet_columns = _estimate_dimension(archive, info)
+                rows, columns = max(rows, sheet_rows), max(columns, sheet_columns)
+
+    def result(verdict: str, reason: str) -> UploadInspection:
+        return UploadInspection(verdict, reason, compressed, sheet_bytes, shared_bytes,
+                                round(max_ratio, 1), rows, columns)
+
+    uncompressed_mb = (sheet_bytes + shared_bytes) / MB
+    if bot.UPLOAD_MAX_COMPRESSION_RATIO and max_ratio > bot.UPLOAD_MAX_COMPRESSION_RATIO:
+        return result(VERDICT_REJECT, f"Dosya anormal sıkıştırılmış ({max_ratio:.0f}x), işlenmedi")
+    if bot.UPLOAD_MAX_UNCOMPRESSED_MB and uncompressed_mb > bot.UPLOAD_MAX_UNCOMPRESSED_MB:
+        return result(VERDICT_REJECT,
+                      f"Açılmış veri boyutu {uncompressed_mb:.0f}MB, sınır {bot.UPLOAD_MAX_UNCOMPRESSED_MB}MB")
+    if bot.UPLOAD_STREAMING_MB and uncompressed_mb > bot.UPLOAD_STREAMING_MB:
+        return result(VERDICT_STREAMING, f"Açılmış veri boyutu {uncompressed_mb:.0f}MB")
+    if bot.UPLOAD_STREAMING_ROWS and rows > bot.UPLOAD_STREAMING_ROWS:
+        return result(VERDICT_STREAMING, f"Tahmini {rows} satır")
+    return result(VERDICT_OK, "")
+
+
+def check_upload(path) -> UploadInspection:
+    """inspect_upload + loglama; handler'lar indirmeden hemen sonra çağırır"""
+    try:
+        inspection = inspect_upload(path)
+    except Exception as e:
+        logger.error(f"❌ Yükleme ön kontrolü başarısız: {e}")
+        return UploadInspection(VERDICT_REJECT, "Dosya incelenemedi", 0)
+
+    details = (f"{inspection.compressed_bytes / MB:.1f}MB → {inspection.uncompressed_bytes / MB:.1f}MB, "
+               f"oran {inspection.max_ratio}x, tahmini {inspection.estimated_rows} satır")
+    if inspection.rejected:
+        logger.warning(f"🛑 Yükleme reddedildi: {Path(path).name} ({inspection.reason}; {details})")
+    elif inspection.streaming_only:
+        logger.info(f"🌊 Yükleme streaming motora yönlendirildi: {Path(path).name} ({details})")
+    else:
+        logger.info(f"🔎 Yükleme ön kontrolü: {Path(path).name} ({details})")
+    return inspection
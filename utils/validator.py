@@ -3,44 +3,52 @@
 "TARİH", "İL" doğrulaması yapar
 
 """
-from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 from typing import Dict, Any
 from utils.logger import logger
+from utils.workbook_session import Source, input_sheets, open_source
+from utils.xlsx_reader import real_bounds
 
-def validate_excel_file(file_path: str) -> Dict[str, Any]:
+def validate_excel_file(file_path: Source) -> Dict[str, Any]:
     """
-    Excel dosyasını doğrular
+    Excel dosyasını doğrular (dosya yolu, açık WorkbookSession veya çok sayfalı kaynak)
+    Çok sayfalı kaynakta her sayfa ayrı kontrol edilir, satır sayıları toplanır.
     """
     try:
-        wb = load_workbook(filename=file_path, read_only=True)
-        ws = wb.active
-        
-        # Başlık satırını al
-        headers = []
-        for col in range(1, ws.max_column + 1):
-            cell_value = ws.cell(row=1, column=col).value
-            headers.append(str(cell_value).strip().upper() if cell_value else "")
-        
-        # Gerekli sütunları kontrol et
-        required_columns = {"TARİH", "İL"}
-        found_columns = set(headers)
-        
-        if not required_columns.issubset(found_columns):
-            missing = required_columns - found_columns
-            return {
-                "valid": False,
-                "message": f"Dosyada gerekli sütunlar bulunamadı: {', '.join(missing)}"
-            }
-        
+        wb = open_source(file_path)
+        sheets = input_sheets(wb)
+        prefix = len(sheets) > 1
+        row_count = 0
+        first_headers = None
+        for ws in sheets:
+            bounds = real_bounds(ws)  # dimension biçimlendirmeden şişmiş olabilir
+            label = f"{ws.title}: " if prefix else ""
+
+            # Başlık satırını al (tek satır okunur, gerçek sütun sınırı genişliğinde)
+            first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            headers = [str(cell_value).strip().upper() if cell_value else "" for cell_value in first_row]
+
+            # Gerekli sütunları kontrol et
+            required_columns = {"TARİH", "İL"}
+            found_columns = set(headers)
+
+            if not required_columns.issubset(found_columns):
+                missing = required_columns - found_columns
+                return {
+                    "valid": False,
+                    "message": f"{label}Dosyada gerekli sütunlar bulunamadı: {', '.join(missing)}"
+                }
+            first_headers = first_headers or headers
+            row_count += max(0, bounds.max_row - 1)
+
         # Satır sayısını kontrol et (sadece başlık varsa)
-        if ws.max_row <= 1:
+        if row_count == 0:
             return {
                 "valid": False,
                 "message": "Dosyada işlenecek veri bulunamadı"
             }
-        
-        return {"valid": True, "headers": headers, "row_count": ws.max_row - 1}
+
+        return {"valid": True, "headers": first_headers, "row_count": row_count}
         
     except Exception as e:
         logger.error(f"Doğrulama hatası: {e}")
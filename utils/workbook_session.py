@@ -0,0 +1,261 @@
+# utils/workbook_session.py
+"""
+Yükleme oturumu: dosya bir kez ayrıştırılır
+
+Bir kova yüklemesi eskiden üç kez açılıyordu (doğrulama, temizleme, split / alias yeniden okuması).
+WorkbookSession aktif sayfayı bir kez (executor thread'inde) okur ve satırları bellekte tutar:
+- gerçek veri sınırları (real_bounds), başlık satırı, satır sayısı
+- satırlar ROW_STORE=columnar ise ColumnarRowStore'da (sözlük kodlu), değilse tuple listesinde
+- workbook() → open_workbook ile aynı alt kümeyi sunan görünüm (active, iter_rows, max_row, close)
+- open() ayrıştırmayı PARSE_BACKEND'e göre sandbox süreçte yapar; oturum pickle ile
+  (sütun tamponları) geri gelir
+
+open_source(source) hem dosya yolunu hem oturumu kabul eder; temizleyici ve splitter
+kaynağı bununla açar, böylece oturum verildiğinde dosya tekrar ayrıştırılmaz.
+
+MultiSheetSource (INPUT_SHEETS): bir ayı birden fazla sayfaya bölen kaynaklar için seçilen
+sayfalar tek kaynak olarak işlenir. Sayfa oturumları sandbox süreçlerde paralel ayrıştırılır;
+temizleyici sayfaları tek başlık düzeninde birleştirir, split tek yönlendirme geçişi yapar.
+"""
+
+import asyncio
+import itertools
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+
+from config import config
+from utils.columnar_store import ColumnarRowStore
+from utils.logger import logger
+from utils.process_sandbox import run_job
+from utils.xlsx_reader import SheetBounds, open_workbook, real_bounds
+
+
+class SessionSheet:
+    """Oturum satırları üzerinde read_only sayfa görünümü (values_only)"""
+
+    def __init__(self, session: "WorkbookSession"):
+        self.parent = session
+        self.title = session.sheet_title
+
+    @property
+    def max_row(self) -> int:
+        return len(self.parent.rows)
+
+    @property
+    def max_column(self) -> int:
+        return self.parent.bounds.max_column
+
+    def real_bounds(self) -> SheetBounds:
+        # Hayalet hücreler oturum açılırken loglandı; beyan edilen boyut tekrar taşınmaz
+        return SheetBounds(self.parent.bounds.max_row, self.parent.bounds.max_column)
+
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None,
+                  values_only: bool = True) -> Iterator[tuple]:
+        if not values_only:
+            raise NotImplementedError("Oturum sayfası sadece values_only=True destekler")
+        return self.parent.iter_rows(min_row, max_row)
+
+
+class SessionWorkbook:
+    """open_workbook dönüşüyle uyumlu görünüm; close() oturumu kapatmaz"""
+
+    def __init__(self, session: "WorkbookSession"):
+        self._sheet = SessionSheet(session)
+
+    @property
+    def active(self) -> SessionSheet:
+        return self._sheet
+
+    @property
+    def worksheets(self) -> List[SessionSheet]:
+        return [self._sheet]
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return [self._sheet.title]
+
+    def close(self) -> None:
+        pass
+
+
+class WorkbookSession:
+    """Bir yüklemenin tek seferlik ayrıştırması: doğrulama, temizleme ve bölme aynı satırları kullanır"""
+
+    def __init__(self, path: Path, rows: Sequence[tuple], bounds: SheetBounds, sheet_title: str,
+                 chunk_size: int = 5000):
+        self.path = Path(path)
+        self.rows = rows
+        self.bounds = bounds
+        self.sheet_title = sheet_title
+        self.chunk_size = max(1, chunk_size)
+
+    @classmethod
+    def load(cls, path, columnar: Optional[bool] = None, chunk_size: Optional[int] = None,
+             sheet: Optional[str] = None) -> "WorkbookSession":
+        """Senkron: aktif (veya adı verilen) sayfayı gerçek sınırlar içinde bir kez okur"""
+        if columnar is None:
+            columnar = (config.bot.ROW_STORE or "").lower() == "columnar"
+        chunk_size = max(1, chunk_size or config.bot.CHUNK_SIZE)
+
+        wb = open_workbook(path)
+        try:
+            ws = wb[sheet] if sheet else wb.active
+            bounds = real_bounds(ws)
+            source = ws.iter_rows(values_only=True) if bounds.max_row else iter(())
+            if columnar:
+                rows = ColumnarRowStore()
+                while True:
+                    chunk = list(itertools.islice(source, chunk_size))
+                    if not chunk:
+                        break
+                    rows.extend(chunk)
+            else:
+                rows = list(source)
+            title = ws.title
+        finally:
+            wb.close()
+
+        logger.info(f"📂 Oturum açıldı: {Path(path).name} [{title}] ({len(rows)} satır, {bounds.max_column} sütun)")
+        return cls(path, rows, bounds, title, chunk_size)
+
+    @classmethod
+    def from_rows(cls, path, headers: Sequence, rows: Iterator[tuple], sheet_title: str = "Sheet1",
+                  columnar: Optional[bool] = None, chunk_size: Optional[int] = None) -> "WorkbookSession":
+        """Bellekte üretilmiş tablo (ör. SGK merge sonucu) → oturum; path sadece ad / ek için kullanılır"""
+        if columnar is None:
+            columnar = (config.bot.ROW_STORE or "").lower() == "columnar"
+        chunk_size = max(1, chunk_size or config.bot.CHUNK_SIZE)
+
+        source = itertools.chain([tuple(headers)], rows)
+        if columnar:
+            store = ColumnarRowStore()
+            while True:
+                chunk = list(itertools.islice(source, chunk_size))
+                if not chunk:
+                    break
+                store.extend(chunk)
+        else:
+            store = list(source)
+        return cls(path, store, SheetBounds(len(store), len(headers)), sheet_title, chunk_size)
+
+    @classmethod
+    async def open(cls, path, sheet: Optional[str] = None) -> "WorkbookSession":
+        """Ayrıştırma sandbox süreçte (veya executor thread'inde) yapılır, event loop bloklanmaz"""
+        return await run_job(cls.load, path, sheet=sheet)
+
+    # ---------- okuma ----------
+    @property
+    def header_values(self) -> tuple:
+        """1. satırın ham değerleri"""
+        return self.rows[0] if len(self.rows) else ()
+
+    @property
+    def row_count(self) -> int:
+        """Başlık hariç satır sayısı (gerçek sınırlara göre)"""
+        return max(0, self.bounds.max_row - 1)
+
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None) -> Iterator[tuple]:
+        """min_row..max_row satırları (1 tabanlı); depodan chunk_size parçalar halinde kurulur"""
+        stop = len(self.rows) if max_row is None else min(max_row, len(self.rows))
+        for start in range(max(0, min_row - 1), stop, self.chunk_size):
+            end = min(start + self.chunk_size, stop)
+            if isinstance(self.rows, ColumnarRowStore):
+                yield from self.rows.take(slice(start, end))
+            else:
+                yield from self.rows[start:end]
+
+    def workbook(self) -> SessionWorkbook:
+        return SessionWorkbook(self)
+
+    def close(self) -> None:
+        """Satırları bırakır (oturum sonrası bellek)"""
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# INPUT_SHEETS değerleri (diğer değerler: virgülle ayrılmış sayfa adları)
+SHEETS_ACTIVE = "active"  # sadece aktif sayfa (eski davranış)
+SHEETS_AUTO = "auto"      # başlığında TARİH ve İL olan tüm sayfalar
+
+
+class MultiSheetWorkbook:
+    """Seçilen sayfalar; worksheets sırası işlenme sırasıdır, active ilk sayfadır"""
+
+    def __init__(self, sheets: list, workbook=None):
+        self.worksheets = sheets
+        self._workbook = workbook  # dosyadan okunan sayfaların workbook'u (kapatmak bize ait)
+
+    @property
+    def active(self):
+        return self.worksheets[0]
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return [ws.title for ws in self.worksheets]
+
+    def close(self) -> None:
+        if self._workbook is not None:
+            self._workbook.close()
+
+
+class MultiSheetSource:
+    """
+    Birden fazla sayfa tek kaynak olarak: her sayfa ya paralel ayrıştırılmış bir WorkbookSession
+    ya da (oturumsuz akışta) dosyadan sırayla okunacak sayfa adıdır.
+    """
+
+    def __init__(self, path, sheets: Sequence[Union[WorkbookSession, str]]):
+        if not sheets:
+            raise ValueError("İşlenecek sayfa seçilmedi")
+        self.path = Path(path)
+        self.sheets = list(sheets)
+
+    @property
+    def titles(self) -> List[str]:
+        return [sheet.sheet_title if isinstance(sheet, WorkbookSession) else sheet for sheet in self.sheets]
+
+    @classmethod
+    async def open(cls, path, titles: Sequence[str], in_memory: bool = True) -> "MultiSheetSource":
+        """in_memory: sayfalar sandbox süreçlerde eşzamanlı ayrıştırılır (SANDBOX_PROCESSES kadar paralel)"""
+        if not in_memory:
+            return cls(path, titles)
+        sessions = await asyncio.gather(*(WorkbookSession.open(path, title) for title in titles))
+        return cls(path, sessions)
+
+    def workbook(self) -> MultiSheetWorkbook:
+        wb = open_workbook(self.path) if any(isinstance(sheet, str) for sheet in self.sheets) else None
+        return MultiSheetWorkbook(
+            [wb[sheet] if isinstance(sheet, str) else sheet.workbook().active for sheet in self.sheets], wb)
+
+    def close(self) -> None:
+        for sheet in self.sheets:
+            if isinstance(sheet, WorkbookSession):
+                sheet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+Source = Union[str, Path, WorkbookSession, MultiSheetSource]
+
+
+def open_source(source: Source):
+    """Dosya yolu → open_workbook; oturum → bellekteki satırlar üzerinde görünüm; çok sayfalı → seçilen sayfalar"""
+    if isinstance(source, (WorkbookSession, MultiSheetSource)):
+        return source.workbook()
+    return open_workbook(source)
+
+
+def input_sheets(wb) -> list:
+    """İşlenecek sayfalar: çok sayfalı kaynakta seçilenler, aksi halde aktif sayfa"""
+    if isinstance(wb, MultiSheetWorkbook):
+        return list(wb.worksheets)
+    return [wb.active]
@@ -0,0 +1,601 @@
+# utils/xlsx_reader.py
+"""
+Hafif (native) xlsx okuyucu: zip + XML iterparse
+
+openpyxl read_only modunda bile her hücre için nesne/sözlük oluşturur.
+Bu modül sayfa XML'ini (xl/worksheets/sheetN.xml) zip içinden akış halinde okur:
+- sharedStrings tablosu bir kez indekslenir (liste)
+- Tarih seri numaraları hücre stillerinden (styles.xml numFmt) çözülür
+- Satırlar düz tuple olarak üretilir; eksik hücre/satırlar None ile doldurulur
+  (openpyxl read_only + values_only ile aynı düzen)
+
+Fark: formül hücrelerinde formül metni yerine kayıtlı (cached) değer döner.
+
+open_workbook() READER_BACKEND ayarına göre native okuyucuyu açar;
+açılamazsa (bozuk/farklı yapı) openpyxl read_only'ye düşer.
+Her iki nesne de aynı alt kümeyi sunar: sheetnames, active, wb[ad], worksheets,
+ws.iter_rows(min_row, max_row, values_only=True), ws.max_row, ws.max_column, close().
+
+real_bounds(ws): <dimension> etiketi biçimlendirme yüzünden şişmiş olabilir (SGK portalı
+çıktılarında A1:XFD100000 gibi). Sayfa XML'i bayt düzeyinde taranıp değeri olan son
+satır/sütun bulunur; read_only sayfalar bu sınırlara daraltılır.
+"""
+
+import re
+import zipfile
+from datetime import datetime, time, timedelta
+from pathlib import PurePosixPath
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+from xml.etree.ElementTree import ParseError, iterparse
+
+from config import config
+from utils.logger import logger
+from utils.xlsx_writer import column_letter
+
+READER_NATIVE = "native"
+READER_OPENPYXL = "openpyxl"
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+DOC_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+STRICT_DOC_REL_NS = "http://purl.oclc.org/ooxml/officeDocument/relationships"
+
+WINDOWS_EPOCH = datetime(1899, 12, 30)
+MAC_EPOCH = datetime(1904, 1, 1)
+SECS_PER_DAY = 86400
+
+# openpyxl BUILTIN_FORMATS içindeki tarih/saat formatları (14-22, 45-47)
+# Süre formatları ([h]:mm) da openpyxl read_only gibi datetime olarak döner
+BUILTIN_DATE_FORMATS = {14, 15, 16, 17, 18, 19, 20, 21, 22, 45, 46, 47}
+
+# openpyxl.styles.numbers ile aynı kurallar
+_STRIP_RE = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+_DATE_RE = re.compile(r"(?<!\\)[dmhysDMHYS]")
+_CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+
+# Bayt düzeyinde sınır taraması (sayfa XML'i ayrıştırılmadan)
+PROBE_BLOCK_SIZE = 4 * 1024 * 1024
+GHOST_CELL_LOG_THRESHOLD = 100_000  # bundan fazla boş hücre iddiası loglanır
+_DIMENSION_RE = re.compile(rb'<(?:\w+:)?dimension\s[^>]*?\bref="([^"]*)"')
+# Değeri olan hücre: <c ... r="REF" ...> (self-closing değil) + isteğe bağlı <f> + dolu <v> / <is><t>
+_DATA_CELL_TAIL = (
+    rb'"[^>]*(?<!/)>\s*'
+    rb'(?:<(?:\w+:)?f\b[^>]*?(?:/>|>[^<]*</(?:\w+:)?f>)\s*)?'
+    rb'<(?:\w+:)?(?:v>[^<]|is>\s*<(?:\w+:)?(?:t\b[^>/]*>[^<]|r\b))'
+)
+_DATA_CELL_RE = re.compile(rb'<(?:\w+:)?c\s[^>]*?\br="([A-Z]{1,3})(\d+)' + _DATA_CELL_TAIL)
+# r özniteliği olmayan hücre: konum bayttan çıkarılamaz → satır satır taramaya düşülür
+_CELL_WITHOUT_REF_RE = re.compile(rb'<(?:\w+:)?c(?:/?>|\s(?![^>]*\br=")[^>]*>)')
+
+
+def _is_date_format(fmt: str) -> bool:
+    fmt = _STRIP_RE.sub("", fmt.split(";")[0])
+    return _DATE_RE.search(fmt) is not None
+
+
+def from_excel(value: float, epoch: datetime = WINDOWS_EPOCH):
+    """Excel seri numarası → datetime / time (openpyxl.utils.datetime.from_excel ile aynı)"""
+    day, fraction = divmod(value, 1)
+    diff = timedelta(milliseconds=round(fraction * SECS_PER_DAY * 1000))
+    if 0 <= value < 1 and diff.days == 0:
+        mins, seconds = divmod(diff.seconds, 60)
+        hours, mins = divmod(mins, 60)
+        return time(hours, mins, seconds, diff.microseconds)
+    if 0 < value < 60 and epoch == WINDOWS_EPOCH:
+        day += 1  # Excel 1900 artık yıl hatası
+    return epoch + timedelta(days=day) + diff
+
+
+_column_cache: Dict[str, int] = {}
+
+
+def column_index(letters: str) -> int:
+    """'A' → 1, 'AB' → 28 (cache'li)"""
+    index = _column_cache.get(letters)
+    if index is None:
+        index = 0
+        for ch in letters:
+            index = index * 26 + (ord(ch) - 64)
+        _column_cache[letters] = index
+    return index
+
+
+def _parse_dimension(ref: str) -> Tuple[Optional[int], Optional[int]]:
+    """'A1:G354' → (354, 7); tek hücre / geçersiz → (None, None)"""
+    last = ref.split(":")[-1].replace("$", "")
+    match = _CELL_REF_RE.fullmatch(last)
+    if not match:
+        return None, None
+    return int(match.group(2)), column_index(match.group(1))
+
+
+class SheetBounds(NamedTuple):
+    """Gerçek veri sınırları (0: veri yok); declared_* <dimension> etiketindeki iddia"""
+    max_row: int
+    max_column: int
+    declared_rows: Optional[int] = None
+    declared_columns: Optional[int] = None
+
+    @property
+    def ghost_cells(self) -> int:
+        """Dimension'ın iddia edip gerçekte boş olan hücre sayısı (tahmini)"""
+        if not self.declared_rows or not self.declared_columns:
+            return 0
+        return max(0, self.declared_rows * self.declared_columns - self.max_row * self.max_column)
+
+
+def _iter_sheet_blocks(fh) -> Iterator[bytes]:
+    """Sayfa XML'i bloklar halinde; bloklar satır etiketi sonunda kesilir (hücre ikiye bölünmez)"""
+    carry = b""
+    while True:
+        block = fh.read(PROBE_BLOCK_SIZE)
+        if not block:
+            if carry:
+                yield carry
+            return
+        data = carry + block
+        cut = data.rfind(b"row>")
+        if cut < 0:
+            carry = data
+            continue
+        cut += 4
+        carry = data[cut:]
+        yield data[:cut]
+
+
+def _has_cells_without_ref(data: bytes) -> bool:
+    """r özniteliği olmayan hücre var mı (önce ucuz sayım, şüphede regex)"""
+    cells = data.count(b"<c ") + data.count(b"<c>") + data.count(b"<c/>")
+    if cells == data.count(b'<c r="') and b":c" not in data:
+        return False
+    return _CELL_WITHOUT_REF_RE.search(data) is not None
+
+
+def _confirm_dimension(open_part, declared_rows: int, declared_columns: int) -> bool:
+    """
+    Hızlı yol: son sütunda en az bir dolu hücre var ve dosyanın sonundaki son dolu hücre
+    son satırda mı? Öyleyse dimension doğrudur, tüm hücreler taranmaz.
+    """
+    letters = column_letter(declared_columns - 1).encode("ascii")  # column_letter 0 tabanlı
+    column_re = re.compile(rb'r="' + letters + rb'\d+' + _DATA_CELL_TAIL)  # sabit önek: hızlı arama
+    column_seen = False
+    previous = last = b""
+    with open_part() as fh:
+        for data in _iter_sheet_blocks(fh):
+            if not column_seen and column_re.search(data):
+                column_seen = True
+            previous, last = last, data
+    if not column_seen:
+        return False
+    cells = _DATA_CELL_RE.findall(previous + last)
+    return bool(cells) and int(cells[-1][1]) == declared_rows
+
+
+def probe_sheet_bounds(open_part) -> Tuple[Optional[Tuple[int, int]], Optional[str]]:
+    """
+    Sayfa XML'ini bayt düzeyinde tarar: ((son satır, son sütun), dimension ref).
+    open_part: sayfa parçasını açan fonksiyon (iki geçiş gerekebilir).
+    Dimension doğrulanırsa hızlı yoldan döner; değilse değeri olan tüm hücreler taranır.
+    r özniteliği olmayan hücre varsa sınır None döner (çağıran satır taramasına düşer).
+    """
+    with open_part() as fh:
+        match = _DIMENSION_RE.search(fh.read(64 * 1024))
+    dimension = match.group(1).decode("ascii", "replace") if match else None
+    declared_rows, declared_columns = _parse_dimension(dimension) if dimension else (None, None)
+    if declared_rows and declared_columns and _confirm_dimension(open_part, declared_rows, declared_columns):
+        return (declared_rows, declared_columns), dimension
+
+    # Satırlar dosyada artan sırada: son satır her bloğun son eşleşmesinden alınır
+    max_row = 0
+    columns: Set[bytes] = set()
+    with open_part() as fh:
+        for data in _iter_sheet_blocks(fh):
+            if _has_cells_without_ref(data):
+                return None, dimension
+            cells = _DATA_CELL_RE.findall(data)
+            if cells:
+                max_row = max(max_row, int(cells[-1][1]))
+                columns.update(column for column, _ in cells)
+
+    max_column = max((column_index(column.decode("ascii")) for column in columns), default=0)
+    return (max_row, max_column), dimension
+
+
+def _trailing_bounds(rows: Iterable[Tuple[int, Sequence[Any]]]) -> Tuple[int, int]:
+    """(satır no, değerler) akışında sondaki boş hücreleri atarak son dolu satır/sütun"""
+    max_row = max_column = 0
+    for row_index, values in rows:
+        last = len(values)
+        while last and (values[last - 1] is None or values[last - 1] == ""):
+            last -= 1
+        if last:
+            max_row = row_index
+            max_column = max(max_column, last)
+    return max_row, max_column
+
+
+class NativeWorksheet:
+    """Tek sayfa; satırlar her iter_rows çağrısında zip'ten yeniden akıtılır"""
+
+    def __init__(self, workbook: "NativeWorkbook", title: str, part: str):
+        self.parent = workbook
+        self.title = title
+        self._part = part
+        self._max_row: Optional[int] = None
+        self._max_column: Optional[int] = None
+        self._dimension_read = False
+
+    # ---------- boyut ----------
+    def _read_dimension(self) -> None:
+        if self._dimension_read:
+            return
+        self._dimension_read = True
+        dimension_tag = self.parent._tag("dimension")
+        sheet_data_tag = self.parent._tag("sheetData")
+        with self.parent._zip.open(self._part) as fh:
+            for _, elem in iterparse(fh, events=("start",)):
+                if elem.tag == dimension_tag:
+                    self._max_row, self._max_column = _parse_dimension(elem.get("ref", ""))
+                    break
+                if elem.tag == sheet_data_tag:
+                    break
+
+        # dimension yoksa / tek hücreyse: tam tarama ile hesapla
+        if self._max_row is None or self._max_column is None or self._max_row <= 1:
+            max_row = max_column = 0
+            for row_index, row in self._iter_raw_rows():
+                if row:
+                    max_row = row_index
+                    max_column = max(max_column, len(row))
+            if max_row:
+                self._max_row, self._max_column = max_row, max_column
+
+    def real_bounds(self) -> SheetBounds:
+        """Değeri olan son satır/sütun; max_row / max_column / iter_rows bu sınırlara daraltılır"""
+        found, dimension = probe_sheet_bounds(lambda: self.parent._zip.open(self._part))
+        declared_rows, declared_columns = _parse_dimension(dimension) if dimension else (None, None)
+        if found is None:
+            found = _trailing_bounds(self._iter_raw_rows())
+
+        max_row, max_column = found
+        if max_row:
+            self._max_row, self._max_column = max_row, max_column
+            self._dimension_read = True
+        return SheetBounds(max_row, max_column, declared_rows, declared_columns)
+
+    @property
+    def max_row(self) -> Optional[int]:
+        self._read_dimension()
+        return self._max_row
+
+    @property
+    def max_column(self) -> Optional[int]:
+        self._read_dimension()
+        return self._max_column
+
+    # ---------- satırlar ----------
+    def _iter_raw_rows(self) -> Iterator[Tuple[int, List[Any]]]:
+        """(satır no, hücre değerleri) — sadece dosyada bulunan satırlar, sonda None kırpılmaz"""
+        wb = self.parent
+        row_tag, v_tag, is_tag, t_tag = wb._tag("row"), wb._tag("v"), wb._tag("is"), wb._tag("t")
+        shared = wb.shared_strings
+        date_styles = wb.date_styles
+        epoch = wb.epoch
+        col_of = column_index
+
+        sheet_data_tag = wb._tag("sheetData")
+        sheet_data = None
+        row_counter = 0
+        with wb._zip.open(self._part) as fh:
+            for event, elem in iterparse(fh, events=("start", "end")):
+                if event == "start":
+                    if sheet_data is None and elem.tag == sheet_data_tag:
+                        sheet_data = elem
+                    continue
+                if elem.tag != row_tag:
+                    continue
+
+                r = elem.get("r")
+                row_counter = int(r) if r else row_counter + 1
+                values: List[Any] = []
+                col = 0
+
+                for c in elem:
+                    ref = c.get("r")
+                    col = col_of(ref.rstrip("0123456789")) if ref else col + 1
+                    cell_type = c.get("t")
+
+                    if cell_type == "inlineStr":
+                        inline = c.find(is_tag)
+                        value = "".join(t.text or "" for t in inline.iter(t_tag)) if inline is not None else None
+                    else:
+                        v = c.find(v_tag)
+                        text = v.text if v is not None else None
+                        if not text:
+                            value = None
+                        elif cell_type is None or cell_type == "n":
+                            value = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+                            style = c.get("s")
+                            if style and int(style) in date_styles:
+                                try:
+                                    value = from_excel(value, epoch)
+                                except (OverflowError, ValueError):
+                                    value = "#VALUE!"
+                        elif cell_type == "s":
+                            value = shared[int(text)]
+                        elif cell_type == "b":
+                            value = bool(int(text))
+                        elif cell_type == "d":
+                            value = datetime.fromisoformat(text)
+                        else:  # str, e
+                            value = text
+
+                    if col > len(values) + 1:
+                        values.extend([None] * (col - len(values) - 1))
+                    if col == len(values) + 1:
+                        values.append(value)
+                    else:
+                        values[col - 1] = value
+
+                # İşlenen satır ağaçtan çıkarılır: bellek satır sayısıyla büyümez
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(elem)
+                yield row_counter, values
+
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None,
+                  values_only: bool = True) -> Iterator[tuple]:
+        """openpyxl read_only iter_rows(values_only=True) ile aynı düzen"""
+        if not values_only:
+            raise NotImplementedError("Native okuyucu sadece values_only=True destekler")
+
+        width = self.max_column
+        empty_row = (None,) * width if width else ()
+        max_row = max_row or self.max_row
+
+        counter = min_row
+        last_index = 0
+        for row_index, values in self._iter_raw_rows():
+            last_index = row_index
+            if max_row is not None and row_index > max_row:
+                break
+            while counter < row_index:
+                counter += 1
+                yield empty_row
+            if counter <= row_index:
+                counter += 1
+                if width:
+                    if len(values) < width:
+                        values.extend([None] * (width - len(values)))
+                    elif len(values) > width:
+                        del values[width:]
+                elif not values:
+                    yield ()
+                    continue
+                yield tuple(values)
+
+        # openpyxl ile aynı: max_row'dan önce kesildiyse aradaki boş satırlar tamamlanır
+        if max_row is not None and max_row < last_index:
+            for _ in range(counter, max_row + 1):
+                yield empty_row
+
+
+class NativeWorkbook:
+    """xlsx zip'i; stiller ve sharedStrings açılışta bir kez okunur"""
+
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path)
+        try:
+            self._load()
+        except Exception:
+            self._zip.close()
+            raise
+
+    def _tag(self, name: str) -> str:
+        return f"{{{self._ns}}}{name}"
+
+    def _rels(self, part: str) -> Dict[str, Tuple[str, str]]:
+        """Parça ilişkileri: {rId: (type, hedef parça yolu)}"""
+        folder = PurePosixPath(part).parent
+        rels_part = str(folder / "_rels" / f"{PurePosixPath(part).name}.rels")
+        if rels_part not in self._zip.NameToInfo:
+            return {}
+
+        rels = {}
+        with self._zip.open(rels_part) as fh:
+            for _, elem in iterparse(fh):
+                if elem.tag == f"{{{REL_NS}}}Relationship":
+                    target = elem.get("Target", "")
+                    if target.startswith("/"):
+                        resolved = target.lstrip("/")
+                    else:
+                        parts: List[str] = []
+                        for piece in (folder / target).parts:
+                            if piece == "..":
+                                parts = parts[:-1]
+                            elif piece not in (".", ""):
+                                parts.append(piece)
+                        resolved = "/".join(parts)
+                    rels[elem.get("Id")] = (elem.get("Type", ""), resolved)
+        return rels
+
+    def _load(self) -> None:
+        root_rels = self._rels("")  # _rels/.rels
+        workbook_part = next(
+            (target for rel_type, target in root_rels.values() if rel_type.endswith("/officeDocument")),
+            "xl/workbook.xml",
+        )
+        rels = self._rels(workbook_part)
+
+        self._ns = MAIN_NS
+        self.epoch = WINDOWS_EPOCH
+        self._sheets: List[NativeWorksheet] = []
+        self._active_index = 0
+        with self._zip.open(workbook_part) as fh:
+            for event, elem in iterparse(fh, events=("start", "end")):
+                if event == "start":
+                    if elem.tag.endswith("}workbook"):
+                        self._ns = elem.tag[1:].split("}")[0]
+                    continue
+                tag = elem.tag
+                if tag == self._tag("workbookPr"):
+                    if elem.get("date1904", "").lower() in ("1", "true"):
+                        self.epoch = MAC_EPOCH
+                elif tag == self._tag("workbookView"):
+                    self._active_index = int(elem.get("activeTab", 0) or 0)
+                elif tag == self._tag("sheet"):
+                    rel_id = elem.get(f"{{{DOC_REL_NS}}}id") or elem.get(f"{{{STRICT_DOC_REL_NS}}}id")
+                    rel_type, target = rels.get(rel_id, ("", ""))
+                    if rel_type.endswith("/worksheet"):
+                        self._sheets.append(NativeWorksheet(self, elem.get("name"), target))
+
+        if not self._sheets:
+            raise ValueError("Çalışma kitabında sayfa bulunamadı")
+
+        by_type = {rel_type.rsplit("/", 1)[-1]: target for rel_type, target in rels.values()}
+        self.shared_strings = self._load_shared_strings(by_type.get("sharedStrings"))
+        self.date_styles = self._load_date_styles(by_type.get("styles"))
+
+    def _load_shared_strings(self, part: Optional[str]) -> List[str]:
+        strings: List[str] = []
+        if not part or part not in self._zip.NameToInfo:
+            return strings
+
+        si_tag, t_tag, r_tag = self._tag("si"), self._tag("t"), self._tag("r")
+        with self._zip.open(part) as fh:
+            for _, elem in iterparse(fh):
+                if elem.tag != si_tag:
+                    continue
+                # Düz metin veya zengin metin (r/t); fonetik (rPh) metinler dahil edilmez
+                plain = elem.find(t_tag)
+                if plain is not None:
+                    strings.append(plain.text or "")
+                else:
+                    strings.append("".join(r.findtext(t_tag) or "" for r in elem.iter(r_tag)))
+                elem.clear()
+        return strings
+
+    def _load_date_styles(self, part: Optional[str]) -> Set[int]:
+        """Tarih formatlı hücre stilleri (cellXfs indeksleri)"""
+        date_styles: Set[int] = set()
+        if not part or part not in self._zip.NameToInfo:
+            return date_styles
+
+        custom: Dict[int, str] = {}
+        xf_formats: List[int] = []
+        in_cell_xfs = False
+        with self._zip.open(part) as fh:
+            for event, elem in iterparse(fh, events=("start", "end")):
+                tag = elem.tag
+                if tag == self._tag("cellXfs"):
+                    in_cell_xfs = event == "start"
+                elif event == "end" and tag == self._tag("numFmt"):
+                    custom[int(elem.get("numFmtId"))] = elem.get("formatCode", "")
+                elif event == "end" and in_cell_xfs and tag == self._tag("xf"):
+                    xf_formats.append(int(elem.get("numFmtId", 0)))
+
+        for style_id, fmt_id in enumerate(xf_formats):
+            if fmt_id in custom:
+                if _is_date_format(custom[fmt_id]):
+                    date_styles.add(style_id)
+            elif fmt_id in BUILTIN_DATE_FORMATS:
+                date_styles.add(style_id)
+        return date_styles
+
+    # ---------- openpyxl uyumlu alt küme ----------
+    @property
+    def sheetnames(self) -> List[str]:
+        return [ws.title for ws in self._sheets]
+
+    @property
+    def worksheets(self) -> List[NativeWorksheet]:
+        return list(self._sheets)
+
+    @property
+    def active(self) -> NativeWorksheet:
+        index = self._active_index if 0 <= self._active_index < len(self._sheets) else 0
+        return self._sheets[index]
+
+    def __getitem__(self, name: str) -> NativeWorksheet:
+        for ws in self._sheets:
+            if ws.title == name:
+                return ws
+        raise KeyError(f"Worksheet {name} does not exist.")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sheetnames
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_only_bounds(ws) -> SheetBounds:
+    """openpyxl ReadOnlyWorksheet: aynı bayt taraması arşivdeki sayfa parçası üzerinde"""
+    found, dimension = probe_sheet_bounds(lambda: ws.parent._archive.open(ws._worksheet_path))
+    declared_rows, declared_columns = _parse_dimension(dimension) if dimension else (None, None)
+    if found is None:
+        ws.reset_dimensions()
+        found = _trailing_bounds(enumerate(ws.iter_rows(values_only=True), 1))
+
+    max_row, max_column = found
+    if max_row:
+        ws._max_row, ws._max_column = max_row, max_column
+    return SheetBounds(max_row, max_column, declared_rows, declared_columns)
+
+
+def _loaded_bounds(ws) -> SheetBounds:
+    """Tam yüklenmiş openpyxl sayfası: biçimli ama boş hücreler (_cells) atlanır"""
+    max_row = max_column = 0
+    for (row, column), cell in ws._cells.items():
+        value = cell.value
+        if value is None or value == "":
+            continue
+        if row > max_row:
+            max_row = row
+        if column > max_column:
+            max_column = column
+    return SheetBounds(max_row, max_column, ws.max_row, ws.max_column)
+
+
+def real_bounds(ws) -> SheetBounds:
+    """
+    Sayfanın gerçek veri sınırları (native, oturum, openpyxl read_only veya tam yüklenmiş sayfa).
+    read_only sayfalarda max_row / max_column / iter_rows genişliği gerçek sınırlara çekilir;
+    tam yüklenmiş sayfada max_row hesaplanan bir özelliktir, çağıran dönen sınırları kullanır.
+    """
+    if hasattr(ws, "real_bounds"):  # native sayfa / yükleme oturumu
+        bounds = ws.real_bounds()
+    elif hasattr(ws, "_worksheet_path"):
+        bounds = _read_only_bounds(ws)
+    else:
+        bounds = _loaded_bounds(ws)
+
+    if bounds.ghost_cells >= GHOST_CELL_LOG_THRESHOLD:
+        logger.info(
+            f"👻 Hayalet hücreler atlandı: dimension {bounds.declared_rows}×{bounds.declared_columns}, "
+            f"gerçek veri {bounds.max_row}×{bounds.max_column}"
+        )
+    return bounds
+
+
+def open_workbook(path, backend: Optional[str] = None):
+    """
+    Okuma için workbook açar (read_only).
+    backend: "native" (varsayılan, config.bot.READER_BACKEND) | "openpyxl"
+    Native açılış başarısız olursa openpyxl'e düşülür.
+    """
+    backend = (backend or config.bot.READER_BACKEND or READER_NATIVE).lower()
+    if backend == READER_NATIVE:
+        try:
+            return NativeWorkbook(path)
+        except (zipfile.BadZipFile, KeyError, ParseError, ValueError) as e:
+            logger.warning(f"⚠️ Native xlsx okuyucu açamadı, openpyxl kullanılıyor: {e}")
+
+    from openpyxl import load_workbook
+    return load_workbook(path, read_only=True)
@@ -0,0 +1,288 @@
+# utils/xlsx_writer.py
+"""
+Minimal akış (streaming) xlsx yazıcı
+
+Grup dosyaları düz tablodur: başlık satırı, metin/sayı/tarih hücreleri, sabit sütun genişliği.
+xlsxwriter constant_memory modunda bile hücre başına Python nesnesi ve temp dosya oluşturur.
+Bu yazıcı satır XML'ini doğrudan zip içindeki sayfa girdisine (xl/worksheets/sheetN.xml) akıtır:
+- Metinler inline string (sharedStrings tablosu yok)
+- Sabit styles.xml: 0 = genel, 1 = tarih (date_format), 2 = saat
+- workbook.xml / rels / [Content_Types].xml kapanışta yazılır
+- "=" ile başlayan metinler formül değil düz metin olarak yazılır
+
+RolloverWriter ile aynı arayüz: write_rows(start_index, rows), close();
+satır sınırında Veriler_2 sayfasına veya _part2 dosyasına devreder.
+Modül config/logger import etmez (writer süreçlerinde de kullanılır).
+"""
+
+import math
+import re
+import zipfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import List
+from xml.sax.saxutils import escape
+
+from utils.sheet_rollover import (
+    EXCEL_MAX_ROWS, ROLLOVER_FILE, ROLLOVER_SHEET, rollover_part_path, rollover_sheet_name,
+)
+
+XLSX_COMPRESSION_LEVEL = 6
+MAX_STRING_LENGTH = 32767  # Excel hücre metin sınırı
+
+STYLE_DATE = 1
+STYLE_TIME = 2
+
+_EXCEL_EPOCH = datetime(1899, 12, 31)
+_ILLEGAL_XML_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_ROOT_RELS = (
+    _XML_DECL
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+
+_STYLES = (
+    _XML_DECL
+    + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<numFmts count="2"><numFmt numFmtId="164" formatCode="{date_format}"/>'
+    '<numFmt numFmtId="165" formatCode="hh:mm:ss"/></numFmts>'
+    '<fonts count="1"><font><sz val="11"/><color theme="1"/><name val="Calibri"/>'
+    '<family val="2"/><scheme val="minor"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def column_letter(index: int) -> str:
+    """0 → A, 27 → AB"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def excel_column_width(width: float) -> float:
+    """Karakter genişliği → dosyada saklanan genişlik (xlsxwriter ile aynı hesap)"""
+    max_digit_width, padding = 7, 5
+    pixels = int(width * max_digit_width + 0.5) + padding
+    return int(pixels / max_digit_width * 256) / 256
+
+
+def excel_serial(value) -> float:
+    """date/datetime/time → Excel seri sayısı (1900 sistemi, xlsxwriter ile aynı)"""
+    if isinstance(value, time):
+        return (value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6) / 86400
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    delta = value.replace(tzinfo=None) - _EXCEL_EPOCH
+    days = delta.days + (delta.seconds + delta.microseconds / 1e6) / 86400
+    if days > 59:
+        days += 1  # Excel 1900 artık yıl hatası
+    return days
+
+
+def _text_cell(ref: str, text: str) -> str:
+    if len(text) > MAX_STRING_LENGTH:
+        text = text[:MAX_STRING_LENGTH]
+    if not text.isprintable():
+        text = _ILLEGAL_XML_RE.sub(lambda m: f"_x{ord(m.group()):04X}_", text)
+    text = escape(text)
+    if text[:1].isspace() or text[-1:].isspace():
+        return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t>{text}</t></is></c>'
+
+
+def _cell_xml(ref: str, value) -> str:
+    """Tek hücre XML'i (None → boş string, hücre yazılmaz)"""
+    kind = type(value)
+    if kind is str:
+        return _text_cell(ref, value) if value else ""
+    if kind is bool:
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if kind is int:
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if kind is float:
+        if math.isnan(value) or math.isinf(value):
+            return _text_cell(ref, str(value))
+        return f'<c r="{ref}"><v>{value!r}</v></c>'
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return f'<c r="{ref}" s="{STYLE_DATE}"><v>{excel_serial(value)!r}</v></c>'
+    if isinstance(value, time):
+        return f'<c r="{ref}" s="{STYLE_TIME}"><v>{excel_serial(value)!r}</v></c>'
+    if isinstance(value, timedelta):
+        return f'<c r="{ref}"><v>{value.total_seconds() / 86400!r}</v></c>'
+    if isinstance(value, (int, float)):  # numpy vb. sayı tipleri
+        return _cell_xml(ref, float(value) if isinstance(value, float) else int(value))
+    return _text_cell(ref, str(value))
+
+
+class _XlsxPackage:
+    """Tek xlsx dosyası: sayfalar sırayla akıtılır, paket parçaları kapanışta yazılır"""
+
+    def __init__(self, file_path: Path, date_format: str):
+        self.file_path = Path(file_path)
+        self._date_format = date_format
+        self._zip = zipfile.ZipFile(self.file_path, "w", zipfile.ZIP_DEFLATED,
+                                    compresslevel=XLSX_COMPRESSION_LEVEL)
+        self._sheet_names: List[str] = []
+        self._entry = None
+
+    def open_sheet(self, name: str, headers: List[str], column_width: float) -> None:
+        self.close_sheet()
+        self._sheet_names.append(name)
+        index = len(self._sheet_names)
+        self._entry = self._zip.open(f"xl/worksheets/sheet{index}.xml", "w", force_zip64=True)
+
+        selected = ' tabSelected="1"' if index == 1 else ""
+        cols = ""
+        if headers:
+            cols = (f'<cols><col min="1" max="{len(headers)}" '
+                    f'width="{excel_column_width(column_width)}" customWidth="1"/></cols>')
+        self._entry.write((
+            _XML_DECL
+            + f'<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            f'<sheetViews><sheetView{selected} workbookViewId="0"/></sheetViews>'
+            '<sheetFormatPr defaultRowHeight="15"/>'
+            f'{cols}<sheetData>'
+        ).encode("utf-8"))
+
+    def write(self, xml: str) -> None:
+        self._entry.write(xml.encode("utf-8"))
+
+    def close_sheet(self) -> None:
+        if self._entry is None:
+            return
+        self._entry.write(
+            b'</sheetData><pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" '
+            b'header="0.3" footer="0.3"/></worksheet>'
+        )
+        self._entry.close()
+        self._entry = None
+
+    def close(self) -> None:
+        try:
+            self.close_sheet()
+            count = len(self._sheet_names)
+            sheets = "".join(
+                f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, name in enumerate(self._sheet_names, start=1)
+            )
+            self._zip.writestr("xl/workbook.xml", (
+                _XML_DECL
+                + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+                '<bookViews><workbookView/></bookViews>'
+                f'<sheets>{sheets}</sheets></workbook>'
+            ))
+            rels = "".join(
+                f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, count + 1)
+            )
+            self._zip.writestr("xl/_rels/workbook.xml.rels", (
+                _XML_DECL
+                + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                f'{rels}<Relationship Id="rId{count + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+                '</Relationships>'
+            ))
+            self._zip.writestr("xl/styles.xml", _STYLES.replace("{date_format}", escape(self._date_format)))
+            self._zip.writestr("_rels/.rels", _ROOT_RELS)
+            overrides = "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in range(1, count + 1)
+            )
+            self._zip.writestr("[Content_Types].xml", (
+                _XML_DECL
+                + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                '<Override PartName="/xl/workbook.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                '<Override PartName="/xl/styles.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                f'{overrides}</Types>'
+            ))
+        finally:
+            self._zip.close()
+
+
+class StreamingXlsxWriter:
+    """
+    Grup dosyası (native xlsx). Mantıksal satır indeksi (1 = ilk veri satırı) sayfalara/dosyalara bölünür;
+    satırlar sırayla gelmelidir (start_index sadece sayfa devri için kullanılır).
+    """
+
+    def __init__(self, file_path: Path, headers: List[str], sheet_name: str = "Veriler",
+                 mode: str = ROLLOVER_SHEET, max_rows: int = EXCEL_MAX_ROWS,
+                 column_width: float = 15, date_format: str = "yyyy-mm-dd"):
+        self.file_path = Path(file_path)
+        self.headers = list(headers)
+        self.sheet_name = sheet_name
+        self.mode = mode
+        self.per_sheet = max(1, min(max_rows, EXCEL_MAX_ROWS) - 1)
+        self.column_width = column_width
+        self.date_format = date_format
+        self._refs = [column_letter(i) for i in range(len(self.headers))]
+        self._packages: List[_XlsxPackage] = []
+        self._sheet_count = 0
+        self._add_sheet()
+
+    def _add_sheet(self) -> None:
+        if self.mode == ROLLOVER_FILE or not self._packages:
+            if self._packages:
+                self._packages[-1].close()
+            path = rollover_part_path(self.file_path, len(self._packages))
+            self._packages.append(_XlsxPackage(path, self.date_format))
+            name = self.sheet_name
+        else:
+            name = rollover_sheet_name(self.sheet_name, self._sheet_count)
+
+        package = self._packages[-1]
+        package.open_sheet(name, self.headers, self.column_width)
+        package.write(self._row_xml(1, self.headers))
+        self._sheet_count += 1
+
+    def _row_xml(self, row_number: int, row) -> str:
+        refs = self._refs
+        if len(row) > len(refs):
+            refs.extend(column_letter(i) for i in range(len(refs), len(row)))
+        cells = "".join([_cell_xml(f"{refs[i]}{row_number}", value) for i, value in enumerate(row)])
+        if row and (row[-1] is None or row[-1] == ""):
+            # dimension yazılmadığı için son sütun boş hücreyle işaretlenir (okuyucular satırı kısaltmasın)
+            cells += f'<c r="{refs[len(row) - 1]}{row_number}"/>'
+        return f'<row r="{row_number}">{cells}</row>'
+
+    def write_rows(self, start_index: int, rows: List[tuple]) -> None:
+        """start_index: ilk satırın mantıksal indeksi (1'den başlar)"""
+        offset = 0
+        while offset < len(rows):
+            sheet_index, row_in_sheet = divmod(start_index + offset - 1, self.per_sheet)
+            while sheet_index >= self._sheet_count:
+                self._add_sheet()
+
+            take = min(len(rows) - offset, self.per_sheet - row_in_sheet)
+            first = row_in_sheet + 2  # 1. satır başlık
+            self._packages[-1].write("".join([
+                self._row_xml(first + i, rows[offset + i]) for i in range(take)
+            ]))
+            offset += take
+
+    def close(self) -> None:
+        if self._packages:
+            self._packages[-1].close()